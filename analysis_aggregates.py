@@ -0,0 +1,335 @@
+"""
+职位数据的可合并汇总
+
+图表只需要计数、合计和分布，不需要逐条记录。JobAggregates 保存：
+
+- 月薪（K）的次数、合计、平方和、最小/最大值和固定宽度直方图（全部职位和每个城市）
+- 公司、城市、学历、经验、技能的计数
+- 按经验类别、学历分组的月薪次数、合计和平方和
+
+两份汇总相加等于合并后数据的汇总，因此每天只需汇总新增的职位再合并到保存的汇总中；
+分位数、箱线图统计和密度曲线都从直方图得到（桶宽 SALARY_BIN_WIDTH，分位数误差不超过一个桶宽）：
+
+    aggregates = JobAggregates.from_frame(df, skills_df)
+    aggregates.merge(JobAggregates.from_frame(new_df, new_skills_df))
+    aggregates.salary.mean(), aggregates.top("company", 15)
+
+只有从DataFrame汇总（from_frame）时才导入pandas，读取、合并保存的汇总只需要numpy。
+"""
+import re
+import json
+from collections import Counter
+
+import numpy as np
+
+AGGREGATES_VERSION = 1
+
+# 月薪直方图：0-500K，每桶0.5K，超出上限的计入最后一桶
+SALARY_BIN_WIDTH = 0.5
+SALARY_BIN_COUNT = 1000
+
+TALLY_COLUMNS = ["company_name", "city", "education", "experience"]
+GROUP_COLUMNS = ["exp_category", "education"]
+
+EXPERIENCE_RANGE_PATTERN = re.compile(r"(\d+)-(\d+)年")
+EXPERIENCE_ABOVE_PATTERN = re.compile(r"(\d+)年以上")
+
+
+def salary_bins(values):
+    """月薪（K）对应的直方图桶编号"""
+    bins = np.floor(np.asarray(values, dtype="float64") / SALARY_BIN_WIDTH).astype("int64")
+    return np.clip(bins, 0, SALARY_BIN_COUNT - 1)
+
+
+def bin_centers():
+    return (np.arange(SALARY_BIN_COUNT) + 0.5) * SALARY_BIN_WIDTH
+
+
+def experience_categories(experience):
+    """
+    经验要求归类：“1-3年”“10年以上”保持原样，其他写法（经验不限、在校/应届等）原样保留，空值为Unknown
+
+    Args:
+        experience: 经验要求Series
+
+    Returns:
+        同索引的类别Series
+    """
+    import pandas as pd
+
+    strings = experience.astype(object).where(experience.notna(), "").astype(str)
+    codes, uniques = pd.factorize(strings)
+    uniques = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    ranges = uniques.str.extract(EXPERIENCE_RANGE_PATTERN)
+    above = uniques.str.extract(EXPERIENCE_ABOVE_PATTERN)[0]
+    categories = uniques.copy()
+    categories[above.notna()] = above[above.notna()] + "年以上"
+    has_range = ranges[0].notna()
+    categories[has_range] = ranges.loc[has_range, 0] + "-" + ranges.loc[has_range, 1] + "年"
+    categories[uniques == ""] = "Unknown"
+    return pd.Series(categories.to_numpy(dtype=object)[codes], index=experience.index, dtype=object)
+
+
+def experience_sort_key(category):
+    """经验类别的排序键：按年限从低到高，“X年以上”排在最后"""
+    above = EXPERIENCE_ABOVE_PATTERN.search(category)
+    if above:
+        return int(above.group(1)) * 100
+    years = EXPERIENCE_RANGE_PATTERN.search(category)
+    if years:
+        return (int(years.group(1)) + int(years.group(2))) / 2
+    return 0
+
+
+class SalaryStats:
+    """一组月薪的可合并统计：次数、合计、平方和、最值和直方图"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = np.zeros(SALARY_BIN_COUNT, dtype="int64")
+
+    @classmethod
+    def from_values(cls, values, histogram=None):
+        """
+        Args:
+            values: 月薪数组（已去掉缺失值）
+            histogram: 已算好的直方图计数，None时由values计算
+        """
+        stats = cls()
+        values = np.asarray(values, dtype="float64")
+        if len(values) == 0:
+            return stats
+        stats.count = int(len(values))
+        stats.sum = float(values.sum())
+        stats.sumsq = float(np.square(values).sum())
+        stats.min = float(values.min())
+        stats.max = float(values.max())
+        if histogram is None:
+            histogram = np.bincount(salary_bins(values), minlength=SALARY_BIN_COUNT)
+        stats.histogram = histogram.astype("int64")
+        return stats
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.histogram = self.histogram + other.histogram
+        return self
+
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def std(self):
+        """样本标准差"""
+        if self.count < 2:
+            return None
+        variance = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def quantile(self, q):
+        """由直方图插值得到的分位数"""
+        if not self.count:
+            return None
+        cumulative = np.cumsum(self.histogram)
+        target = q * self.count
+        index = int(np.searchsorted(cumulative, target, side="left"))
+        index = min(index, SALARY_BIN_COUNT - 1)
+        before = cumulative[index - 1] if index > 0 else 0
+        in_bin = self.histogram[index]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        value = (index + fraction) * SALARY_BIN_WIDTH
+        return float(min(max(value, self.min), self.max))
+
+    def box_stats(self, label=None):
+        """matplotlib Axes.bxp 使用的箱线图统计（须线按1.5倍四分位距，不含离群点）"""
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        iqr = q3 - q1
+        return {
+            "label": label,
+            "med": median,
+            "q1": q1,
+            "q3": q3,
+            "whislo": max(q1 - 1.5 * iqr, self.min),
+            "whishi": min(q3 + 1.5 * iqr, self.max),
+            "fliers": []
+        }
+
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.histogram)
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "sumsq": self.sumsq,
+            "min": self.min,
+            "max": self.max,
+            # 只保存非零桶
+            "histogram": [[int(i), int(self.histogram[i])] for i in nonzero]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.sum = data["sum"]
+        stats.sumsq = data["sumsq"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        for index, count in data["histogram"]:
+            stats.histogram[index] = count
+        return stats
+
+
+class GroupStats:
+    """按类别分组的月薪次数、合计和平方和"""
+
+    def __init__(self, count=None, total=None, sumsq=None):
+        self.count = Counter(count or {})
+        self.sum = Counter(total or {})
+        self.sumsq = Counter(sumsq or {})
+
+    @classmethod
+    def from_frame(cls, keys, values):
+        import pandas as pd
+
+        frame = pd.DataFrame({"key": keys.to_numpy(dtype=object), "value": values.to_numpy(dtype="float64")})
+        frame = frame[frame["value"].notna() & (frame["key"] != "")]
+        frame["square"] = np.square(frame["value"])
+        grouped = frame.groupby("key", sort=False).agg(count=("value", "size"), total=("value", "sum"),
+                                                       sumsq=("square", "sum"))
+        return cls(grouped["count"].astype(int).to_dict(), grouped["total"].to_dict(), grouped["sumsq"].to_dict())
+
+    def merge(self, other):
+        self.count.update(other.count)
+        self.sum.update(other.sum)
+        self.sumsq.update(other.sumsq)
+        return self
+
+    def means(self):
+        """{类别: 平均月薪}"""
+        return {key: self.sum[key] / count for key, count in self.count.items() if count}
+
+    def to_dict(self):
+        return {"count": dict(self.count), "sum": dict(self.sum), "sumsq": dict(self.sumsq)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["count"], data["sum"], data["sumsq"])
+
+
+class JobAggregates:
+    """图表使用的可合并汇总"""
+
+    def __init__(self):
+        self.total = 0
+        self.salary = SalaryStats()
+        self.city_salary = {}
+        self.tallies = {column: Counter() for column in TALLY_COLUMNS + ["skill"]}
+        self.groups = {column: GroupStats() for column in GROUP_COLUMNS}
+
+    @classmethod
+    def from_frame(cls, df, skills_df=None):
+        """
+        汇总处理后的职位数据
+
+        Args:
+            df: JobMarketAnalyzer.process_data 处理后的主表
+            skills_df: 技能长表 (job_index, skill)
+        """
+        import pandas as pd
+
+        aggregates = cls()
+        aggregates.total = int(len(df))
+        if len(df) == 0:
+            return aggregates
+
+        if "salary_avg" in df.columns:
+            salary = df["salary_avg"].to_numpy(dtype="float64")
+            valid = ~np.isnan(salary)
+            aggregates.salary = SalaryStats.from_values(salary[valid])
+
+            # 各城市的直方图一次bincount：城市编码 × 桶数 + 桶编号
+            if "city" in df.columns and valid.any():
+                city_codes, cities = pd.factorize(df["city"].astype(object).where(df["city"].notna(), ""))
+                city_codes, values = city_codes[valid], salary[valid]
+                keep = city_codes >= 0
+                city_codes, values = city_codes[keep], values[keep]
+                histograms = np.bincount(city_codes * SALARY_BIN_COUNT + salary_bins(values),
+                                         minlength=len(cities) * SALARY_BIN_COUNT)
+                histograms = histograms.reshape(len(cities), SALARY_BIN_COUNT)
+                order = np.argsort(city_codes, kind="stable")
+                boundaries = np.searchsorted(city_codes[order], np.arange(len(cities) + 1))
+                for i, city in enumerate(cities):
+                    city_values = values[order[boundaries[i]:boundaries[i + 1]]]
+                    if len(city_values) and city != "":
+                        aggregates.city_salary[str(city)] = SalaryStats.from_values(city_values, histograms[i])
+
+        for column in TALLY_COLUMNS:
+            if column in df.columns:
+                # category列的value_counts包含计数为0的类别
+                counts = df[column].value_counts()
+                aggregates.tallies[column] = Counter(
+                    {str(key): int(value) for key, value in counts.items() if key != "" and value > 0})
+        if skills_df is not None and len(skills_df):
+            counts = skills_df["skill"].value_counts()
+            aggregates.tallies["skill"] = Counter({str(key): int(value) for key, value in counts.items() if value > 0})
+
+        if "salary_avg" in df.columns:
+            if "experience" in df.columns:
+                aggregates.groups["exp_category"] = GroupStats.from_frame(
+                    experience_categories(df["experience"]), df["salary_avg"])
+            if "education" in df.columns:
+                aggregates.groups["education"] = GroupStats.from_frame(df["education"], df["salary_avg"])
+        return aggregates
+
+    def merge(self, other):
+        """合并另一份汇总（原地修改并返回自身）"""
+        self.total += other.total
+        self.salary.merge(other.salary)
+        for city, stats in other.city_salary.items():
+            self.city_salary.setdefault(city, SalaryStats()).merge(stats)
+        for column, counts in other.tallies.items():
+            self.tallies.setdefault(column, Counter()).update(counts)
+        for column, stats in other.groups.items():
+            self.groups.setdefault(column, GroupStats()).merge(stats)
+        return self
+
+    def top(self, column, n):
+        """计数最多的n项 [(值, 计数)]"""
+        return self.tallies.get(column, Counter()).most_common(n)
+
+    def city_means(self):
+        """{城市: 平均月薪}"""
+        return {city: stats.mean() for city, stats in self.city_salary.items() if stats.count}
+
+    def to_dict(self):
+        return {
+            "version": AGGREGATES_VERSION,
+            "total": self.total,
+            "salary": self.salary.to_dict(),
+            "city_salary": {city: stats.to_dict() for city, stats in self.city_salary.items()},
+            "tallies": {column: dict(counts) for column, counts in self.tallies.items()},
+            "groups": {column: stats.to_dict() for column, stats in self.groups.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        aggregates.total = data["total"]
+        aggregates.salary = SalaryStats.from_dict(data["salary"])
+        aggregates.city_salary = {city: SalaryStats.from_dict(stats) for city, stats in data["city_salary"].items()}
+        for column, counts in data["tallies"].items():
+            aggregates.tallies[column] = Counter(counts)
+        for column, stats in data["groups"].items():
+            aggregates.groups[column] = GroupStats.from_dict(stats)
+        return aggregates
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
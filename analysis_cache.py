@@ -0,0 +1,264 @@
+"""
+分析数据缓存
+
+JobMarketAnalyzer 每次创建都要从原始JSON重新加载和处理全部职位。本模块把处理后的数据
+（职位主表和技能长表）保存在磁盘上，原始数据文件未变化时直接读取：
+
+    cache = ProcessedFrameCache("data/analysis_cache", version="p1-s1-r1")
+    frames = cache.load("data/all_jobs.json")
+    if frames is None:
+        fingerprint = source_fingerprint("data/all_jobs.json", with_hash=True)
+        ...加载并处理...
+        cache.save("data/all_jobs.json", {"jobs": df, "skills": skills_df}, fingerprint)
+
+缓存按数据文件的大小和修改时间判断是否有效；修改时间变了而大小相同时（如文件被复制或touch）
+再比较内容的sha1。处理规则的版本（薪资、要求标签解析器版本等）不同时缓存失效。
+安装pyarrow时保存为Parquet，否则（或数据中有Parquet不支持的列时）保存为pickle。
+Parquet读回后列表列的元素为numpy数组。
+
+增量分析使用 IncrementalState：记录已处理到数据文件中的第几条（高水位）和最后一条已处理记录的
+sha1，以及截至该位置的汇总（analysis_aggregates.JobAggregates）。数据管理器只在文件末尾追加职位，
+下次只需处理高水位之后的记录；最后一条记录对不上（文件被替换或改写）时从头重建。
+"""
+import os
+import json
+import hashlib
+import importlib.util
+from datetime import datetime
+
+import pandas as pd
+
+# pyarrow可选：未安装时使用pickle。只检查是否安装，读写Parquet时才由pandas导入
+USE_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+DEFAULT_CACHE_DIR = os.path.join("data", "analysis_cache")
+DEFAULT_STATE_PATH = os.path.join(DEFAULT_CACHE_DIR, "incremental_state.json")
+META_FILE = "meta.json"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha1(path):
+    """文件内容的sha1"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path, with_hash=False):
+    """
+    数据文件的指纹
+
+    Args:
+        path: 数据文件路径
+        with_hash: 是否计算内容sha1（保存缓存时需要，检查缓存时只在大小相同而修改时间不同时计算）
+
+    Returns:
+        {'path', 'size', 'mtime_ns', 'sha1'}，文件不存在时返回None
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha1": file_sha1(path) if with_hash else None
+    }
+
+
+class ProcessedFrameCache:
+    """按数据文件指纹和处理规则版本缓存处理后的DataFrame"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, version=None):
+        """
+        Args:
+            cache_dir: 缓存目录，每个数据文件使用其中的一个子目录
+            version: 处理规则版本，不同时缓存失效
+        """
+        self.cache_dir = cache_dir
+        self.version = version
+
+    def slot_dir(self, source_path):
+        """数据文件对应的缓存子目录"""
+        digest = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, digest)
+
+    def _read_meta(self, slot):
+        try:
+            with open(os.path.join(slot, META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, slot, meta):
+        path = os.path.join(slot, META_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def is_valid(self, source_path, meta):
+        """缓存的元数据是否与当前数据文件和处理规则一致"""
+        if not meta or meta.get("version") != self.version:
+            return False
+        current = source_fingerprint(source_path)
+        cached = meta.get("source") or {}
+        if current is None or current["size"] != cached.get("size"):
+            return False
+        if current["mtime_ns"] == cached.get("mtime_ns"):
+            return True
+        # 修改时间变了但大小相同：比较内容，内容未变时更新记录的修改时间
+        if cached.get("sha1") and file_sha1(source_path) == cached["sha1"]:
+            meta["source"]["mtime_ns"] = current["mtime_ns"]
+            self._write_meta(self.slot_dir(source_path), meta)
+            return True
+        return False
+
+    def load(self, source_path):
+        """
+        读取缓存
+
+        Returns:
+            {名称: DataFrame}，缓存不存在、已失效或无法读取时返回None
+        """
+        slot = self.slot_dir(source_path)
+        meta = self._read_meta(slot)
+        if not self.is_valid(source_path, meta):
+            return None
+        frames = {}
+        try:
+            for name, entry in meta["frames"].items():
+                path = os.path.join(slot, entry["file"])
+                if entry["format"] == "parquet":
+                    frames[name] = pd.read_parquet(path)
+                else:
+                    frames[name] = pd.read_pickle(path)
+        except Exception as e:
+            print(f"读取分析缓存失败，将重新处理: {str(e)}")
+            return None
+        return frames
+
+    def _write_frame(self, slot, name, frame):
+        """写入一个DataFrame，Parquet失败时改用pickle"""
+        if USE_PARQUET:
+            path = os.path.join(slot, f"{name}.parquet")
+            try:
+                frame.to_parquet(path, index=True)
+                return {"file": os.path.basename(path), "format": "parquet"}
+            except Exception:
+                if os.path.exists(path):
+                    os.remove(path)
+        path = os.path.join(slot, f"{name}.pkl")
+        frame.to_pickle(path)
+        return {"file": os.path.basename(path), "format": "pickle"}
+
+    def save(self, source_path, frames, fingerprint):
+        """
+        保存处理后的数据
+
+        Args:
+            source_path: 数据文件路径
+            frames: {名称: DataFrame}
+            fingerprint: 加载数据前取得的 source_fingerprint(with_hash=True)，
+                加载期间文件被修改时缓存会在下次检查时失效
+        """
+        if fingerprint is None:
+            return
+        slot = self.slot_dir(source_path)
+        if not os.path.exists(slot):
+            os.makedirs(slot)
+        # 先删除元数据再写数据文件，写到一半中断时不会读到不一致的缓存
+        meta_path = os.path.join(slot, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        entries = {name: self._write_frame(slot, name, frame) for name, frame in frames.items()}
+        self._write_meta(slot, {
+            "version": self.version,
+            "source": fingerprint,
+            "frames": entries,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+
+def record_digest(record):
+    """单条职位记录的sha1（键排序后的JSON）"""
+    return hashlib.sha1(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class IncrementalState:
+    """增量分析的高水位和截至高水位的汇总"""
+
+    def __init__(self, path=DEFAULT_STATE_PATH, version=None):
+        """
+        Args:
+            path: 状态文件路径
+            version: 处理规则和汇总格式的版本，不同时从头重建
+        """
+        self.path = path
+        self.version = version
+        self.source = None
+        self.offset = 0
+        self.last_digest = None
+        self.aggregates = None
+        self.updated_at = None
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH, version=None):
+        """读取状态文件，不存在、损坏或版本不同时返回空状态"""
+        state = cls(path, version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return state
+        if data.get("version") != version:
+            return state
+        state.source = data.get("source")
+        state.offset = data.get("offset", 0)
+        state.last_digest = data.get("last_digest")
+        state.aggregates = data.get("aggregates")
+        state.updated_at = data.get("updated_at")
+        return state
+
+    def new_records(self, source_path, records):
+        """
+        高水位之后的新记录
+
+        Returns:
+            (新记录列表, 是否从头重建)
+        """
+        source = os.path.abspath(source_path)
+        if (self.source != source or self.offset > len(records)
+                or (self.offset and record_digest(records[self.offset - 1]) != self.last_digest)):
+            self.source = source
+            self.offset = 0
+            self.last_digest = None
+            self.aggregates = None
+            return records, True
+        return records[self.offset:], False
+
+    def advance(self, records, aggregates):
+        """处理完全部记录后更新高水位和汇总（aggregates 为可JSON序列化的dict）"""
+        self.offset = len(records)
+        self.last_digest = record_digest(records[-1]) if records else None
+        self.aggregates = aggregates
+        self.updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.version,
+                "source": self.source,
+                "offset": self.offset,
+                "last_digest": self.last_digest,
+                "updated_at": self.updated_at,
+                "aggregates": self.aggregates
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
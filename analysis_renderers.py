@@ -0,0 +1,499 @@
+"""
+分析图表
+
+每个函数读取 analysis_result.AnalysisResult 中已算好的表格并绘图，不访问原始数据，
+也不再计算分组统计。可以直接由保存的结果生成图表：
+
+    python analysis_renderers.py eyes/analysis_result.json --output eyes
+
+render_all 的 workers 大于1时，每个图表在进程池中单独绘制（Agg后端）。统计结果只有几十KB，
+随任务传给子进程，子进程不需要重新加载数据；完整报告的耗时接近最慢的一个图表：
+
+    render_all(result, "eyes", workers=4)
+
+静态图表的分辨率和格式由绘图配置（RENDER_PROFILES）决定：preview 为低分辨率WebP，用于CI和反复调整分析时；
+standard 为300DPI的PNG（默认）；publication 为300DPI的PNG、SVG和PDF。每个图表在进程内复用同一个
+Figure对象（按图表名称），保存后清空内容，批量绘制结束时关闭全部图表，长时间运行时内存不会增长。
+
+matplotlib、seaborn、wordcloud和plotly在用到的图表中才导入，中文字体设置在第一次使用pyplot时进行，
+导入本模块没有副作用；只生成仪表盘时不会导入matplotlib。
+"""
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from analysis_result import AnalysisResult
+
+# 仪表盘薪资直方图的区间数
+DASHBOARD_SALARY_BINS = 20
+
+# 绘图配置：dpi、输出格式，bbox_inches='tight' 需要多绘制一次，预览时不使用
+RENDER_PROFILES = {
+    'preview': {'dpi': 72, 'formats': ['webp'], 'bbox_inches': None},
+    'standard': {'dpi': 300, 'formats': ['png'], 'bbox_inches': 'tight'},
+    'publication': {'dpi': 300, 'formats': ['png', 'svg', 'pdf'], 'bbox_inches': 'tight'},
+}
+DEFAULT_PROFILE = 'standard'
+
+_fonts_configured = False
+
+
+def _pyplot():
+    """导入pyplot，第一次调用时设置中文字体"""
+    global _fonts_configured
+    import matplotlib.pyplot as plt
+    if not _fonts_configured:
+        plt.rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
+        plt.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
+        _fonts_configured = True
+    return plt
+
+
+def get_profile(name=DEFAULT_PROFILE, dpi=None, formats=None):
+    """
+    取得绘图配置
+
+    Args:
+        name: RENDER_PROFILES 中的配置名称
+        dpi: 覆盖配置中的dpi
+        formats: 覆盖配置中的输出格式列表（如 ['png', 'svg']）
+    """
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"未知的绘图配置: {name}，可选: {', '.join(RENDER_PROFILES)}")
+    profile = dict(RENDER_PROFILES[name], name=name)
+    if dpi:
+        profile['dpi'] = dpi
+    if formats:
+        profile['formats'] = [fmt.lower().lstrip('.') for fmt in formats]
+    return profile
+
+
+def _figure(name, nrows=1, ncols=1, figsize=None):
+    """按图表名称复用Figure（清空后重新绘制），返回 (fig, axes)"""
+    return _pyplot().subplots(nrows, ncols, figsize=figsize, num=name, clear=True)
+
+
+def _finish(fig, save_path, message, profile=None):
+    """
+    按绘图配置保存图表，save_path 的扩展名替换为配置中的各个格式；没有 save_path 时显示图表
+
+    保存后清空Figure的内容以释放内存（Figure对象留给下次复用），显示后关闭
+    """
+    profile = profile or get_profile()
+    if save_path:
+        base = os.path.splitext(save_path)[0]
+        for fmt in profile['formats']:
+            path = f"{base}.{fmt}"
+            fig.savefig(path, dpi=profile['dpi'], bbox_inches=profile['bbox_inches'], format=fmt)
+            print(f"{message}已保存到 {path}")
+        fig.clear()
+    else:
+        plt = _pyplot()
+        plt.show()
+        plt.close(fig)
+
+
+def close_figures():
+    """关闭全部图表（批量绘制结束时调用）"""
+    _pyplot().close('all')
+
+
+def salary_distribution(result, save_path=None, profile=None):
+    """薪资分布：密度曲线和各城市箱线图"""
+    if not result.salary_count:
+        print("缺少薪资数据")
+        return
+
+    import seaborn as sns
+
+    # 设置颜色主题
+    colors = sns.color_palette("viridis", 3)
+
+    # 创建子图
+    fig, (ax1, ax2) = _figure('salary_distribution', 1, 2, figsize=(18, 8))
+
+    # 绘制KDE图：密度曲线由细分直方图计算（density.binned_kde），与仪表盘使用同一条曲线
+    density = result.tables['salary_density']
+    ax1.fill_between(density['salary'], density['density'], color=colors[0], alpha=0.25, linewidth=0)
+    ax1.plot(density['salary'], density['density'], color=colors[0])
+    ax1.set_ylim(bottom=0)
+    ax1.set_title('薪资分布密度曲线', fontsize=16)
+    ax1.set_xlabel('平均月薪 (K)', fontsize=14)
+    ax1.set_ylabel('密度', fontsize=14)
+
+    # 绘制箱线图 - 薪资最高的前8个城市，箱线图统计由各城市的直方图计算
+    city_salary = result.tables['city_salary'].head(8)
+    if len(city_salary) > 0:
+        stats = [
+            {'label': row.city, 'med': row.median, 'q1': row.q1, 'q3': row.q3,
+             'whislo': row.whislo, 'whishi': row.whishi, 'fliers': []}
+            for row in city_salary.itertuples()
+        ]
+        boxes = ax2.bxp(stats, showfliers=False, patch_artist=True)
+        for patch, color in zip(boxes['boxes'], sns.color_palette("viridis", len(stats))):
+            patch.set_facecolor(color)
+        ax2.set_title('各城市薪资分布箱线图', fontsize=16)
+        ax2.set_xlabel('城市', fontsize=14)
+        ax2.set_ylabel('平均月薪 (K)', fontsize=14)
+        ax2.tick_params(axis='x', rotation=45)
+
+    fig.tight_layout()
+    _finish(fig, save_path, "薪资分布图", profile)
+
+
+def market_overview(result, save_path=None, profile=None):
+    """职位市场概览：公司、城市、学历、经验排名"""
+    if not result.total:
+        print("没有数据可分析")
+        return
+
+    import seaborn as sns
+
+    # 创建画布
+    fig, axes = _figure('market_overview', 2, 2, figsize=(20, 16))
+
+    # 1. 职位数量前15的公司
+    sns.barplot(x='count', y='company', data=result.tables['company_counts'], ax=axes[0, 0], palette="viridis")
+    axes[0, 0].set_title('招聘职位数量前15的公司', fontsize=16)
+    axes[0, 0].set_xlabel('职位数量', fontsize=14)
+
+    # 2. 各城市职位数量
+    city_df = result.tables['city_counts']
+    if len(city_df) > 0:
+        sns.barplot(x='count', y='city', data=city_df, ax=axes[0, 1], palette="viridis")
+        axes[0, 1].set_title('各城市职位数量分布', fontsize=16)
+        axes[0, 1].set_xlabel('职位数量', fontsize=14)
+
+    # 3. 学历要求分布
+    edu_df = result.tables['education_counts']
+    if len(edu_df) > 0:
+        sns.barplot(x='count', y='education', data=edu_df, ax=axes[1, 0], palette="viridis")
+        axes[1, 0].set_title('学历要求分布', fontsize=16)
+        axes[1, 0].set_xlabel('职位数量', fontsize=14)
+
+    # 4. 工作经验要求分布
+    exp_df = result.tables['experience_counts']
+    if len(exp_df) > 0:
+        sns.barplot(x='count', y='experience', data=exp_df, ax=axes[1, 1], palette="viridis")
+        axes[1, 1].set_title('工作经验要求分布', fontsize=16)
+        axes[1, 1].set_xlabel('职位数量', fontsize=14)
+
+    fig.tight_layout()
+    _finish(fig, save_path, "职位市场概览", profile)
+
+
+def _find_cloud_font():
+    """查找SimHei或微软雅黑字体，找不到时返回None使用默认字体"""
+    try:
+        import matplotlib.font_manager as fm
+        for path in fm.findSystemFonts():
+            if 'simhei' in path.lower() or 'msyh' in path.lower():
+                return path
+    except Exception:
+        pass
+    return None
+
+
+def skills(result, save_path=None, profile=None):
+    """技能需求：Top20柱状图和词云（词云保存到 save_path 加 _cloud 后缀的文件）"""
+    skills_bar(result, save_path, profile)
+    cloud_path = f"{os.path.splitext(save_path)[0]}_cloud.png" if save_path else None
+    skills_cloud(result, cloud_path, profile)
+
+
+def skills_bar(result, save_path=None, profile=None):
+    """技能需求Top20柱状图"""
+    skill_counts = result.tables['skill_counts']
+    if len(skill_counts) == 0:
+        print("缺少技能数据")
+        return
+
+    import seaborn as sns
+
+    # 创建画布
+    fig, ax = _figure('skills_bar', figsize=(14, 8))
+
+    # 绘制技能需求柱状图
+    sns.barplot(x='count', y='skill', data=skill_counts.head(20), ax=ax, palette="viridis")
+    ax.set_title('职位技能需求Top20', fontsize=16)
+    ax.set_xlabel('需求数量', fontsize=14)
+    ax.set_ylabel('技能', fontsize=14)
+
+    fig.tight_layout()
+    _finish(fig, save_path, "技能需求分析", profile)
+
+
+def skills_cloud(result, save_path=None, profile=None):
+    """技能需求词云"""
+    skill_counts = result.tables['skill_counts']
+    if len(skill_counts) == 0:
+        print("缺少技能数据")
+        return
+
+    from wordcloud import WordCloud
+
+    fig, ax = _figure('skills_cloud', figsize=(14, 10))
+    try:
+        wordcloud = WordCloud(
+            font_path=_find_cloud_font(),
+            width=1200,
+            height=800,
+            background_color='white',
+            max_words=100,
+            colormap='viridis'
+        ).generate_from_frequencies(dict(zip(skill_counts['skill'], skill_counts['count'])))
+
+        ax.imshow(wordcloud, interpolation='bilinear')
+        ax.axis('off')
+        ax.set_title('技能需求词云', fontsize=20)
+
+        # 保存或显示
+        _finish(fig, save_path, "技能需求词云", profile)
+    except Exception as e:
+        fig.clear()
+        print(f"生成词云失败: {str(e)}")
+        print("跳过词云生成，继续分析...")
+
+
+def salary_vs_experience_education(result, save_path=None, profile=None):
+    """经验、学历与平均薪资的关系"""
+    if not result.salary_count:
+        print("缺少薪资数据")
+        return
+
+    import seaborn as sns
+
+    # 创建画布
+    fig, (ax1, ax2) = _figure('salary_vs_experience_education', 1, 2, figsize=(18, 8))
+
+    # 各经验类别的平均薪资，已按年限排序（经验归类见 analysis_aggregates.experience_categories）
+    exp_salary = result.tables['experience_salary']
+    if len(exp_salary) > 1:
+        sns.barplot(x='exp_category', y='salary_avg', data=exp_salary, ax=ax1, palette="viridis")
+        ax1.set_title('工作经验与平均薪资关系', fontsize=16)
+        ax1.set_xlabel('工作经验', fontsize=14)
+        ax1.set_ylabel('平均月薪 (K)', fontsize=14)
+        ax1.tick_params(axis='x', rotation=45)
+
+    # 各学历的平均薪资，已按学历高低排序
+    edu_salary = result.tables['education_salary']
+    if len(edu_salary) > 0:
+        sns.barplot(x='education', y='salary_avg', data=edu_salary, ax=ax2, palette="viridis")
+        ax2.set_title('学历要求与平均薪资关系', fontsize=16)
+        ax2.set_xlabel('学历要求', fontsize=14)
+        ax2.set_ylabel('平均月薪 (K)', fontsize=14)
+        ax2.tick_params(axis='x', rotation=45)
+
+    fig.tight_layout()
+    _finish(fig, save_path, "薪资与经验、学历关系分析图", profile)
+
+
+def interactive_dashboard(result, output_file='job_analysis_dashboard.html', profile=None):
+    """交互式仪表盘（plotly HTML，不受绘图配置影响）"""
+    if not result.total:
+        print("没有数据可分析")
+        return
+
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # 创建子图布局
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            '薪资分布',
+            '各城市平均薪资',
+            '招聘职位数量前10的公司',
+            '技能需求TOP15'
+        ),
+        specs=[
+            [{"type": "scatter"}, {"type": "bar"}],
+            [{"type": "bar"}, {"type": "bar"}]
+        ]
+    )
+
+    # 1. 薪资分布图：由细分直方图合并为20个区间
+    histogram = result.tables['salary_histogram']
+    if len(histogram) > 0:
+        summary = result.tables['summary'].iloc[0]
+        edges = np.linspace(summary['salary_min'], summary['salary_max'], DASHBOARD_SALARY_BINS + 1)
+        counts, edges = np.histogram(histogram['salary'], bins=edges, weights=histogram['count'])
+        fig.add_trace(
+            go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts,
+                width=edges[1] - edges[0],
+                marker_color='rgba(73, 43, 174, 0.6)',
+                name='薪资分布'
+            ),
+            row=1, col=1
+        )
+
+        # 添加薪资密度曲线：密度乘以职位数和区间宽度，换算为与柱状图相同的单位
+        density = result.tables['salary_density']
+        fig.add_trace(
+            go.Scatter(
+                x=density['salary'],
+                y=density['density'] * result.salary_count * (edges[1] - edges[0]),
+                mode='lines',
+                line=dict(color='rgba(220, 57, 18, 0.8)', width=3),
+                name='薪资密度'
+            ),
+            row=1, col=1
+        )
+
+    # 2. 各城市平均薪资
+    city_salary = result.tables['city_salary'].head(10)
+    if len(city_salary) > 0:
+        fig.add_trace(
+            go.Bar(
+                y=city_salary['city'],
+                x=city_salary['mean'],
+                orientation='h',
+                marker_color='rgba(33, 158, 188, 0.8)',
+                name='城市平均薪资'
+            ),
+            row=1, col=2
+        )
+
+    # 3. 招聘职位数量前10的公司
+    company_counts = result.tables['company_counts'].head(10)
+    fig.add_trace(
+        go.Bar(
+            y=company_counts['company'],
+            x=company_counts['count'],
+            orientation='h',
+            marker_color='rgba(254, 97, 0, 0.8)',
+            name='公司职位数'
+        ),
+        row=2, col=1
+    )
+
+    # 4. 技能需求分析
+    skills_df = result.tables['skill_counts'].head(15)
+    if len(skills_df) > 0:
+        fig.add_trace(
+            go.Bar(
+                y=skills_df['skill'],
+                x=skills_df['count'],
+                orientation='h',
+                marker_color='rgba(36, 123, 160, 0.8)',
+                name='技能需求'
+            ),
+            row=2, col=2
+        )
+
+    # 更新布局
+    fig.update_layout(
+        title_text='互联网职位市场分析仪表盘',
+        title_font_size=24,
+        height=900,
+        showlegend=False,
+    )
+
+    # 保存HTML文件
+    fig.write_html(output_file)
+    print(f"交互式仪表盘已保存到 {output_file}")
+
+
+# 完整报告的图表：名称 -> (绘图函数, 输出文件名)
+CHARTS = {
+    'salary': (salary_distribution, 'salary_distribution.png'),
+    'market': (market_overview, 'job_market_overview.png'),
+    'skills': (skills_bar, 'skills_analysis.png'),
+    'cloud': (skills_cloud, 'skills_analysis_cloud.png'),
+    'education': (salary_vs_experience_education, 'salary_vs_exp_edu.png'),
+    'dashboard': (interactive_dashboard, 'job_analysis_dashboard.html'),
+}
+
+
+def _init_worker():
+    """子进程只保存文件，不打开窗口"""
+    _pyplot().switch_backend('Agg')
+
+
+def _render_chart(name, result, path, profile):
+    """绘制一个图表，返回 (名称, 耗时秒数)"""
+    start = time.perf_counter()
+    CHARTS[name][0](result, path, profile)
+    return name, time.perf_counter() - start
+
+
+def render_all(result, output_dir='analysis_results', charts=None, workers=1, profile=None):
+    """
+    生成完整报告
+
+    Args:
+        result: AnalysisResult
+        output_dir: 输出目录
+        charts: 要生成的图表名称（见 CHARTS），None时全部生成
+        workers: 并行绘图的进程数，1为在当前进程中依次绘制
+        profile: get_profile 返回的绘图配置，None时为 DEFAULT_PROFILE
+
+    Returns:
+        {图表名称: 耗时秒数}，失败的图表不包含在内
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    profile = profile or get_profile()
+    names = list(charts or CHARTS)
+    paths = {name: os.path.join(output_dir, CHARTS[name][1]) for name in names}
+    timings = {}
+    start = time.perf_counter()
+
+    if workers <= 1 or len(names) <= 1:
+        try:
+            for name in names:
+                # 与并行绘制相同：一个图表失败不影响其他图表
+                try:
+                    name, seconds = _render_chart(name, result, paths[name], profile)
+                    timings[name] = seconds
+                except Exception as e:
+                    print(f"生成图表 {name} 失败: {str(e)}")
+                    # 失败的图表可能留下未关闭的figure，避免后面的图表画在上面
+                    close_figures()
+        finally:
+            close_figures()
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(names)), initializer=_init_worker) as executor:
+            futures = {executor.submit(_render_chart, name, result, paths[name], profile): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    name, seconds = future.result()
+                    timings[name] = seconds
+                except Exception as e:
+                    print(f"生成图表 {futures[future]} 失败: {str(e)}")
+
+    elapsed = time.perf_counter() - start
+    print(f"生成 {len(timings)} 个图表（{profile['name']}: {profile['dpi']}DPI {'/'.join(profile['formats'])}）"
+          f"用时 {elapsed:.1f}s（"
+          + "，".join(f"{name} {seconds:.1f}s" for name, seconds in timings.items()) + "）")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='由保存的分析结果生成图表')
+    parser.add_argument('result', help='AnalysisResult.save 保存的JSON文件或Parquet目录')
+    parser.add_argument('--output', default='eyes', help='图表输出目录')
+    parser.add_argument('--charts', default=None, help=f'要生成的图表，逗号分隔：{",".join(CHARTS)}，默认全部')
+    parser.add_argument('--workers', type=int, default=1, help='并行绘图的进程数，默认为1（依次绘制）')
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default=DEFAULT_PROFILE,
+                        help=f'绘图配置，默认为{DEFAULT_PROFILE}')
+    parser.add_argument('--dpi', type=int, default=None, help='覆盖绘图配置中的分辨率')
+    parser.add_argument('--formats', default=None, help='覆盖绘图配置中的输出格式，逗号分隔，如 png,svg,pdf')
+    args = parser.parse_args(argv)
+
+    charts = [name.strip() for name in args.charts.split(',')] if args.charts else None
+    for name in charts or []:
+        if name not in CHARTS:
+            parser.error(f"未知的图表: {name}")
+    formats = args.formats.split(',') if args.formats else None
+    profile = get_profile(args.profile, args.dpi, formats)
+    render_all(AnalysisResult.load(args.result), args.output, charts, args.workers, profile)
+
+
+if __name__ == "__main__":
+    main()
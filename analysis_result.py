@@ -0,0 +1,209 @@
+"""
+分析结果
+
+AnalysisResult 由汇总（analysis_aggregates.JobAggregates）一次算出所有图表需要的表格：薪资概况、
+细分直方图、密度曲线、各城市薪资统计、公司/城市/学历/经验/技能排名、经验和学历对应的平均薪资。
+图表（analysis_renderers）只读取这些表格，完整报告中每项统计只计算一次；
+不需要图表的流程可以只计算并保存结果，不导入matplotlib和plotly：
+
+    result = AnalysisResult.from_aggregates(aggregates, source="data/all_jobs.json")
+    result.save("eyes/analysis_result.json")        # JSON
+    result.save("eyes/analysis_result")             # 目录，每个表格一个Parquet文件（需要pyarrow）
+    result = AnalysisResult.load("eyes/analysis_result.json")
+    result.tables["city_salary"].head(8)
+
+表格的列见 TABLE_COLUMNS，排名表只保存前 TOP_COUNTS 项。
+"""
+import os
+import json
+import importlib.util
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analysis_aggregates import SALARY_BIN_WIDTH, bin_centers, experience_sort_key
+from density import binned_kde, select_bandwidth
+
+# 只检查pyarrow是否安装，保存为Parquet时才由pandas导入
+USE_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+RESULT_VERSION = 2
+META_FILE = "meta.json"
+
+TABLE_COLUMNS = {
+    # 单行：职位数和月薪（K）概况，分位数由直方图插值
+    "summary": ["total", "salary_count", "salary_mean", "salary_std", "salary_min", "salary_max",
+                "salary_q1", "salary_median", "salary_q3"],
+    # 月薪细分直方图的非零桶：桶中心和职位数
+    "salary_histogram": ["salary", "count"],
+    # 由细分直方图计算的月薪核密度曲线（Scott规则带宽）
+    "salary_density": ["salary", "density"],
+    # 各城市的月薪统计，按平均月薪从高到低；q1/median/q3/whislo/whishi 为箱线图统计
+    "city_salary": ["city", "count", "mean", "q1", "median", "q3", "whislo", "whishi"],
+    "company_counts": ["company", "count"],
+    "city_counts": ["city", "count"],
+    "education_counts": ["education", "count"],
+    "experience_counts": ["experience", "count"],
+    "skill_counts": ["skill", "count"],
+    # 按年限排序的经验类别平均月薪
+    "experience_salary": ["exp_category", "salary_avg"],
+    # 按学历高低排序的平均月薪（只含 EDUCATION_ORDER 中的学历）
+    "education_salary": ["education", "salary_avg"],
+}
+
+# 排名表保存的项数：(汇总中的列, 项数)
+TOP_COUNTS = {
+    "company_counts": ("company_name", 15),
+    "city_counts": ("city", 10),
+    "education_counts": ("education", 10),
+    "experience_counts": ("experience", 10),
+    # 词云最多100个词
+    "skill_counts": ("skill", 100),
+}
+
+EDUCATION_ORDER = ["学历不限", "大专", "本科", "硕士", "博士"]
+
+
+class AnalysisResult:
+    """图表使用的全部统计表格"""
+
+    def __init__(self, tables=None, meta=None):
+        """
+        Args:
+            tables: {表名: DataFrame}，缺少的表为空表
+            meta: 生成时间、数据来源等
+        """
+        tables = tables or {}
+        self.tables = {name: tables.get(name, pd.DataFrame(columns=columns))
+                       for name, columns in TABLE_COLUMNS.items()}
+        self.meta = meta or {}
+
+    @classmethod
+    def from_aggregates(cls, aggregates, source=None):
+        """
+        由汇总计算全部表格
+
+        Args:
+            aggregates: JobAggregates
+            source: 数据来源（记录在meta中）
+        """
+        salary = aggregates.salary
+        tables = {
+            "summary": pd.DataFrame([{
+                "total": aggregates.total,
+                "salary_count": salary.count,
+                "salary_mean": salary.mean(),
+                "salary_std": salary.std(),
+                "salary_min": salary.min,
+                "salary_max": salary.max,
+                "salary_q1": salary.quantile(0.25),
+                "salary_median": salary.quantile(0.5),
+                "salary_q3": salary.quantile(0.75),
+            }], columns=TABLE_COLUMNS["summary"])
+        }
+
+        nonzero = np.flatnonzero(salary.histogram)
+        tables["salary_histogram"] = pd.DataFrame({"salary": bin_centers()[nonzero],
+                                                   "count": salary.histogram[nonzero]})
+        if salary.count:
+            bandwidth = select_bandwidth(salary.count, salary.std())
+            x, density = binned_kde(salary.histogram, SALARY_BIN_WIDTH, bandwidth=bandwidth)
+            tables["salary_density"] = pd.DataFrame({"salary": x, "density": density})
+
+        rows = []
+        for city, stats in aggregates.city_salary.items():
+            if not stats.count:
+                continue
+            box = stats.box_stats()
+            rows.append({"city": city, "count": stats.count, "mean": stats.mean(), "q1": box["q1"],
+                         "median": box["med"], "q3": box["q3"], "whislo": box["whislo"], "whishi": box["whishi"]})
+        city_salary = pd.DataFrame(rows, columns=TABLE_COLUMNS["city_salary"])
+        tables["city_salary"] = city_salary.sort_values("mean", ascending=False, kind="stable").reset_index(drop=True)
+
+        for name, (column, n) in TOP_COUNTS.items():
+            tables[name] = pd.DataFrame(aggregates.top(column, n), columns=TABLE_COLUMNS[name])
+
+        exp_salary = pd.DataFrame(list(aggregates.groups["exp_category"].means().items()),
+                                  columns=TABLE_COLUMNS["experience_salary"])
+        order = exp_salary["exp_category"].map(experience_sort_key).sort_values(kind="stable").index
+        tables["experience_salary"] = exp_salary.loc[order].reset_index(drop=True)
+
+        edu_means = aggregates.groups["education"].means()
+        tables["education_salary"] = pd.DataFrame(
+            [(education, edu_means[education]) for education in EDUCATION_ORDER if education in edu_means],
+            columns=TABLE_COLUMNS["education_salary"])
+
+        meta = {
+            "version": RESULT_VERSION,
+            "source": source,
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        return cls(tables, meta)
+
+    @property
+    def total(self):
+        """职位总数"""
+        summary = self.tables["summary"]
+        return int(summary["total"].iloc[0]) if len(summary) else 0
+
+    @property
+    def salary_count(self):
+        """有月薪的职位数"""
+        summary = self.tables["summary"]
+        return int(summary["salary_count"].iloc[0]) if len(summary) else 0
+
+    def to_dict(self):
+        return {
+            "meta": self.meta,
+            # to_json 再读回，把numpy类型转换为JSON类型
+            "tables": {name: json.loads(table.to_json(orient="records", force_ascii=False, double_precision=15))
+                       for name, table in self.tables.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tables = {name: pd.DataFrame(records, columns=TABLE_COLUMNS[name])
+                  for name, records in data["tables"].items() if name in TABLE_COLUMNS}
+        return cls(tables, data.get("meta"))
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def save(self, path):
+        """
+        保存结果
+
+        Args:
+            path: 以.json结尾时保存为一个JSON文件，否则保存为目录（每个表格一个Parquet文件和meta.json）
+        """
+        if path.endswith(".json"):
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_json())
+            return
+        if not USE_PARQUET:
+            raise ValueError("保存为Parquet需要安装pyarrow: pip install pyarrow")
+        if not os.path.exists(path):
+            os.makedirs(path)
+        for name, table in self.tables.items():
+            table.to_parquet(os.path.join(path, f"{name}.parquet"), index=False)
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """读取 save 保存的结果（JSON文件或Parquet目录）"""
+        if os.path.isdir(path):
+            tables = {}
+            for name in TABLE_COLUMNS:
+                table_path = os.path.join(path, f"{name}.parquet")
+                if os.path.exists(table_path):
+                    tables[name] = pd.read_parquet(table_path)
+            with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return cls(tables, meta)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,120 @@
+"""
+分析数据的紧凑列类型
+
+从JSON加载的职位数据每个文本字段都是Python字符串对象（每个50-100字节以上），数值列为int64/float64，
+百万行的数据占用数GB内存。compact_frame 在处理完成后转换列类型：
+
+- 重复值多的文本列（城市、区域、经验、学历、公司等）转为 category：每行只存一个整数编码
+- 其他文本列（职位名、链接、ID等）安装pyarrow时转为Arrow字符串，否则保持object
+- 薪资列转为float32，其他数值列在不损失精度时向下转换（int64 -> int32/int8，float64 -> float32）
+
+要求标签列表拆分为经验、学历两列和技能长表（见 requirements_parser）后不再保留在主表中：
+
+    df = compact_frame(df)
+    skills_df = compact_skills(skills_df)
+    print(f"{memory_usage_mb(df):.1f} MB")
+
+列类型规则修改后需要增加 SCHEMA_VERSION，使缓存的处理结果失效。
+"""
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# pyarrow可选：未安装时非分类的文本列保持object。只检查是否安装，转换列类型时才由pandas导入
+USE_ARROW_STRINGS = importlib.util.find_spec("pyarrow") is not None
+
+SCHEMA_VERSION = 1
+
+# 总是转为category的列（取值种类少）
+CATEGORY_COLUMNS = [
+    "city", "district", "job_area", "business_district", "experience", "education", "keyword",
+    "salary_unit", "hr_title", "publish_time", "company_industry", "company_scale", "company_stage"
+]
+# 其他文本列不重复值占比不超过该值时转为category
+CATEGORY_MAX_RATIO = 0.5
+
+# 薪资列的精度需求远低于float64
+FLOAT32_COLUMNS = ["salary_min", "salary_max", "salary_avg", "salary_annual"]
+
+# 已拆分为其他列或长表、处理后从主表删除的列
+DROP_COLUMNS = ["job_requirements"]
+
+
+def _is_text(series):
+    """列是否全部为字符串（允许缺失值）"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return True
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def compact_column(series, categorical=None):
+    """
+    转换单列为紧凑类型
+
+    Args:
+        series: 列
+        categorical: 文本列是否转为category，None时按不重复值占比决定
+
+    Returns:
+        转换后的列（无法转换的列原样返回）
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if _is_text(series):
+        if categorical is None:
+            categorical = series.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(series)
+        if categorical:
+            return series.astype("category")
+        if USE_ARROW_STRINGS and series.dtype == object:
+            return series.astype(pd.StringDtype("pyarrow"))
+        return series
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series.dtype):
+        if series.name in FLOAT32_COLUMNS:
+            return series.astype("float32")
+        # 只在数值不变时转换（经纬度等保持float64）
+        return pd.to_numeric(series, downcast="float")
+    return series
+
+
+def compact_frame(df, category_columns=CATEGORY_COLUMNS, drop_columns=DROP_COLUMNS):
+    """
+    转换职位主表的列类型
+
+    Args:
+        df: JobMarketAnalyzer.process_data 处理后的主表
+        category_columns: 总是转为category的列
+        drop_columns: 删除的列
+
+    Returns:
+        新的DataFrame（索引不变）
+    """
+    df = df.drop(columns=[column for column in drop_columns if column in df.columns])
+    columns = {}
+    for column in df.columns:
+        columns[column] = compact_column(df[column], True if column in category_columns else None)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def compact_skills(skills_df):
+    """技能长表：job_index 向下转换为最小的整数类型，skill 转为category"""
+    if skills_df is None:
+        return None
+    skills_df = skills_df.copy()
+    if pd.api.types.is_integer_dtype(skills_df["job_index"].dtype):
+        skills_df["job_index"] = pd.to_numeric(skills_df["job_index"], downcast="integer")
+    skills_df["skill"] = skills_df["skill"].astype("category")
+    return skills_df
+
+
+def memory_usage_mb(df):
+    """DataFrame占用的内存（MB，包括字符串对象本身）"""
+    if df is None:
+        return 0.0
+    return float(np.sum(df.memory_usage(deep=True))) / (1 << 20)
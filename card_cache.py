@@ -0,0 +1,210 @@
+"""
+职位卡片提取缓存
+
+同一个职位卡片会在不同页码、不同关键词（如“数据分析”和“Python”）以及每天的重复爬取中反复出现，
+每次都在浏览器中执行一遍选择器级联代价很高。本模块以卡片HTML的哈希为键缓存提取结果：
+
+    cache = CardCache(max_entries=5000, db_path="data/card_cache.db")
+    job_data = cache.get(card_html)
+    if job_data is None:
+        job_data = extract_card(...)
+        cache.put(card_html, job_data)
+
+内存中是有容量上限的LRU，可选的SQLite磁盘层在多次运行之间保留结果。计算哈希前会去掉详情链接中
+每次搜索都会变化的查询参数（lid、securityId），命中时从当前卡片HTML中取回完整的详情链接，
+并把爬取时间更新为本次时间。提取规则版本（EXTRACTION_RULES_VERSION）参与哈希，规则修改后旧结果自动失效。
+"""
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from html import unescape
+from urllib.parse import urljoin
+
+from zhipin_card_parser import BASE_URL, EXTRACTION_RULES_VERSION
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_DISK_ENTRIES = 200000
+
+# 详情链接中的查询参数（lid、securityId）每次搜索都不同，不参与哈希
+DETAIL_QUERY_PATTERN = re.compile(r'(job_detail/[^"\'?\s>]+)\?[^"\'\s>]*')
+DETAIL_HREF_PATTERN = re.compile(r'href=["\']([^"\']*job_detail[^"\']*)["\']')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    key TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    last_seen REAL NOT NULL
+)
+"""
+
+
+def card_cache_key(card_html):
+    """卡片HTML的缓存键：去掉详情链接查询参数、合并空白后与提取规则版本一起计算sha1"""
+    normalized = DETAIL_QUERY_PATTERN.sub(r'\1', card_html)
+    normalized = WHITESPACE_PATTERN.sub(" ", normalized).strip()
+    digest = hashlib.sha1(f"{EXTRACTION_RULES_VERSION}\n{normalized}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def detail_link_from_html(card_html, base_url=BASE_URL):
+    """从卡片HTML中取出带本次查询参数的详情链接，没有时返回None"""
+    match = DETAIL_HREF_PATTERN.search(card_html)
+    if not match:
+        return None
+    return urljoin(base_url + "/", unescape(match.group(1)))
+
+
+class CardCache:
+    """职位卡片提取结果的两级缓存（内存LRU + 可选SQLite）"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, db_path=None,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES, flush_every=200):
+        """
+        Args:
+            max_entries: 内存中最多保留的卡片数，0表示不使用内存层
+            db_path: SQLite磁盘缓存路径，None表示只使用内存
+            max_disk_entries: 磁盘缓存最多保留的卡片数，关闭时按最近使用时间淘汰
+            flush_every: 积累多少条新结果后写入磁盘
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.flush_every = flush_every
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+        self.db_path = db_path
+        self.conn = None
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(DISK_SCHEMA)
+            self.conn.commit()
+
+    def _remember(self, key, record):
+        if self.max_entries <= 0:
+            return
+        self.memory[key] = record
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _load_from_disk(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        if self.conn is None:
+            return None
+        row = self.conn.execute("SELECT record FROM cards WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.pending[key] = json.loads(row[0])
+        return self.pending[key]
+
+    def get(self, card_html, crawl_time=None, base_url=BASE_URL):
+        """
+        查找卡片的提取结果
+
+        Args:
+            card_html: 卡片的outerHTML
+            crawl_time: 写入返回记录的爬取时间，默认为当前时间
+            base_url: 补全相对详情链接使用的网站地址
+
+        Returns:
+            职位记录（副本），未命中时返回None
+        """
+        if not card_html:
+            return None
+        key = card_cache_key(card_html)
+        with self.lock:
+            record = self.memory.get(key)
+            if record is not None:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            else:
+                record = self._load_from_disk(key)
+                if record is None:
+                    self.stats["misses"] += 1
+                    return None
+                self.stats["disk_hits"] += 1
+                self._remember(key, record)
+            self._maybe_flush()
+
+        job_data = dict(record)
+        job_data["job_requirements"] = list(record.get("job_requirements", []))
+        job_data["crawl_time"] = crawl_time or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if job_data.get("detail_link"):
+            job_data["detail_link"] = detail_link_from_html(card_html, base_url) or job_data["detail_link"]
+        return job_data
+
+    def put(self, card_html, job_data):
+        """保存卡片的提取结果；没有提取到职位（None）的卡片不缓存，下次重新提取"""
+        if not card_html or not job_data:
+            return
+        key = card_cache_key(card_html)
+        record = dict(job_data)
+        with self.lock:
+            self._remember(key, record)
+            if self.conn is not None:
+                self.pending[key] = record
+            self.stats["stores"] += 1
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self.conn is not None and len(self.pending) >= self.flush_every:
+            self._flush()
+
+    def _flush(self):
+        """将新结果和最近命中的条目写入磁盘（调用方持有锁）"""
+        if self.conn is None or not self.pending:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cards (key, record, last_seen) VALUES (?, ?, ?)",
+            [(key, json.dumps(record, ensure_ascii=False), now) for key, record in self.pending.items()]
+        )
+        self.conn.commit()
+        self.pending.clear()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def report(self):
+        """命中统计"""
+        return {
+            "lookups": self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"],
+            "memory_hits": self.stats["memory_hits"],
+            "disk_hits": self.stats["disk_hits"],
+            "misses": self.stats["misses"],
+            "stores": self.stats["stores"],
+            "evictions": self.stats["evictions"],
+            "hit_rate": round(self.hit_rate(), 4),
+            "memory_entries": len(self.memory)
+        }
+
+    def close(self):
+        """写入未保存的结果，按最近使用时间淘汰超出上限的磁盘条目"""
+        with self.lock:
+            if self.conn is None:
+                return
+            self._flush()
+            self.conn.execute(
+                "DELETE FROM cards WHERE key NOT IN (SELECT key FROM cards ORDER BY last_seen DESC LIMIT ?)",
+                (self.max_disk_entries,)
+            )
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,88 @@
+"""
+BOSS直聘城市代码和区县代码
+
+两个爬虫、爬取任务队列和本地模拟服务共用同一张映射表。本模块不依赖任何第三方库，
+可以在未安装Selenium的环境中导入。
+"""
+
+# 城市映射表：城市名称到城市代码的映射
+CITY_CODES = {
+    "北京": "101010100",
+    "上海": "101020100",
+    "广州": "101280100",
+    "深圳": "101280600",
+    "杭州": "101210100",
+    "苏州": "101190400",
+    "南京": "101190100",
+    "天津": "101030100",
+    "成都": "101270100",
+    "武汉": "101200100",
+    "西安": "101110100",
+    "重庆": "101040100",
+    "郑州": "101180100",
+    "长沙": "101250100",
+    "大连": "101070200",
+    "青岛": "101120200",
+    "宁波": "101210400",
+    "厦门": "101230200",
+    "福州": "101230100",
+    "济南": "101120100",
+    "合肥": "101220100",
+    "石家庄": "101090100",
+    "哈尔滨": "101050100",
+    "全国": "100010000"
+}
+
+# 城市代码到城市名称的反向映射
+CITY_NAMES = {code: name for name, code in CITY_CODES.items()}
+
+
+def resolve_city(city):
+    """
+    将城市名称或城市代码统一解析为 (城市名称, 城市代码)
+
+    未知的城市抛出ValueError
+    """
+    city = str(city).strip()
+    if city in CITY_CODES:
+        return city, CITY_CODES[city]
+    if city in CITY_NAMES:
+        return CITY_NAMES[city], city
+    raise ValueError(f"未知的城市: {city}，可选: {', '.join(CITY_CODES)}")
+
+
+# 区县代码：城市名称 -> {区县名称: 代码}，搜索时作为 areaBusiness 参数按区域筛选
+CITY_DISTRICT_CODES = {
+    "北京": {
+        "东城区": "110101", "西城区": "110102", "朝阳区": "110105", "丰台区": "110106",
+        "石景山区": "110107", "海淀区": "110108", "门头沟区": "110109", "房山区": "110111",
+        "通州区": "110112", "顺义区": "110113", "昌平区": "110114", "大兴区": "110115",
+        "怀柔区": "110116", "平谷区": "110117", "密云区": "110118", "延庆区": "110119"
+    },
+    "上海": {
+        "黄浦区": "310101", "徐汇区": "310104", "长宁区": "310105", "静安区": "310106",
+        "普陀区": "310107", "虹口区": "310109", "杨浦区": "310110", "闵行区": "310112",
+        "宝山区": "310113", "嘉定区": "310114", "浦东新区": "310115", "金山区": "310116",
+        "松江区": "310117", "青浦区": "310118", "奉贤区": "310120", "崇明区": "310151"
+    },
+    "广州": {
+        "荔湾区": "440103", "越秀区": "440104", "海珠区": "440105", "天河区": "440106",
+        "白云区": "440111", "黄埔区": "440112", "番禺区": "440113", "花都区": "440114",
+        "南沙区": "440115", "从化区": "440117", "增城区": "440118"
+    },
+    "深圳": {
+        "罗湖区": "440303", "福田区": "440304", "南山区": "440305", "宝安区": "440306",
+        "龙岗区": "440307", "盐田区": "440308", "龙华区": "440309", "坪山区": "440310",
+        "光明区": "440311"
+    },
+    "杭州": {
+        "上城区": "330102", "拱墅区": "330105", "西湖区": "330106", "滨江区": "330108",
+        "萧山区": "330109", "余杭区": "330110", "富阳区": "330111", "临安区": "330112",
+        "临平区": "330113", "钱塘区": "330114"
+    },
+    "成都": {
+        "锦江区": "510104", "青羊区": "510105", "金牛区": "510106", "武侯区": "510107",
+        "成华区": "510108", "龙泉驿区": "510112", "青白江区": "510113", "新都区": "510114",
+        "温江区": "510115", "双流区": "510116", "郫都区": "510117"
+    }
+}
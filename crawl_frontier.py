@@ -0,0 +1,762 @@
+"""
+持久化爬取任务队列（城市 × 关键词 × 页码）
+
+任务保存在SQLite数据库中，可以由多个工作进程同时领取执行：
+
+    # 按配置文件生成任务（重复执行不会产生重复任务）
+    python crawl_frontier.py seed --config crawl_config.example.json
+
+    # 启动工作进程，可在多个终端/多台共享磁盘的机器上同时运行
+    python crawl_frontier.py work --backend requests
+
+    # 查看进度、重置失败任务、将结果导入数据管理器
+    python crawl_frontier.py status
+    python crawl_frontier.py reset
+    python crawl_frontier.py export
+
+任务状态：
+    pending  等待执行（失败重试的任务在 next_run_at 之前不会被领取）
+    leased   已被某个工作进程领取，租约到期未完成时会被其他进程重新领取
+    done     已完成，结果保存在 results 表中
+    failed   重试次数用完
+    skipped  同一查询的前面某页已没有职位，后续页不再爬取
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import sqlite3
+import argparse
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode
+
+from city_codes import resolve_city
+from retry_policy import CircuitBreaker, PageNotReadyError, is_retryable
+
+DEFAULT_DB_PATH = os.path.join("data", "crawl_frontier.db")
+
+TASK_STATES = ["pending", "leased", "done", "failed", "skipped"]
+
+TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    city TEXT NOT NULL,
+    city_code TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    filters TEXT NOT NULL DEFAULT '',
+    page INTEGER NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    next_run_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    result_count INTEGER,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (city_code, keyword, filters, page)
+)
+"""
+
+SCHEMA = TASKS_TABLE + """;
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (state, priority, next_run_at);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES tasks (id),
+    worker TEXT,
+    jobs TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    exported INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def default_worker_id():
+    """工作进程标识：主机名-进程号"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def format_timestamp(timestamp):
+    """将时间戳格式化为与 crawl_time 相同的字符串"""
+    if not timestamp:
+        return "N/A"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def encode_filters(filters):
+    """将筛选条件dict编码为规范的查询字符串（按参数名排序），无筛选条件时为空字符串"""
+    if not filters:
+        return ""
+    if isinstance(filters, str):
+        filters = dict(parse_qsl(filters))
+    return urlencode(sorted((key, str(value)) for key, value in filters.items() if value not in (None, "")))
+
+
+def decode_filters(filters):
+    """将查询字符串形式的筛选条件解码为dict"""
+    return dict(parse_qsl(filters or ""))
+
+
+def load_crawl_config(path):
+    """
+    读取爬取配置（JSON）
+
+    示例：
+        {
+            "cities": ["北京", "上海"],
+            "keywords": ["Python", "数据分析"],
+            "pages": 3,
+            "priority": 0,
+            "city_priority": {"北京": 5},
+            "keyword_priority": {"Python": 10}
+        }
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    if not config.get("cities") or not config.get("keywords"):
+        raise ValueError(f"配置文件缺少 cities 或 keywords: {path}")
+    return config
+
+
+class CrawlFrontier:
+    """SQLite任务队列，每个进程使用自己的实例"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, lease_seconds=300, max_attempts=5,
+                 backoff_base=30, backoff_max=3600):
+        """
+        Args:
+            db_path: 数据库文件路径
+            lease_seconds: 领取任务的租约时长，超时未完成的任务可被重新领取
+            max_attempts: 每个任务最多尝试次数
+            backoff_base: 第一次失败后的重试等待秒数，之后每次翻倍
+            backoff_max: 重试等待的上限（秒）
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        # 自动提交模式，需要原子性的操作显式使用 BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """旧版数据库的tasks表没有filters列，唯一约束也不同，需要重建"""
+        columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(tasks)")]
+        if not columns or "filters" in columns:
+            return
+        self._transaction()
+        try:
+            # 按SQLite推荐的步骤：建新表、复制数据、删除旧表、新表改名
+            self.conn.execute(TASKS_TABLE.replace("EXISTS tasks (", "EXISTS tasks_new (", 1))
+            self.conn.execute(f"INSERT INTO tasks_new ({', '.join(columns)}) SELECT {', '.join(columns)} FROM tasks")
+            self.conn.execute("DROP TABLE tasks")
+            self.conn.execute("ALTER TABLE tasks_new RENAME TO tasks")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        """开启写事务，多个进程同时领取任务时互斥"""
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def add_task(self, city, keyword, page, priority=0, filters=None):
+        """
+        添加一个任务，已存在时忽略，返回是否新增
+
+        filters为搜索筛选条件（dict或查询字符串，如 {"salary": "405"}），用于拆分后的子查询
+        """
+        city_name, city_code = resolve_city(city)
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO tasks (city, city_code, keyword, filters, page, priority, max_attempts, "
+            "next_run_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (city_name, city_code, keyword, encode_filters(filters), page, priority, self.max_attempts, now, now, now)
+        )
+        return cursor.rowcount > 0
+
+    def seed(self, cities, keywords, pages, priority=0, city_priority=None, keyword_priority=None):
+        """
+        按城市 × 关键词 × 页码生成任务
+
+        任务优先级 = priority + 城市优先级 + 关键词优先级，前面的页码略优先，
+        使同一查询的各页大致按顺序执行。
+
+        Returns:
+            新增的任务数
+        """
+        city_priority = city_priority or {}
+        keyword_priority = keyword_priority or {}
+        added = 0
+
+        self._transaction()
+        try:
+            for city in cities:
+                for keyword in keywords:
+                    base = priority + city_priority.get(city, 0) + keyword_priority.get(keyword, 0)
+                    for page in range(1, pages + 1):
+                        # 页码越大优先级越低，但不会低过下一档的查询
+                        if self.add_task(city, keyword, page, base * 100 - page):
+                            added += 1
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def seed_from_config(self, config):
+        """按 load_crawl_config 读取的配置生成任务"""
+        return self.seed(
+            config["cities"], config["keywords"], int(config.get("pages", 3)),
+            priority=int(config.get("priority", 0)),
+            city_priority=config.get("city_priority"),
+            keyword_priority=config.get("keyword_priority")
+        )
+
+    def claim(self, worker_id):
+        """
+        领取一个可执行的任务
+
+        可执行的任务为到期的pending任务，或租约已过期的leased任务（领取它的进程可能已经退出）。
+
+        Returns:
+            任务dict，没有可执行任务时返回None
+        """
+        now = time.time()
+        self._transaction()
+        try:
+            while True:
+                row = self.conn.execute(
+                    "SELECT * FROM tasks WHERE (state = 'pending' AND next_run_at <= ?) "
+                    "OR (state = 'leased' AND lease_expires_at <= ?) "
+                    "ORDER BY priority DESC, next_run_at, id LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+
+                # 租约过期的任务也计入尝试次数，避免反复导致进程崩溃的任务无限重试
+                if row["attempts"] >= row["max_attempts"]:
+                    self.conn.execute(
+                        "UPDATE tasks SET state = 'failed', lease_owner = NULL, lease_expires_at = NULL, "
+                        "last_error = COALESCE(last_error, '租约过期'), updated_at = ? WHERE id = ?",
+                        (now, row["id"])
+                    )
+                    continue
+
+                self.conn.execute(
+                    "UPDATE tasks SET state = 'leased', lease_owner = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, row["id"])
+                )
+                self.conn.execute("COMMIT")
+                task = dict(row)
+                task["attempts"] += 1
+                task["lease_owner"] = worker_id
+                return task
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def complete(self, task, worker_id, jobs):
+        """
+        完成任务并保存结果
+
+        本页没有职位时，同一查询后面的页码标记为skipped。
+
+        Returns:
+            是否成功；租约已被其他进程接管时返回False，结果不保存
+        """
+        now = time.time()
+        self._transaction()
+        try:
+            cursor = self.conn.execute(
+                "UPDATE tasks SET state = 'done', result_count = ?, lease_owner = NULL, "
+                "lease_expires_at = NULL, last_error = NULL, updated_at = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (len(jobs), now, task["id"], worker_id)
+            )
+            if cursor.rowcount == 0:
+                self.conn.execute("ROLLBACK")
+                return False
+
+            self.conn.execute(
+                "INSERT INTO results (task_id, worker, jobs, created_at) VALUES (?, ?, ?, ?)",
+                (task["id"], worker_id, json.dumps(jobs, ensure_ascii=False), now)
+            )
+            if not jobs:
+                self.conn.execute(
+                    "UPDATE tasks SET state = 'skipped', updated_at = ? "
+                    "WHERE city_code = ? AND keyword = ? AND filters = ? AND page > ? AND state = 'pending'",
+                    (now, task["city_code"], task["keyword"], task["filters"], task["page"])
+                )
+            self.conn.execute("COMMIT")
+            return True
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def retry_delay(self, attempts):
+        """第attempts次失败后的重试等待秒数：指数退避，加随机抖动避免多个进程同时重试"""
+        delay = min(self.backoff_base * (2 ** max(attempts - 1, 0)), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    def fail(self, task, worker_id, error, retryable=True):
+        """
+        记录任务失败
+
+        可重试且尝试次数未用完时按退避时间重新排队，否则标记为failed。
+
+        Returns:
+            任务的新状态；租约已被其他进程接管时返回None
+        """
+        now = time.time()
+        if retryable and task["attempts"] < task["max_attempts"]:
+            state, next_run_at = "pending", now + self.retry_delay(task["attempts"])
+        else:
+            state, next_run_at = "failed", task["next_run_at"]
+
+        cursor = self.conn.execute(
+            "UPDATE tasks SET state = ?, next_run_at = ?, last_error = ?, lease_owner = NULL, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+            (state, next_run_at, str(error)[:1000], now, task["id"], worker_id)
+        )
+        return state if cursor.rowcount else None
+
+    def release(self, task, worker_id):
+        """归还未执行完的任务（如工作进程被中断），不计入尝试次数"""
+        self.conn.execute(
+            "UPDATE tasks SET state = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+            (time.time(), task["id"], worker_id)
+        )
+
+    def reset(self, states=("failed",)):
+        """将指定状态的任务重置为pending并清零尝试次数，返回重置的任务数"""
+        placeholders = ", ".join("?" for _ in states)
+        cursor = self.conn.execute(
+            f"UPDATE tasks SET state = 'pending', attempts = 0, next_run_at = ?, lease_owner = NULL, "
+            f"lease_expires_at = NULL, updated_at = ? WHERE state IN ({placeholders})",
+            (time.time(), time.time(), *states)
+        )
+        return cursor.rowcount
+
+    def requeue_query(self, city, keyword, pages, priority=0):
+        """
+        重新排队一个查询的各页，用于定期重爬
+
+        查询的第1~pages页以及之前拆分出的全部子查询中，已完成、失败或跳过的页重置为pending，
+        待执行和执行中的页不受影响。
+
+        Returns:
+            重新排队（含新增）的页数
+        """
+        city_name, city_code = resolve_city(city)
+        now = time.time()
+        queued = 0
+        self._transaction()
+        try:
+            for page in range(1, pages + 1):
+                if self.add_task(city_name, keyword, page, priority * 100 - page):
+                    queued += 1
+            cursor = self.conn.execute(
+                "UPDATE tasks SET state = 'pending', attempts = 0, next_run_at = ?, priority = ? * 100 - page, "
+                "last_error = NULL, updated_at = ? WHERE city_code = ? AND keyword = ? "
+                "AND state IN ('done', 'failed', 'skipped') AND (filters != '' OR page <= ?)",
+                (now, priority, now, city_code, keyword, pages)
+            )
+            queued += cursor.rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return queued
+
+    def finished_queries(self):
+        """
+        所有页都已结束（没有pending和leased）的查询
+
+        Returns:
+            [{city, city_code, keyword, pages, finished_at}, ...]
+        """
+        return [dict(row) for row in self.conn.execute(
+            "SELECT city, city_code, keyword, MAX(page) AS pages, MAX(updated_at) AS finished_at FROM tasks "
+            "GROUP BY city_code, keyword HAVING SUM(state IN ('pending', 'leased')) = 0"
+        )]
+
+    def subqueries(self):
+        """
+        按（城市, 关键词, 筛选条件）汇总的任务情况
+
+        Returns:
+            [{city, city_code, keyword, filters, pages, active, last_page, last_page_state,
+              last_page_count, max_page_count, priority}, ...]
+        """
+        rows = self.conn.execute(
+            "SELECT t.city, t.city_code, t.keyword, t.filters, COUNT(*) AS pages, "
+            "SUM(t.state IN ('pending', 'leased')) AS active, MAX(t.page) AS last_page, "
+            "MAX(COALESCE(t.result_count, 0)) AS max_page_count, MAX(t.priority) AS priority, "
+            "(SELECT l.state FROM tasks l WHERE l.city_code = t.city_code AND l.keyword = t.keyword "
+            " AND l.filters = t.filters ORDER BY l.page DESC LIMIT 1) AS last_page_state, "
+            "(SELECT COALESCE(l.result_count, 0) FROM tasks l WHERE l.city_code = t.city_code "
+            " AND l.keyword = t.keyword AND l.filters = t.filters ORDER BY l.page DESC LIMIT 1) AS last_page_count "
+            "FROM tasks t GROUP BY t.city_code, t.keyword, t.filters ORDER BY t.city_code, t.keyword, t.filters"
+        )
+        return [dict(row) for row in rows]
+
+    def query_results(self, city_code, keyword, since=0):
+        """一个查询（含拆分出的子查询）在since之后保存的全部职位"""
+        jobs = []
+        for row in self.conn.execute(
+            "SELECT r.jobs FROM results r JOIN tasks t ON r.task_id = t.id "
+            "WHERE t.city_code = ? AND t.keyword = ? AND r.created_at > ? ORDER BY t.filters, t.page, r.id",
+            (city_code, keyword, since)
+        ):
+            jobs.extend(json.loads(row["jobs"]))
+        return jobs
+
+    def counts(self):
+        """各状态的任务数"""
+        counts = {state: 0 for state in TASK_STATES}
+        for row in self.conn.execute("SELECT state, COUNT(*) AS n FROM tasks GROUP BY state"):
+            counts[row["state"]] = row["n"]
+        return counts
+
+    def is_drained(self):
+        """没有待执行或执行中的任务"""
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def next_run_at(self):
+        """最早可执行的pending任务或租约到期时间，没有时返回None"""
+        row = self.conn.execute(
+            "SELECT MIN(CASE WHEN state = 'pending' THEN next_run_at ELSE lease_expires_at END) AS t "
+            "FROM tasks WHERE state IN ('pending', 'leased')"
+        ).fetchone()
+        return row["t"]
+
+    def status(self):
+        """任务统计：各状态数量、结果数、按查询汇总"""
+        queries = []
+        for row in self.conn.execute(
+            "SELECT city, keyword, COUNT(*) AS pages, "
+            "SUM(state = 'done') AS done, SUM(state = 'failed') AS failed, "
+            "SUM(state = 'skipped') AS skipped, COALESCE(SUM(result_count), 0) AS jobs "
+            "FROM tasks GROUP BY city_code, keyword ORDER BY MAX(priority) DESC, city, keyword"
+        ):
+            queries.append(dict(row))
+
+        results = self.conn.execute(
+            "SELECT COUNT(*) AS n, COALESCE(SUM(exported = 0), 0) AS unexported FROM results"
+        ).fetchone()
+        return {
+            "tasks": self.counts(),
+            "results": results["n"],
+            "unexported_results": results["unexported"],
+            "next_run_at": format_timestamp(self.next_run_at()),
+            "queries": queries
+        }
+
+    def failed_tasks(self, limit=20):
+        """最近失败的任务及错误信息"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT id, city, keyword, page, attempts, last_error FROM tasks "
+            "WHERE state = 'failed' ORDER BY updated_at DESC LIMIT ?", (limit,)
+        )]
+
+    def export_results(self, data_manager, dedupe=True):
+        """
+        将未导出的结果写入数据管理器（data/all_jobs.json）
+
+        数据文件不支持多进程同时写入，因此工作进程只把结果写入数据库，由此方法统一导出。
+        拆分出的子查询之间、子查询与原查询之间会有重复职位，dedupe时同一职位只保留最后一次结果。
+
+        Returns:
+            导出的职位数
+        """
+        self._transaction()
+        try:
+            rows = self.conn.execute("SELECT id, jobs FROM results WHERE exported = 0 ORDER BY id").fetchall()
+            jobs = []
+            for row in rows:
+                jobs.extend(json.loads(row["jobs"]))
+            if dedupe:
+                from query_partitioner import dedupe_jobs
+                jobs = dedupe_jobs(jobs)
+            if jobs:
+                data_manager.save_jobs(jobs)
+            self.conn.executemany("UPDATE results SET exported = 1 WHERE id = ?", [(row["id"],) for row in rows])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return len(jobs)
+
+
+class RequestsPageFetcher:
+    """使用 ZhipinScraper（requests + 静态页面解析）执行任务"""
+
+    def __init__(self, base_url=None, parser=None, rate_limiter=None, metrics=None):
+        from zhipin_scraper import ZhipinScraper
+        kwargs = {"rate_limiter": rate_limiter, "metrics": metrics}
+        if base_url:
+            kwargs["base_url"] = base_url
+        if parser:
+            kwargs["parser"] = parser
+        self.scraper = ZhipinScraper(**kwargs)
+
+    def fetch(self, task):
+        item_count, jobs = self.scraper.scrape_page(
+            task["keyword"], task["city_code"], task["page"], filters=decode_filters(task.get("filters"))
+        )
+        return jobs
+
+    def close(self):
+        pass
+
+
+class SeleniumPageFetcher:
+    """使用 ZhipinSeleniumScraper 执行任务，一个工作进程复用一个浏览器"""
+
+    def __init__(self, base_url=None, **scraper_kwargs):
+        from zhipin_selenium_scraper import ZhipinSeleniumScraper
+        if base_url:
+            scraper_kwargs["base_url"] = base_url
+        # 直接打开搜索结果页，不经过首页的交互式条件设置
+        scraper_kwargs.setdefault("fast_start", True)
+        # 工作进程无人值守，不在控制台等待输入
+        scraper_kwargs.setdefault("interactive", False)
+        self.scraper = ZhipinSeleniumScraper(pages=1, **scraper_kwargs)
+
+    def fetch(self, task):
+        self.scraper.city = task["city"]
+        self.scraper.keyword = task["keyword"]
+        self.scraper.search_filters = decode_filters(task.get("filters"))
+        # 按任务的城市、关键词和筛选条件重新构建搜索URL
+        self.scraper.current_search_url = None
+        jobs = self.scraper.run_with_driver_recovery(self.scraper.scrape_listing_page, task["page"])
+        if jobs is None:
+            # 没有职位卡片：只有页面提示没有搜索结果时才是空页（之后的页码会被跳过），
+            # 登录/验证页或未加载完成的页面按可重试的错误退避重试
+            if self.scraper.page_has_no_jobs():
+                return []
+            raise PageNotReadyError(f"第{task['page']}页没有找到职位列表，可能被重定向到登录或验证页面")
+        return jobs
+
+    def close(self):
+        self.scraper.close()
+
+
+def run_worker(frontier, fetcher, worker_id=None, max_tasks=None, wait=True, poll_interval=5, delay=(2, 5),
+               breaker=None):
+    """
+    循环领取并执行任务
+
+    Args:
+        frontier: CrawlFrontier
+        fetcher: 提供 fetch(task) -> 职位列表 的对象
+        worker_id: 工作进程标识
+        max_tasks: 最多执行的任务数，None表示不限
+        wait: 暂无可执行任务但仍有退避中的任务时是否等待，否则直接退出
+        poll_interval: 等待时的轮询间隔（秒）
+        delay: 两个任务之间的随机休眠区间（秒）
+        breaker: retry_policy.CircuitBreaker，连续失败过多时暂停领取任务；冷却结束后共用该熔断器的
+            工作线程中只有一个执行试探任务，其他线程归还领取的任务，等待试探结果
+
+    Returns:
+        本进程的执行统计dict
+    """
+    worker_id = worker_id or default_worker_id()
+    stats = {"worker": worker_id, "completed": 0, "failed": 0, "lost_leases": 0, "jobs": 0}
+    paused = False
+
+    while max_tasks is None or stats["completed"] + stats["failed"] < max_tasks:
+        # 连续失败过多（如IP被限制）时暂停；其他线程的试探任务进行中时同样等待，按轮询间隔检查
+        pause = breaker.retry_after() if breaker is not None else 0
+        if pause > 0:
+            if not paused:
+                print(f"{worker_id} 连续失败过多，暂停 {pause:.0f} 秒")
+                paused = True
+            time.sleep(min(pause, poll_interval))
+            continue
+        paused = False
+
+        task = frontier.claim(worker_id)
+        if task is None:
+            if not wait or frontier.is_drained():
+                break
+            next_run_at = frontier.next_run_at() or time.time()
+            time.sleep(min(max(next_run_at - time.time(), 0.1), poll_interval))
+            continue
+
+        # 冷却结束后只放行一个试探任务，没有被放行的线程归还任务（不计入尝试次数）
+        if breaker is not None and not breaker.allow():
+            frontier.release(task, worker_id)
+            continue
+
+        filters = f"[{task['filters']}]" if task.get("filters") else ""
+        label = f"[{task['city']}][{task['keyword']}]{filters} 第{task['page']}页（第{task['attempts']}次尝试）"
+        print(f"{worker_id} 开始: {label}")
+        try:
+            jobs = fetcher.fetch(task)
+        except KeyboardInterrupt:
+            frontier.release(task, worker_id)
+            raise
+        except Exception as e:
+            # 不可重试的错误（如403/404、解析代码错误）直接标记为failed，不再退避重试
+            state = frontier.fail(task, worker_id, e, retryable=is_retryable(e))
+            stats["failed"] += 1
+            if breaker is not None:
+                breaker.record_failure()
+            print(f"{worker_id} 失败: {label}: {str(e)}，任务状态: {state}")
+            continue
+
+        for job in jobs:
+            job.setdefault("city", task["city"])
+            job.setdefault("keyword", task["keyword"])
+
+        if breaker is not None:
+            breaker.record_success()
+        if frontier.complete(task, worker_id, jobs):
+            stats["completed"] += 1
+            stats["jobs"] += len(jobs)
+            print(f"{worker_id} 完成: {label}，{len(jobs)} 条职位")
+        else:
+            stats["lost_leases"] += 1
+            print(f"{worker_id} 租约已过期，结果丢弃: {label}")
+
+        # 随机延迟，避免被封IP
+        if delay:
+            time.sleep(random.uniform(*delay))
+
+    return stats
+
+
+def print_status(status):
+    """打印任务队列状态"""
+    tasks = status["tasks"]
+    print("\n===== 爬取任务队列 =====")
+    print("任务: " + "，".join(f"{state} {tasks[state]}" for state in TASK_STATES))
+    print(f"结果: {status['results']} 页（未导出 {status['unexported_results']}）")
+    print(f"下一个可执行时间: {status['next_run_at']}")
+    if status["queries"]:
+        print("\n城市 / 关键词 / 完成页数 / 失败 / 跳过 / 职位数")
+        for query in status["queries"]:
+            print(f"  {query['city']} / {query['keyword']} / {query['done']}/{query['pages']} / "
+                  f"{query['failed']} / {query['skipped']} / {query['jobs']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='BOSS直聘爬取任务队列')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH, help=f'任务数据库路径，默认为{DEFAULT_DB_PATH}')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed', help='生成任务')
+    seed_parser.add_argument('--config', type=str, default=None, help='爬取配置JSON文件')
+    seed_parser.add_argument('--cities', type=str, default=None, help='逗号分隔的城市，代替配置文件')
+    seed_parser.add_argument('--keywords', type=str, default=None, help='逗号分隔的关键词，代替配置文件')
+    seed_parser.add_argument('--pages', type=int, default=3, help='每个查询的页数，默认为3')
+    seed_parser.add_argument('--priority', type=int, default=0, help='任务优先级，数值越大越先执行')
+
+    work_parser = subparsers.add_parser('work', help='启动工作进程')
+    work_parser.add_argument('--backend', choices=['requests', 'selenium'], default='requests', help='爬取方式，默认为requests')
+    work_parser.add_argument('--worker-id', type=str, default=None, help='工作进程标识，默认为 主机名-进程号')
+    work_parser.add_argument('--max-tasks', type=int, default=None, help='最多执行的任务数')
+    work_parser.add_argument('--no-wait', action='store_true', help='没有立即可执行的任务时退出，不等待退避中的任务')
+    work_parser.add_argument('--lease-seconds', type=int, default=300, help='任务租约时长（秒），默认为300')
+    work_parser.add_argument('--min-delay', type=float, default=2, help='任务间最小休眠秒数')
+    work_parser.add_argument('--max-delay', type=float, default=5, help='任务间最大休眠秒数')
+    work_parser.add_argument('--rate', type=float, default=None, help='每秒最多请求数（requests方式），默认不限')
+    work_parser.add_argument('--pause-after', type=int, default=5, help='连续失败多少个任务后暂停，0表示不暂停，默认为5')
+    work_parser.add_argument('--pause-seconds', type=float, default=300, help='暂停秒数，默认为300')
+    work_parser.add_argument('--base-url', type=str, default=None, help='网站地址，压测时可指向本地模拟服务')
+
+    subparsers.add_parser('status', help='查看任务进度')
+
+    reset_parser = subparsers.add_parser('reset', help='将任务重置为pending')
+    reset_parser.add_argument('--states', type=str, default='failed', help='逗号分隔的状态，默认为failed')
+
+    subparsers.add_parser('export', help='将结果导入数据管理器（data/all_jobs.json）')
+
+    args = parser.parse_args(argv)
+    frontier = CrawlFrontier(args.db, lease_seconds=getattr(args, 'lease_seconds', 300))
+
+    try:
+        if args.command == 'seed':
+            if args.cities and args.keywords:
+                config = {
+                    "cities": [c.strip() for c in args.cities.split(',') if c.strip()],
+                    "keywords": [k.strip() for k in args.keywords.split(',') if k.strip()],
+                    "pages": args.pages,
+                    "priority": args.priority
+                }
+            elif args.config:
+                config = load_crawl_config(args.config)
+            else:
+                print("请提供 --config 或 --cities 与 --keywords")
+                return 1
+            added = frontier.seed_from_config(config)
+            print(f"新增 {added} 个任务")
+            print_status(frontier.status())
+
+        elif args.command == 'work':
+            if args.backend == 'selenium':
+                fetcher = SeleniumPageFetcher(base_url=args.base_url, debug=False)
+            else:
+                from rate_limiter import RateLimiter
+                fetcher = RequestsPageFetcher(base_url=args.base_url, rate_limiter=RateLimiter(args.rate))
+            try:
+                breaker = CircuitBreaker(failure_threshold=None, global_threshold=args.pause_after,
+                                         cooldown=args.pause_seconds) if args.pause_after else None
+                stats = run_worker(
+                    frontier, fetcher, worker_id=args.worker_id, max_tasks=args.max_tasks,
+                    wait=not args.no_wait, delay=(args.min_delay, args.max_delay), breaker=breaker
+                )
+            except KeyboardInterrupt:
+                print("工作进程被中断，当前任务已归还")
+                return 130
+            finally:
+                fetcher.close()
+            print(f"\n工作进程结束: 完成 {stats['completed']}，失败 {stats['failed']}，"
+                  f"租约丢失 {stats['lost_leases']}，职位 {stats['jobs']} 条")
+
+        elif args.command == 'status':
+            print_status(frontier.status())
+            for task in frontier.failed_tasks():
+                print(f"  失败: [{task['city']}][{task['keyword']}] 第{task['page']}页 "
+                      f"（{task['attempts']}次）: {task['last_error']}")
+
+        elif args.command == 'reset':
+            states = [s.strip() for s in args.states.split(',') if s.strip()]
+            print(f"已重置 {frontier.reset(states)} 个任务")
+
+        elif args.command == 'export':
+            from data_manager import DataManager
+            count = frontier.export_results(DataManager())
+            print(f"已导出 {count} 条职位")
+    finally:
+        frontier.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+"""
+无人值守批量爬取
+
+按一个任务配置文件（JSON、TOML，安装PyYAML后也支持YAML）爬取 城市 × 关键词 × 页码，
+不需要任何控制台输入，适合计划任务（cron）和容器中运行：
+
+    python crawl_job.py crawl_job.example.toml
+    python crawl_job.py crawl_job.example.toml --engine selenium --concurrency 1 --summary run_summary.json
+    # 两个爬虫的入口也支持同样的参数
+    python zhipin_scraper.py --config crawl_job.example.toml
+    python zhipin_selenium_scraper.py --batch --city 北京 --keyword Python --pages 3
+
+任务写入一个本次运行专用的任务队列（crawl_frontier），由若干工作线程并发执行（失败退避重试、
+连续失败暂停），结束后统一导入数据管理器，并可另存为本次结果文件。
+
+退出码：
+    0   全部任务完成
+    1   部分任务失败（其余结果已保存）
+    2   没有任何任务成功
+    3   配置错误
+    130 被中断
+"""
+import os
+import sys
+import csv
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+
+from city_codes import resolve_city
+from crawl_frontier import (
+    CrawlFrontier, RequestsPageFetcher, SeleniumPageFetcher, run_worker
+)
+from crawl_metrics import CrawlMetrics, print_report
+from rate_limiter import RateLimiter
+from retry_policy import CircuitBreaker
+
+# TOML：Python 3.11+ 自带tomllib，更早的版本需要安装tomli
+try:
+    import tomllib
+    USE_TOML = True
+except ImportError:
+    try:
+        import tomli as tomllib
+        USE_TOML = True
+    except ImportError:
+        USE_TOML = False
+
+# YAML可选：未安装PyYAML时只支持JSON和TOML
+try:
+    import yaml
+    USE_YAML = True
+except ImportError:
+    USE_YAML = False
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_FAILED = 2
+EXIT_CONFIG_ERROR = 3
+EXIT_INTERRUPTED = 130
+
+ENGINES = ["requests", "selenium"]
+OUTPUT_FORMATS = ["json", "csv"]
+
+# 配置项默认值
+DEFAULT_JOB = {
+    "cities": ["北京"],
+    "keywords": ["数据分析"],
+    "pages": 3,
+    "engine": "requests",
+    "concurrency": 1,
+    "rate": None,
+    "delay": [2, 5],
+    "base_url": None,
+    "max_attempts": 3,
+    "retry_delay": 30,
+    "pause_after": 5,
+    "pause_seconds": 300,
+    "frontier_db": None,
+    "metrics_file": None,
+    "metrics_report": None,
+    "output": {
+        "data_dir": "data",
+        "file": None,
+        "format": "json",
+        "store": True
+    },
+    "selenium": {
+        "fast_start": True,
+        "profile_dir": None,
+        "driver_path": None,
+        "offline": False,
+        "debugger_address": None,
+        "max_pages_per_driver": None,
+        "capture_api": False
+    }
+}
+
+
+def load_job_file(path):
+    """按扩展名读取任务配置文件（.json / .toml / .yaml / .yml）"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        if not USE_TOML:
+            raise ValueError("读取TOML配置需要Python 3.11+或安装tomli: pip install tomli")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if ext in (".yaml", ".yml"):
+        if not USE_YAML:
+            raise ValueError("读取YAML配置需要安装PyYAML: pip install pyyaml")
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"任务配置文件 {path} 的顶层应为键值对")
+    return data
+
+
+def _as_list(value, name):
+    if isinstance(value, str):
+        value = [item.strip() for item in value.split(",")]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"{name} 应为列表或逗号分隔的字符串")
+    items = [str(item).strip() for item in value if str(item).strip()]
+    if not items:
+        raise ValueError(f"{name} 不能为空")
+    return items
+
+
+def _is_number(value):
+    """int或float（不包括bool）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def normalize_job(raw):
+    """
+    合并默认值并检查任务配置
+
+    Args:
+        raw: 从配置文件或命令行得到的dict，未给出的项使用 DEFAULT_JOB
+
+    Returns:
+        完整的任务配置dict；配置有误时抛出 ValueError
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("任务配置应为键值对（JSON对象/TOML表/YAML映射）")
+    # retries（失败后的重试次数）是 max_attempts 的另一种写法
+    if "retries" in raw:
+        raw = dict(raw)
+        retries = raw.pop("retries")
+        if "max_attempts" in raw:
+            raise ValueError("retries 和 max_attempts 只能指定一个")
+        if not isinstance(retries, int) or isinstance(retries, bool) or retries < 0:
+            raise ValueError("retries 应为非负整数")
+        raw["max_attempts"] = retries + 1
+    unknown = set(raw) - set(DEFAULT_JOB)
+    if unknown:
+        raise ValueError(f"未知的配置项: {', '.join(sorted(unknown))}")
+
+    job = {key: value for key, value in DEFAULT_JOB.items() if not isinstance(value, dict)}
+    job.update({key: value for key, value in raw.items() if key not in ("output", "selenium")})
+    for section in ("output", "selenium"):
+        values = raw.get(section) or {}
+        if not isinstance(values, dict):
+            raise ValueError(f"{section} 应为键值对")
+        unknown = set(values) - set(DEFAULT_JOB[section])
+        if unknown:
+            raise ValueError(f"未知的配置项: {', '.join(f'{section}.{key}' for key in sorted(unknown))}")
+        job[section] = dict(DEFAULT_JOB[section], **values)
+    # 未指定格式时按结果文件扩展名判断
+    output_file = job["output"]["file"]
+    if output_file and "format" not in (raw.get("output") or {}):
+        job["output"]["format"] = "csv" if output_file.lower().endswith(".csv") else "json"
+
+    # 城市统一为名称，未知城市在开始爬取前报错
+    job["cities"] = [resolve_city(city)[0] for city in _as_list(job["cities"], "cities")]
+    job["keywords"] = _as_list(job["keywords"], "keywords")
+
+    for key in ("pages", "concurrency", "max_attempts"):
+        if not isinstance(job[key], int) or isinstance(job[key], bool) or job[key] < 1:
+            raise ValueError(f"{key} 应为正整数")
+    if job["pause_after"] is not None and (not isinstance(job["pause_after"], int)
+                                           or isinstance(job["pause_after"], bool) or job["pause_after"] < 0):
+        raise ValueError("pause_after 应为非负整数")
+    for key in ("retry_delay", "pause_seconds"):
+        if not _is_number(job[key]) or job[key] < 0:
+            raise ValueError(f"{key} 应为非负数")
+    if job["engine"] not in ENGINES:
+        raise ValueError(f"engine 可选: {', '.join(ENGINES)}")
+    if job["output"]["format"] not in OUTPUT_FORMATS:
+        raise ValueError(f"output.format 可选: {', '.join(OUTPUT_FORMATS)}")
+    if job["rate"] is not None and (not _is_number(job["rate"]) or job["rate"] <= 0):
+        raise ValueError("rate 应为大于0的数")
+    delay = job["delay"]
+    # 单个数表示固定的休眠时间
+    if _is_number(delay):
+        delay = [delay, delay]
+    if (not isinstance(delay, (list, tuple)) or len(delay) != 2 or not all(_is_number(value) for value in delay)
+            or delay[0] < 0 or delay[0] > delay[1]):
+        raise ValueError("delay 应为秒数或 [最小秒数, 最大秒数]")
+    job["delay"] = [float(value) for value in delay]
+    return job
+
+
+def make_fetcher(job, rate_limiter, metrics=None):
+    """按引擎创建一个工作线程使用的抓取器"""
+    if job["engine"] == "selenium":
+        options = {key: value for key, value in job["selenium"].items() if value is not None}
+        return SeleniumPageFetcher(base_url=job["base_url"], debug=False, interactive=False,
+                                   metrics=metrics, **options)
+    return RequestsPageFetcher(base_url=job["base_url"], rate_limiter=rate_limiter, metrics=metrics)
+
+
+def write_output(jobs, path, fmt):
+    """将本次运行的职位保存为JSON或CSV"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    if fmt == "csv":
+        fieldnames = []
+        for job in jobs:
+            fieldnames.extend(key for key in job if key not in fieldnames)
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for job in jobs:
+                writer.writerow({key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                                 for key, value in job.items()})
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=2)
+
+
+def exit_code_for(tasks):
+    """按任务状态统计决定退出码"""
+    if tasks["failed"] == 0 and tasks["pending"] == 0 and tasks["leased"] == 0:
+        return EXIT_OK
+    return EXIT_PARTIAL if tasks["done"] else EXIT_FAILED
+
+
+def run_job(job):
+    """
+    执行一次批量爬取
+
+    Args:
+        job: normalize_job 返回的任务配置
+
+    Returns:
+        运行摘要dict，exit_code 为建议的进程退出码
+    """
+    started_at = datetime.now()
+    # 与 results.created_at 相同的时间基准（time.time()），只收集本次运行保存的结果
+    run_started = time.time()
+    start = time.perf_counter()
+    output = job["output"]
+    if not os.path.exists(output["data_dir"]):
+        os.makedirs(output["data_dir"])
+
+    # 未指定任务数据库时使用本次运行专用的临时库，结束后删除
+    db_path = job["frontier_db"]
+    temporary_db = db_path is None
+    if temporary_db:
+        fd, db_path = tempfile.mkstemp(prefix="crawl_job_", suffix=".db", dir=output["data_dir"])
+        os.close(fd)
+
+    def open_frontier():
+        return CrawlFrontier(db_path, max_attempts=job["max_attempts"], backoff_base=job["retry_delay"])
+
+    frontier = open_frontier()
+    added = frontier.seed(job["cities"], job["keywords"], job["pages"])
+
+    rate_limiter = RateLimiter(job["rate"])
+    # 所有工作线程共用一份耗时统计
+    metrics = CrawlMetrics()
+    breaker = CircuitBreaker(failure_threshold=None, global_threshold=job["pause_after"],
+                             cooldown=job["pause_seconds"]) if job["pause_after"] else None
+    worker_prefix = f"{socket.gethostname()}-{os.getpid()}"
+    worker_stats = []
+    worker_errors = []
+
+    def work(index):
+        worker_id = f"{worker_prefix}-{index}"
+        local_frontier = open_frontier()
+        fetcher = None
+        try:
+            fetcher = make_fetcher(job, rate_limiter, metrics)
+            worker_stats.append(run_worker(local_frontier, fetcher, worker_id=worker_id,
+                                           delay=tuple(job["delay"]), breaker=breaker))
+        except Exception as e:
+            worker_errors.append(f"{worker_id}: {str(e)}")
+            print(f"{worker_id} 异常退出: {str(e)}")
+        finally:
+            if fetcher is not None:
+                fetcher.close()
+            local_frontier.close()
+
+    threads = [threading.Thread(target=work, args=(i + 1,), daemon=True) for i in range(job["concurrency"])]
+    interrupted = False
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n批量爬取被中断，已完成的结果仍会保存")
+
+    status = frontier.status()
+    jobs = []
+    for query in status["queries"]:
+        # 使用持久的任务数据库（--frontier-db）时，以前运行的结果不计入本次输出
+        jobs.extend(frontier.query_results(resolve_city(query["city"])[1], query["keyword"], since=run_started))
+    from query_partitioner import dedupe_jobs
+    jobs = dedupe_jobs(jobs)
+
+    stored = 0
+    if output["store"] and jobs:
+        from data_manager import DataManager
+        stored = frontier.export_results(DataManager(output["data_dir"]))
+    if output["file"] and jobs:
+        write_output(jobs, output["file"], output["format"])
+
+    failed_tasks = frontier.failed_tasks()
+    frontier.close()
+    if temporary_db and not interrupted:
+        for path in (db_path, db_path + "-wal", db_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    metrics_files = metrics.export(job["metrics_file"], job["metrics_report"])
+
+    exit_code = EXIT_INTERRUPTED if interrupted else exit_code_for(status["tasks"])
+    return {
+        "started_at": started_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "elapsed_seconds": round(time.perf_counter() - start, 1),
+        "engine": job["engine"],
+        "concurrency": job["concurrency"],
+        "tasks_seeded": added,
+        "tasks": status["tasks"],
+        "queries": status["queries"],
+        "jobs": len(jobs),
+        "stored": stored,
+        "output_file": output["file"] if jobs else None,
+        "frontier_db": None if temporary_db and not interrupted else db_path,
+        "failed_tasks": failed_tasks,
+        "worker_errors": worker_errors,
+        "timings": metrics.report()["histograms"],
+        "metrics_files": metrics_files,
+        "interrupted": interrupted,
+        "exit_code": exit_code
+    }
+
+
+def print_summary(summary):
+    """打印运行摘要"""
+    tasks = summary["tasks"]
+    print("\n===== 批量爬取摘要 =====")
+    print(f"开始时间: {summary['started_at']}，耗时 {summary['elapsed_seconds']} 秒，"
+          f"引擎 {summary['engine']} × {summary['concurrency']}")
+    print(f"任务: 完成 {tasks['done']}，跳过 {tasks['skipped']}，失败 {tasks['failed']}，"
+          f"未完成 {tasks['pending'] + tasks['leased']}")
+    for query in summary["queries"]:
+        print(f"  {query['city']} / {query['keyword']}: {query['done']}/{query['pages']} 页，"
+              f"失败 {query['failed']}，{query['jobs']} 条职位")
+    for task in summary["failed_tasks"]:
+        print(f"  失败: [{task['city']}][{task['keyword']}] 第{task['page']}页: {task['last_error']}")
+    for error in summary["worker_errors"]:
+        print(f"  工作线程错误: {error}")
+    print(f"职位: {summary['jobs']} 条（去重后），写入数据文件 {summary['stored']} 条")
+    if summary["output_file"]:
+        print(f"本次结果: {summary['output_file']}")
+    if summary["timings"]:
+        print("耗时:")
+        print_report({"histograms": summary["timings"]}, names=("page_seconds", "stage_seconds"))
+    for path in summary["metrics_files"]:
+        print(f"耗时统计: {path}")
+    if summary["frontier_db"]:
+        print(f"任务队列: {summary['frontier_db']}（可用 crawl_frontier.py --db 继续）")
+    print(f"退出码: {summary['exit_code']}")
+
+
+def add_job_arguments(parser):
+    """添加批量爬取的命令行参数（命令行的值覆盖配置文件）"""
+    parser.add_argument('--cities', type=str, default=None, help='逗号分隔的城市')
+    parser.add_argument('--keywords', type=str, default=None, help='逗号分隔的关键词')
+    parser.add_argument('--pages', type=int, default=None, help='每个查询的页数')
+    parser.add_argument('--engine', choices=ENGINES, default=None, help='爬取方式')
+    parser.add_argument('--concurrency', type=int, default=None, help='并发工作线程数（selenium为浏览器数）')
+    parser.add_argument('--rate', type=float, default=None, help='所有线程合计每秒最多请求数（requests）')
+    parser.add_argument('--data-dir', type=str, default=None, help='数据目录，默认为data')
+    parser.add_argument('--output', type=str, default=None, help='本次结果另存的文件（.json或.csv）')
+    parser.add_argument('--no-store', action='store_true', help='不写入数据管理器（data/all_jobs.json）')
+    parser.add_argument('--base-url', type=str, default=None, help='网站地址，压测时可指向本地模拟服务')
+    parser.add_argument('--frontier-db', type=str, default=None, help='任务数据库，指定后可中断续爬，默认使用临时库')
+    parser.add_argument('--summary', type=str, default=None, help='运行摘要输出JSON文件')
+    parser.add_argument('--metrics-file', type=str, default=None, help='各阶段耗时统计输出为Prometheus文本文件（textfile采集）')
+    parser.add_argument('--metrics-report', type=str, default=None, help='各阶段耗时统计输出为JSON报告（含p50/p99）')
+
+
+def job_from_args(args, raw=None):
+    """合并配置文件内容和命令行参数"""
+    raw = dict(raw or {})
+    for key in ("cities", "keywords", "pages", "engine", "concurrency", "rate", "base_url", "frontier_db",
+                "metrics_file", "metrics_report"):
+        value = getattr(args, key, None)
+        if value is not None:
+            raw[key] = value
+    output = dict(raw.get("output") or {})
+    if getattr(args, "data_dir", None):
+        output["data_dir"] = args.data_dir
+    if getattr(args, "output", None):
+        output["file"] = args.output
+        output.pop("format", None)
+    if getattr(args, "no_store", False):
+        output["store"] = False
+    if output:
+        raw["output"] = output
+    return normalize_job(raw)
+
+
+def run_from_args(args, config_path=None, defaults=None, overrides=None):
+    """
+    读取配置、执行并输出摘要，供各入口的 main 使用
+
+    Args:
+        args: 含 add_job_arguments 参数的命名空间
+        config_path: 任务配置文件，None表示只用命令行参数
+        defaults: 配置文件和命令行都没有给出时使用的值，如 {"engine": "selenium"}
+        overrides: 覆盖配置文件的值，output、selenium 两节按项合并
+
+    Returns:
+        退出码
+    """
+    try:
+        raw = dict(defaults or {})
+        if config_path:
+            raw.update(load_job_file(config_path))
+        for key, value in (overrides or {}).items():
+            raw[key] = dict(raw.get(key) or {}, **value) if isinstance(value, dict) else value
+        job = job_from_args(args, raw)
+    except (OSError, TypeError, ValueError) as e:
+        # TypeError：normalize_job 未覆盖的类型错误同样按配置错误处理
+        print(f"任务配置错误: {str(e)}")
+        return EXIT_CONFIG_ERROR
+
+    summary = run_job(job)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary["exit_code"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按任务配置文件无人值守地批量爬取')
+    parser.add_argument('config', nargs='?', default=None, help='任务配置文件（.json/.toml/.yaml）')
+    add_job_arguments(parser)
+    args = parser.parse_args(argv)
+    return run_from_args(args, args.config)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
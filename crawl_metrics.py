@@ -0,0 +1,233 @@
+"""
+爬取耗时统计
+
+记录爬取各阶段（页面加载、等待元素、查找卡片、提取卡片、保存调试信息、保存结果）的次数和耗时分布，
+输出为Prometheus文本格式（供node_exporter的textfile采集）和JSON运行报告：
+
+    metrics = CrawlMetrics()
+    with metrics.timer("stage_seconds", stage="page_load"):
+        driver.get(url)
+    metrics.inc("pages_total", status="ok")
+
+    metrics.write_prometheus("metrics/zhipin.prom")
+    metrics.write_report("metrics/run_report.json")
+
+报告中每个直方图给出次数、合计、平均值和p50/p90/p99，用来比较优化前后单页和单个卡片的耗时。
+"""
+import os
+import json
+import time
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+METRIC_PREFIX = "zhipin_"
+
+# 直方图桶上限（秒），覆盖单个卡片的毫秒级到整页的数十秒
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 计算分位数时保留的样本数上限，超过后按蓄水池抽样
+MAX_SAMPLES = 10000
+
+METRIC_HELP = {
+    "stage_seconds": "各爬取阶段的耗时（秒）",
+    "page_seconds": "单页从加载到提取完成的耗时（秒）",
+    "card_seconds": "单个职位卡片的提取耗时（秒）",
+    "pages_total": "抓取的页面数",
+    "cards_total": "处理的职位卡片数",
+    "jobs_total": "提取到的职位数",
+    "errors_total": "失败次数"
+}
+
+# 运行摘要中打印的直方图
+SUMMARY_HISTOGRAMS = ("page_seconds", "card_seconds", "stage_seconds")
+
+
+def percentile(sorted_values, q):
+    """已排序样本的分位数（线性插值）"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Histogram:
+    """累计分桶计数，并保留有限的样本用于计算分位数"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = []
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.bucket_counts[i] += 1
+                break
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < MAX_SAMPLES:
+                self.samples[index] = value
+
+    def summary(self):
+        values = sorted(self.samples)
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": round(percentile(values, 0.5), 6) if values else None,
+            "p90": round(percentile(values, 0.9), 6) if values else None,
+            "p99": round(percentile(values, 0.99), 6) if values else None,
+            "max": round(values[-1], 6) if values else None
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for key, value in pairs:
+        value = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class CrawlMetrics:
+    """计数器和耗时直方图（线程安全）"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+
+    def inc(self, name, value=1, **labels):
+        """计数器加value"""
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """记录一次耗时"""
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """计时上下文，退出时记录耗时（包括抛出异常的情况）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def stage(self, stage):
+        """阶段计时，记录到 stage_seconds{stage=...}"""
+        return self.timer("stage_seconds", stage=stage)
+
+    def to_prometheus(self):
+        """Prometheus文本格式"""
+        lines = []
+        with self.lock:
+            counter_names = sorted({name for name, _ in self.counters})
+            for name in counter_names:
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, label_key), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{_format_labels(label_key)} {value}")
+
+            histogram_names = sorted({name for name, _ in self.histograms})
+            for name in histogram_names:
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (histogram_name, label_key), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for upper, count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', repr(float(upper)))])} {cumulative}")
+                    lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.sum:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self):
+        """JSON运行报告：计数器和各直方图的分位数"""
+        with self.lock:
+            counters = {}
+            for (name, label_key), value in sorted(self.counters.items()):
+                counters.setdefault(name, {})[_format_labels(label_key) or "total"] = value
+            histograms = {}
+            for (name, label_key), histogram in sorted(self.histograms.items()):
+                histograms.setdefault(name, {})[_format_labels(label_key) or "total"] = histogram.summary()
+        return {
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_seconds": round(time.perf_counter() - self.start, 3),
+            "counters": counters,
+            "histograms": histograms
+        }
+
+    def _write(self, path, content):
+        """先写临时文件再替换，采集程序不会读到写了一半的文件"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def write_prometheus(self, path):
+        self._write(path, self.to_prometheus())
+
+    def write_report(self, path):
+        self._write(path, json.dumps(self.report(), ensure_ascii=False, indent=2))
+
+    def export(self, prometheus_path=None, report_path=None):
+        """按给出的路径写出Prometheus文本和JSON报告，返回写出的文件列表"""
+        written = []
+        if prometheus_path:
+            self.write_prometheus(prometheus_path)
+            written.append(prometheus_path)
+        if report_path:
+            self.write_report(report_path)
+            written.append(report_path)
+        return written
+
+    def print_summary(self, names=SUMMARY_HISTOGRAMS):
+        """打印主要直方图的分位数"""
+        print_report(self.report(), names)
+
+
+def print_report(report, names=SUMMARY_HISTOGRAMS):
+    """打印 CrawlMetrics.report() 中主要直方图的分位数"""
+    for name in names:
+        for labels, summary in report["histograms"].get(name, {}).items():
+            if not summary["count"]:
+                continue
+            print(f"  {name}{'' if labels == 'total' else labels}: 次数 {summary['count']}，"
+                  f"p50 {summary['p50']:.3f}s，p99 {summary['p99']:.3f}s，合计 {summary['sum']:.1f}s")
@@ -50,6 +50,35 @@ class DataManager:
         print(f"已将 {len(jobs)} 条新职位数据添加到数据库，总计 {len(all_jobs)} 条")
         return len(all_jobs)
     
+    def update_jobs(self, updates, key='detail_link'):
+        """
+        为已保存的职位补充或更新字段
+        
+        Args:
+            updates: {key字段的值: {字段名: 值}}，如 {详情链接: {'job_description': ...}}
+            key: 用于匹配职位的字段
+            
+        Returns:
+            更新的记录数
+        """
+        if not updates:
+            return 0
+            
+        jobs = self.load_jobs()
+        updated = 0
+        for job in jobs:
+            fields = updates.get(job.get(key))
+            if fields:
+                job.update(fields)
+                updated += 1
+        
+        if updated:
+            with open(self.jobs_file, 'w', encoding='utf-8') as f:
+                json.dump(jobs, f, ensure_ascii=False, indent=4)
+                
+        print(f"已更新 {updated} 条职位数据")
+        return updated
+    
     def load_jobs(self):
         """加载所有职位数据"""
         try:
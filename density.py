@@ -0,0 +1,133 @@
+"""
+分箱核密度估计
+
+先把数据分到等宽的细分桶中（np.bincount，与数据量成线性），再用FFT把桶计数与高斯核做卷积，
+复杂度只和桶数有关，百万行数据与一千行的耗时几乎相同。薪资已有 0.5K 宽的直方图
+（analysis_aggregates.SalaryStats），可以直接计算：
+
+    bw = select_bandwidth(stats.count, stats.std(), stats.quantile(0.75) - stats.quantile(0.25))
+    x, y = binned_kde(stats.histogram, SALARY_BIN_WIDTH, bandwidth=bw)
+
+    x, y = kde(values)                     # 原始数据：自动分桶
+
+带宽默认按Scott规则（σ·n^(-1/5)，与scipy/seaborn的默认值一致），也可以用Silverman规则。
+与逐点计算的核密度相比，误差来自分桶，桶宽远小于带宽时可以忽略。
+"""
+import numpy as np
+
+BANDWIDTH_METHODS = ("scott", "silverman")
+
+# 输出曲线的点数，以及曲线两端超出数据范围的带宽倍数（与seaborn kdeplot 的默认值相同）
+DEFAULT_GRID_SIZE = 200
+DEFAULT_CUT = 3
+
+# kde 对原始数据分桶时的桶数
+DEFAULT_BIN_COUNT = 2048
+
+
+def select_bandwidth(count, std, iqr=None, method="scott"):
+    """
+    选择高斯核的带宽
+
+    Args:
+        count: 样本数
+        std: 样本标准差
+        iqr: 四分位距，Silverman规则使用
+        method: scott（σ·n^(-1/5)）或 silverman（0.9·min(σ, IQR/1.34)·n^(-1/5)）
+
+    Returns:
+        带宽，无法估计（样本少于2个或方差为0）时返回None
+    """
+    if method not in BANDWIDTH_METHODS:
+        raise ValueError(f"未知的带宽规则: {method}，可选: {', '.join(BANDWIDTH_METHODS)}")
+    if not count or count < 2 or not std:
+        return None
+    spread = std
+    if method == "silverman":
+        if iqr:
+            spread = min(std, iqr / 1.34)
+        return 0.9 * spread * count ** -0.2
+    return spread * count ** -0.2
+
+
+def binned_kde(counts, bin_width, origin=0.0, bandwidth=None, grid_size=DEFAULT_GRID_SIZE, cut=DEFAULT_CUT,
+               clip=None):
+    """
+    由等宽桶计数计算核密度曲线
+
+    Args:
+        counts: 各桶的计数，第i个桶为 [origin + i·bin_width, origin + (i+1)·bin_width)
+        bin_width: 桶宽
+        origin: 第一个桶的下界
+        bandwidth: 带宽，None时按桶中心加权的标准差用Scott规则估计
+        grid_size: 输出曲线的点数
+        cut: 曲线两端超出最小/最大非零桶的带宽倍数
+        clip: (下限, 上限)，曲线只在此范围内输出
+
+    Returns:
+        (x, density) 两个长度为 grid_size 的数组，没有数据时为两个空数组
+    """
+    counts = np.asarray(counts, dtype="float64")
+    total = counts.sum()
+    nonzero = np.flatnonzero(counts)
+    if total <= 0:
+        return np.array([]), np.array([])
+    centers = origin + (np.arange(len(counts)) + 0.5) * bin_width
+
+    if bandwidth is None:
+        mean = np.dot(counts, centers) / total
+        variance = np.dot(counts, (centers - mean) ** 2) / max(total - 1, 1)
+        bandwidth = select_bandwidth(total, np.sqrt(variance))
+    # 全部数据在同一个桶中时用桶宽作为带宽
+    bandwidth = max(bandwidth or bin_width, bin_width / 2)
+
+    # 只保留有数据的范围，两端各补 cut 个带宽（另加核的截断半径）避免环形卷积的回绕
+    radius = int(np.ceil(max(cut, 4) * bandwidth / bin_width))
+    first, last = nonzero[0], nonzero[-1]
+    trimmed = counts[first:last + 1]
+    size = len(trimmed) + 2 * radius
+    padded = np.zeros(size)
+    padded[radius:radius + len(trimmed)] = trimmed
+    grid = origin + (first - radius + np.arange(size) + 0.5) * bin_width
+
+    offsets = np.arange(-radius, radius + 1) * bin_width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    fft_size = 1 << int(np.ceil(np.log2(size + len(kernel) - 1)))
+    convolved = np.fft.irfft(np.fft.rfft(padded, fft_size) * np.fft.rfft(kernel, fft_size), fft_size)
+    # 卷积结果向右偏移了 radius 个桶
+    density = np.clip(convolved[radius:radius + size], 0, None) / total
+
+    low = centers[first] - cut * bandwidth
+    high = centers[last] + cut * bandwidth
+    if clip is not None:
+        low = max(low, clip[0]) if clip[0] is not None else low
+        high = min(high, clip[1]) if clip[1] is not None else high
+    x = np.linspace(low, high, grid_size)
+    return x, np.interp(x, grid, density)
+
+
+def kde(values, bandwidth=None, method="scott", bin_count=DEFAULT_BIN_COUNT, grid_size=DEFAULT_GRID_SIZE,
+        cut=DEFAULT_CUT, clip=None):
+    """
+    原始数据的核密度曲线（先分为 bin_count 个等宽桶）
+
+    Args:
+        values: 数值数组，缺失值忽略
+        bandwidth: 带宽，None时按 method 由数据估计
+        method: 带宽规则，见 select_bandwidth
+
+    Returns:
+        (x, density)
+    """
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.array([]), np.array([])
+    if bandwidth is None:
+        q1, q3 = np.percentile(values, [25, 75])
+        bandwidth = select_bandwidth(len(values), values.std(ddof=1) if len(values) > 1 else 0.0, q3 - q1, method)
+    low, high = values.min(), values.max()
+    bin_width = (high - low) / bin_count if high > low else (bandwidth or 1.0)
+    bins = np.minimum(((values - low) / bin_width).astype("int64"), bin_count - 1)
+    counts = np.bincount(bins, minlength=bin_count)
+    return binned_kde(counts, bin_width, origin=low, bandwidth=bandwidth, grid_size=grid_size, cut=cut, clip=clip)
@@ -0,0 +1,323 @@
+"""
+职位详情页补充
+
+列表页只有卡片上的字段，职位描述和完整要求在详情页（detail_link）上。本模块为已保存的职位
+并发抓取详情页，解析职位描述、关键词和工作地址，写回 data/all_jobs.json：
+
+    python detail_enricher.py --workers 4 --rate 1
+
+所有线程共用一个限速器（rate_limiter.RateLimiter）。详情页响应缓存在磁盘上，按去掉查询参数的
+详情页地址索引（lid、securityId 每次搜索都会变化）：缓存未过期时直接使用，过期后带
+If-None-Match / If-Modified-Since 重新验证，服务器返回304时沿用缓存内容。
+重爬时只有新职位和缓存过期的职位会真正请求详情页。
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from rate_limiter import RateLimiter
+
+# lxml可选：未安装时使用html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_FEATURES = "lxml"
+except ImportError:
+    HTML_FEATURES = "html.parser"
+
+# 缓存放在数据目录下的子目录中
+CACHE_SUBDIR = "detail_cache"
+DEFAULT_CACHE_DIR = os.path.join("data", CACHE_SUBDIR)
+DEFAULT_TTL = 7 * 24 * 3600
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive',
+}
+
+# 详情页字段选择器，按顺序尝试
+DESCRIPTION_SELECTORS = [".job-detail-section .job-sec-text", ".job-sec-text", ".job-detail .text"]
+KEYWORD_SELECTORS = [".job-keyword-list li", ".job-tags span"]
+ADDRESS_SELECTORS = [".location-address", ".job-location .location-address", ".job-address"]
+
+
+def canonical_detail_url(url):
+    """去掉查询参数和锚点的详情页地址，作为缓存键"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _select_text(soup, selectors, separator="\n"):
+    for selector in selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            text = elem.get_text(separator, strip=True)
+            if text:
+                return text
+    return ""
+
+
+def parse_detail_page(html):
+    """
+    解析详情页
+
+    Returns:
+        {'job_description', 'job_keywords', 'work_address'}；页面上没有职位描述
+        （如跳转到登录或安全验证页）时返回None
+    """
+    soup = BeautifulSoup(html, HTML_FEATURES)
+    description = _select_text(soup, DESCRIPTION_SELECTORS)
+    if not description:
+        return None
+
+    keywords = []
+    for selector in KEYWORD_SELECTORS:
+        keywords = [elem.get_text(strip=True) for elem in soup.select(selector)]
+        keywords = [keyword for keyword in keywords if keyword]
+        if keywords:
+            break
+
+    return {
+        "job_description": description,
+        "job_keywords": list(dict.fromkeys(keywords)),
+        "work_address": _select_text(soup, ADDRESS_SELECTORS, separator=" ")
+    }
+
+
+class DetailPageCache:
+    """详情页响应的磁盘缓存，每个地址一个JSON文件"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL):
+        """
+        Args:
+            cache_dir: 缓存目录
+            ttl: 缓存有效期（秒），过期后需要向服务器重新验证
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def path_for(self, url):
+        digest = hashlib.sha1(canonical_detail_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, url):
+        """读取缓存条目，不存在或损坏时返回None"""
+        try:
+            with open(self.path_for(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry, now=None):
+        return (now or time.time()) - entry.get("fetched_at", 0) < self.ttl
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """写入缓存条目（先写临时文件再替换，多个线程同时写同一地址也不会损坏）"""
+        path = self.path_for(url)
+        directory = os.path.dirname(path)
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        entry = {
+            "url": canonical_detail_url(url),
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return entry
+
+    def touch(self, url, entry):
+        """服务器确认内容未变化（304），刷新缓存时间"""
+        return self.put(url, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+
+class DetailEnricher:
+    """并发抓取详情页并解析"""
+
+    def __init__(self, cache=None, rate_limiter=None, workers=4, timeout=30, headers=None):
+        """
+        Args:
+            cache: DetailPageCache，None表示不缓存
+            rate_limiter: 所有线程共用的限速器
+            workers: 并发线程数
+            timeout: 单次请求超时（秒）
+            headers: 请求头
+        """
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter(None)
+        self.workers = workers
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.local = threading.local()
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def _session(self):
+        """每个线程使用自己的Session，复用连接"""
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self.local.session = session
+        return session
+
+    def fetch(self, url):
+        """
+        获取并解析一个详情页
+
+        Returns:
+            (解析结果dict或None, 来源)：来源为 cache、revalidated、fetched、invalid 或 error
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            self._count("cache")
+            return parse_detail_page(entry["body"]), "cache"
+
+        # 缓存过期时带上验证信息，内容未变化时服务器返回304，不需要传输页面
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        self.rate_limiter.acquire()
+        try:
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._count("error")
+            return {"error": str(e)}, "error"
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(url, entry)
+            self._count("revalidated")
+            return parse_detail_page(entry["body"]), "revalidated"
+
+        if response.status_code != 200:
+            self._count("error")
+            return {"error": f"状态码: {response.status_code}"}, "error"
+
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            response.encoding = "utf-8"
+        parsed = parse_detail_page(response.text)
+        if parsed is None:
+            # 登录页或验证页不写入缓存，下次重新请求
+            self._count("invalid")
+            return None, "invalid"
+
+        if self.cache:
+            self.cache.put(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        self._count("fetched")
+        return parsed, "fetched"
+
+    def enrich(self, jobs, refresh=False, limit=None):
+        """
+        为职位列表抓取详情
+
+        Args:
+            jobs: 职位记录列表
+            refresh: 已有职位描述的记录也重新获取（仍会使用未过期的缓存）
+            limit: 最多处理的详情页数，优先处理从未抓取过详情的职位，其次是详情抓取时间最早的，
+                同一组内按爬取时间从新到旧
+
+        Returns:
+            {detail_link: 补充字段dict}，可直接传给 DataManager.update_jobs
+        """
+        # 同一职位可能以不同的lid/securityId出现多次，只请求一次
+        links_by_url = {}
+        # 地址 -> 最近一次爬取时间、最早一次详情抓取时间（从未抓取为空字符串）
+        crawl_times = {}
+        fetched_times = {}
+        for job in jobs:
+            link = job.get("detail_link")
+            if not link or not link.startswith("http"):
+                continue
+            if not refresh and job.get("job_description"):
+                continue
+            url = canonical_detail_url(link)
+            links_by_url.setdefault(url, set()).add(link)
+            crawl_times[url] = max(crawl_times.get(url, ""), job.get("crawl_time") or "")
+            fetched_times[url] = min(fetched_times.get(url, job.get("detail_fetched_at") or ""),
+                                     job.get("detail_fetched_at") or "")
+
+        # 时间均为 %Y-%m-%d %H:%M:%S 格式，可以按字符串比较。先按爬取时间从新到旧，
+        # 再（稳定排序）按详情抓取时间：limit 截取时保留还没有详情的最新职位，而不是最早保存的职位
+        urls = sorted(links_by_url, key=lambda url: crawl_times[url], reverse=True)
+        urls.sort(key=lambda url: fetched_times[url])
+        if limit is not None:
+            urls = urls[:limit]
+        if not urls:
+            return {}
+
+        fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updates = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for url, (parsed, source) in zip(urls, executor.map(self.fetch, urls)):
+                if not parsed or source == "error":
+                    continue
+                fields = dict(parsed, detail_fetched_at=fetched_at)
+                for link in links_by_url[url]:
+                    updates[link] = fields
+        return updates
+
+
+def enrich_saved_jobs(data_manager, enricher, refresh=False, limit=None):
+    """为数据管理器中保存的职位补充详情，返回更新的记录数"""
+    updates = enricher.enrich(data_manager.load_jobs(), refresh=refresh, limit=limit)
+    return data_manager.update_jobs(updates)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='为已保存的职位抓取详情页')
+    parser.add_argument('--workers', type=int, default=4, help='并发线程数，默认为4')
+    parser.add_argument('--rate', type=float, default=1.0, help='每秒最多请求数（所有线程合计），默认为1')
+    parser.add_argument('--cache-dir', type=str, default=None, help=f'缓存目录，默认为数据目录下的{CACHE_SUBDIR}')
+    parser.add_argument('--ttl-days', type=float, default=7, help='缓存有效天数，默认为7')
+    parser.add_argument('--limit', type=int, default=None, help='最多处理的详情页数，优先处理还没有详情的最新职位')
+    parser.add_argument('--refresh', action='store_true', help='已有职位描述的记录也重新获取')
+    parser.add_argument('--data-dir', type=str, default='data', help='数据目录，默认为data')
+    args = parser.parse_args(argv)
+
+    from data_manager import DataManager
+    cache_dir = args.cache_dir or os.path.join(args.data_dir, CACHE_SUBDIR)
+    enricher = DetailEnricher(
+        cache=DetailPageCache(cache_dir, ttl=args.ttl_days * 24 * 3600),
+        rate_limiter=RateLimiter(args.rate, burst=args.workers),
+        workers=args.workers
+    )
+
+    start = time.perf_counter()
+    updated = enrich_saved_jobs(DataManager(args.data_dir), enricher, refresh=args.refresh, limit=args.limit)
+    elapsed = time.perf_counter() - start
+
+    stats = enricher.stats
+    print(f"\n详情页: 缓存命中 {stats['cache']}，重新验证未变化 {stats['revalidated']}，"
+          f"新抓取 {stats['fetched']}，无效页面 {stats['invalid']}，失败 {stats['error']}")
+    print(f"更新 {updated} 条职位，耗时 {elapsed:.1f} 秒，限速等待 {enricher.rate_limiter.stats['waited_seconds']:.1f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
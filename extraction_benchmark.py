@@ -0,0 +1,406 @@
+"""
+职位提取基准测试
+
+对一组录制好的搜索结果页（如 debug/page_<n>.html）分别运行各提取策略，统计：
+每秒卡片数、单页耗时p50/p99、峰值内存，以及相对golden文件的逐字段准确率。
+结果以JSON报告输出，可与上一次报告比较，发现解析速度或正确性的回退：
+
+    python extraction_benchmark.py corpus --golden corpus/golden.json --report bench.json
+    python extraction_benchmark.py corpus --golden corpus/golden.json --baseline bench.json
+
+策略说明：
+    lxml            zhipin_card_parser 选择器级联 + lxml（与离线回放相同）
+    bs4_html_parser ZhipinScraper 静态页面解析，BeautifulSoup(html.parser) 后端
+    bs4_lxml        ZhipinScraper 静态页面解析，BeautifulSoup(lxml) 后端
+    static_lxml     ZhipinScraper 静态页面解析，lxml + 预编译CSS选择器后端
+    webdriver       浏览器中逐元素执行选择器级联（与 ZhipinSeleniumScraper 相同），需 --webdriver
+    webdriver_batch 浏览器中一次脚本调用提取整页卡片，需 --webdriver
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import multiprocessing
+from pathlib import Path
+
+from zhipin_card_parser import UNKNOWN, extract_card, batch_extract_arguments, record_from_batch, BATCH_EXTRACT_SCRIPT
+
+# 参与准确率比较的字段
+ACCURACY_FIELDS = [
+    "job_name", "salary", "company_name", "job_area",
+    "job_requirements", "hr_name", "hr_title", "publish_time", "detail_link"
+]
+
+# 不需要浏览器的策略
+OFFLINE_STRATEGIES = ["lxml", "bs4_html_parser", "bs4_lxml", "static_lxml"]
+WEBDRIVER_STRATEGIES = ["webdriver", "webdriver_batch"]
+
+# 基准比较时使用的固定爬取时间，保证结果可重复
+FIXED_CRAWL_TIME = "2000-01-01 00:00:00"
+
+
+def load_corpus(corpus_dir, pattern="*.html"):
+    """读取语料目录中的页面，返回 [(相对路径, 绝对路径, HTML), ...]"""
+    corpus = []
+    for path in sorted(Path(corpus_dir).glob(pattern)):
+        if path.is_file():
+            corpus.append((path.name, str(path.resolve()), path.read_text(encoding="utf-8", errors="replace")))
+    return corpus
+
+
+class LxmlStrategy:
+    """选择器级联 + lxml"""
+
+    def __init__(self):
+        from zhipin_card_parser import LxmlAdapter
+        self.adapter = LxmlAdapter()
+
+    def extract(self, name, path, html):
+        root = self.adapter.parse(html)
+        cards, _ = self.adapter.find_cards(root)
+        records = [extract_card(card, self.adapter, crawl_time=FIXED_CRAWL_TIME) for card in cards]
+        return len(cards), [record for record in records if record]
+
+    def close(self):
+        pass
+
+
+class StaticPageStrategy:
+    """与 ZhipinScraper.scrape_zhipin 相同的静态页面解析（zhipin_scraper.parse_job_list）"""
+
+    def __init__(self, parser):
+        from zhipin_scraper import parse_job_list
+        self.parse_job_list = parse_job_list
+        self.parser = parser
+
+    def extract(self, name, path, html):
+        item_count, jobs = self.parse_job_list(html, parser=self.parser, crawl_time=FIXED_CRAWL_TIME)
+        # 字段名换算为选择器级联使用的名称，便于统一比较
+        records = [{
+            "job_name": job["title"],
+            "company_name": job["company"],
+            "salary": job["salary"],
+            "job_area": job["location"],
+            "detail_link": job["detail_link"],
+            "crawl_time": job["crawl_time"]
+        } for job in jobs]
+        # item_count 为 ul.job-list-box 的直接子li数，即卡片数（与选择器级联找到的卡片数相同），
+        # 不包括卡片内部的标签li
+        return item_count, records
+
+    def close(self):
+        pass
+
+
+class WebDriverStrategy:
+    """在浏览器中加载录制页面并逐元素提取（与在线爬取路径相同）"""
+
+    def __init__(self, batch=False):
+        from zhipin_selenium_scraper import ZhipinSeleniumScraper, WebElementAdapter
+        from selenium.webdriver.common.by import By
+        self.By = By
+        self.batch = batch
+        self.adapter = WebElementAdapter()
+        self.scraper = ZhipinSeleniumScraper(debug=False, offline=True)
+        self.driver = self.scraper.driver
+
+    def load(self, path):
+        """加载页面不计入提取耗时"""
+        self.driver.get(Path(path).as_uri())
+
+    def extract(self, name, path, html):
+        if self.batch:
+            raw_cards = self.driver.execute_script(BATCH_EXTRACT_SCRIPT, *batch_extract_arguments())
+            records = [record_from_batch(raw, FIXED_CRAWL_TIME) for raw in raw_cards]
+            return len(raw_cards), [record for record in records if record]
+
+        from zhipin_card_parser import CARD_SELECTORS, CARD_XPATHS
+        cards = []
+        for selector in CARD_SELECTORS:
+            cards = self.driver.find_elements(self.By.CSS_SELECTOR, selector)
+            if cards:
+                break
+        if not cards:
+            for xpath in CARD_XPATHS:
+                cards = self.driver.find_elements(self.By.XPATH, xpath)
+                if cards:
+                    break
+        records = [extract_card(card, self.adapter, crawl_time=FIXED_CRAWL_TIME) for card in cards]
+        return len(cards), [record for record in records if record]
+
+    def close(self):
+        self.scraper.close()
+
+
+def create_strategy(name):
+    if name == "lxml":
+        return LxmlStrategy()
+    if name == "bs4_html_parser":
+        return StaticPageStrategy("html.parser")
+    if name == "bs4_lxml":
+        return StaticPageStrategy("bs4-lxml")
+    if name == "static_lxml":
+        return StaticPageStrategy("lxml")
+    if name == "webdriver":
+        return WebDriverStrategy()
+    if name == "webdriver_batch":
+        return WebDriverStrategy(batch=True)
+    raise ValueError(f"未知的提取策略: {name}")
+
+
+def percentile(values, pct):
+    """最近秩法计算百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    """当前进程的峰值常驻内存（MB），无法获取时返回None"""
+    try:
+        import resource
+        # Linux上单位为KB，macOS上为字节
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        # Windows上没有resource模块，使用psutil提供的峰值工作集
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _normalize(value):
+    if isinstance(value, list):
+        return [str(item).strip() for item in value]
+    if value is None:
+        return UNKNOWN
+    return str(value).strip()
+
+
+def score_accuracy(results, golden):
+    """
+    逐字段比较提取结果与golden记录（按页面内顺序对齐）
+
+    Returns:
+        {"card_recall": ..., "fields": {field: 准确率}}；策略不输出的字段（如静态页面解析没有HR信息）不评分，
+        避免按不同的字段集合比较各策略
+    """
+    expected_total = 0
+    extracted_total = 0
+    correct = {field: 0 for field in ACCURACY_FIELDS}
+    # golden中没有出现的字段不参与评分
+    labelled = {field: 0 for field in ACCURACY_FIELDS}
+    produced = {field for records in results.values() for record in records for field in record}
+
+    for name, expected_records in golden.items():
+        actual_records = results.get(name, [])
+        expected_total += len(expected_records)
+        extracted_total += min(len(actual_records), len(expected_records))
+        for expected in expected_records:
+            for field in ACCURACY_FIELDS:
+                if field in expected:
+                    labelled[field] += 1
+        for expected, actual in zip(expected_records, actual_records):
+            for field in ACCURACY_FIELDS:
+                if field in expected and _normalize(expected[field]) == _normalize(actual.get(field)):
+                    correct[field] += 1
+
+    if not expected_total:
+        return None
+    return {
+        "card_recall": round(extracted_total / expected_total, 4),
+        "fields": {field: round(correct[field] / labelled[field], 4) for field in ACCURACY_FIELDS
+                   if labelled[field] and field in produced}
+    }
+
+
+def run_strategy(name, corpus, repeat=1):
+    """在当前进程中运行一个策略，返回统计结果和提取到的记录"""
+    strategy = create_strategy(name)
+    latencies = []
+    cards = 0
+    results = {}
+
+    try:
+        # 第一遍开启tracemalloc统计Python内存峰值，同时作为预热，不计入耗时
+        tracemalloc.start()
+        try:
+            for page_name, path, html in corpus:
+                if hasattr(strategy, "load"):
+                    strategy.load(path)
+                _, results[page_name] = strategy.extract(page_name, path, html)
+            _, python_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        for _ in range(repeat):
+            for page_name, path, html in corpus:
+                if hasattr(strategy, "load"):
+                    strategy.load(path)
+                start = time.perf_counter()
+                page_cards, records = strategy.extract(page_name, path, html)
+                latencies.append(time.perf_counter() - start)
+                cards += page_cards
+    finally:
+        strategy.close()
+
+    total_seconds = sum(latencies)
+    records_per_pass = sum(len(records) for records in results.values())
+    stats = {
+        "pages": len(latencies),
+        "cards": cards,
+        "records": records_per_pass,
+        "seconds": round(total_seconds, 6),
+        "cards_per_second": round(cards / total_seconds, 1) if total_seconds else None,
+        "records_per_second": round(records_per_pass * repeat / total_seconds, 1) if total_seconds else None,
+        "page_p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "page_p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        "peak_python_mb": round(python_peak / (1024 * 1024), 2),
+        "peak_rss_mb": round(peak_rss_mb() or 0, 1) or None
+    }
+    return stats, results
+
+
+def _run_isolated(name, corpus_dir, pattern, repeat, queue):
+    """子进程入口：隔离各策略的峰值内存"""
+    try:
+        queue.put(("ok",) + run_strategy(name, load_corpus(corpus_dir, pattern), repeat))
+    except Exception as e:
+        queue.put(("error", f"{type(e).__name__}: {str(e)}", None))
+
+
+def benchmark(corpus_dir, strategies, golden=None, pattern="*.html", repeat=1, isolate=True):
+    """运行所有策略，返回报告dict"""
+    corpus = load_corpus(corpus_dir, pattern)
+    report = {
+        "corpus": os.path.abspath(corpus_dir),
+        "pages": len(corpus),
+        "repeat": repeat,
+        "golden": bool(golden),
+        "strategies": {}
+    }
+
+    for name in strategies:
+        print(f"运行策略: {name} ...")
+        if isolate:
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_run_isolated, args=(name, corpus_dir, pattern, repeat, queue))
+            process.start()
+            status, stats, results = queue.get()
+            process.join()
+        else:
+            try:
+                status, (stats, results) = "ok", run_strategy(name, corpus, repeat)
+            except Exception as e:
+                status, stats, results = "error", f"{type(e).__name__}: {str(e)}", None
+
+        if status != "ok":
+            print(f"  策略 {name} 运行失败: {stats}")
+            report["strategies"][name] = {"error": stats}
+            continue
+
+        if golden:
+            stats["accuracy"] = score_accuracy(results, golden)
+        if "cards" not in report:
+            report["cards"] = stats["cards"]
+        elif stats["cards"] != report["cards"]:
+            # 每秒卡片数按各策略找到的卡片数计算，卡片数不同时吞吐不可直接比较
+            print(f"  警告: 策略 {name} 找到 {stats['cards']} 个卡片，与其他策略（{report['cards']} 个）不同")
+        report["strategies"][name] = stats
+        print(f"  {stats['cards_per_second']} 卡片/秒，p50 {stats['page_p50_ms']}ms，p99 {stats['page_p99_ms']}ms，"
+              f"Python峰值内存 {stats['peak_python_mb']}MB")
+        if golden and stats.get("accuracy"):
+            print(f"  卡片召回率 {stats['accuracy']['card_recall']}，字段准确率 {stats['accuracy']['fields']}")
+
+    return report
+
+
+def write_golden(corpus_dir, path, strategy="lxml", pattern="*.html"):
+    """用指定策略生成golden文件初稿，人工校对后作为基准"""
+    _, results = run_strategy(strategy, load_corpus(corpus_dir, pattern))
+    for records in results.values():
+        for record in records:
+            record.pop("crawl_time", None)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"已生成golden文件: {path}（{sum(len(r) for r in results.values())} 条记录），请人工校对")
+
+
+def find_regressions(report, baseline, max_slowdown=0.2, max_accuracy_drop=0.0):
+    """与基准报告比较，返回回退描述列表"""
+    regressions = []
+    for name, stats in report["strategies"].items():
+        base = baseline.get("strategies", {}).get(name)
+        if not base or "error" in stats or "error" in base:
+            continue
+
+        if base.get("cards_per_second") and stats.get("cards_per_second"):
+            if stats["cards_per_second"] < base["cards_per_second"] * (1 - max_slowdown):
+                regressions.append(f"{name}: 吞吐 {stats['cards_per_second']} < 基准 {base['cards_per_second']} 卡片/秒")
+
+        base_accuracy = (base.get("accuracy") or {}).get("fields", {})
+        accuracy = (stats.get("accuracy") or {}).get("fields", {})
+        for field, value in accuracy.items():
+            if field in base_accuracy and value < base_accuracy[field] - max_accuracy_drop:
+                regressions.append(f"{name}: 字段 {field} 准确率 {value} < 基准 {base_accuracy[field]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='职位提取策略基准测试')
+    parser.add_argument('corpus', help='录制页面所在目录')
+    parser.add_argument('--pattern', type=str, default='page_*.html', help='页面文件匹配模式，默认为page_*.html')
+    parser.add_argument('--golden', type=str, default=None, help='golden记录文件（{页面文件名: [记录, ...]}）')
+    parser.add_argument('--write-golden', type=str, default=None, help='用lxml策略生成golden文件初稿后退出')
+    parser.add_argument('--strategies', type=str, default=','.join(OFFLINE_STRATEGIES), help='逗号分隔的策略列表')
+    parser.add_argument('--webdriver', action='store_true', help='同时运行需要浏览器的策略')
+    parser.add_argument('--repeat', type=int, default=1, help='每个策略重复运行语料的次数')
+    parser.add_argument('--no-isolate', action='store_true', help='不使用子进程隔离（峰值内存不再按策略区分）')
+    parser.add_argument('--report', type=str, default='extraction_benchmark.json', help='JSON报告输出路径')
+    parser.add_argument('--baseline', type=str, default=None, help='与之比较的基准报告，发现回退时返回码为1')
+    parser.add_argument('--max-slowdown', type=float, default=0.2, help='允许的吞吐下降比例，默认0.2')
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.0, help='允许的字段准确率下降，默认0')
+    args = parser.parse_args(argv)
+
+    if args.write_golden:
+        write_golden(args.corpus, args.write_golden, pattern=args.pattern)
+        return 0
+
+    strategies = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    if args.webdriver:
+        strategies += [name for name in WEBDRIVER_STRATEGIES if name not in strategies]
+
+    golden = None
+    if args.golden:
+        with open(args.golden, "r", encoding="utf-8") as f:
+            golden = json.load(f)
+
+    report = benchmark(args.corpus, strategies, golden, args.pattern, args.repeat, isolate=not args.no_isolate)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"基准报告已保存到 {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.max_slowdown, args.max_accuracy_drop)
+        if regressions:
+            print("\n发现回退:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("与基准报告相比没有回退")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+导入耗时检查
+
+数据分析的各模块在导入时不应加载绘图库，也不应有创建目录、修改rcParams等副作用。本脚本在新的
+Python进程中逐个导入模块，取多次中的最短耗时与预算比较，并检查不应被导入的库：
+
+    python import_budget.py
+    python import_budget.py --repeat 5 --report import_budget.json
+
+超出预算或导入了不应导入的库时退出码为1，可以放在CI中。
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+# 模块 -> (导入耗时预算（秒）, 导入后不应出现的库)
+PLOTTING_MODULES = ["matplotlib", "seaborn", "plotly", "wordcloud"]
+BUDGETS = {
+    "data_analysis": (1.0, PLOTTING_MODULES),
+    "analysis_renderers": (1.0, PLOTTING_MODULES),
+    "analysis_result": (1.0, PLOTTING_MODULES),
+    "analysis_aggregates": (0.3, ["pandas"] + PLOTTING_MODULES),
+    "density": (0.3, ["pandas"] + PLOTTING_MODULES),
+}
+
+MEASURE_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(name for name in sys.modules if "." not in name)}}))
+"""
+
+
+def measure_import(module, cwd=None):
+    """
+    在新进程中导入模块
+
+    Returns:
+        (耗时秒数, 导入后的顶层模块列表)
+    """
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.abspath(__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    output = subprocess.run([sys.executable, "-c", MEASURE_SCRIPT.format(module=module)], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    data = json.loads(output.strip().splitlines()[-1])
+    return data["seconds"], data["modules"]
+
+
+def check_budgets(budgets=BUDGETS, repeat=3, cwd=None):
+    """
+    检查各模块的导入耗时和导入的库
+
+    Returns:
+        {模块: {'seconds', 'budget', 'forbidden', 'ok'}}
+    """
+    results = {}
+    for module, (budget, forbidden) in budgets.items():
+        timings = []
+        loaded = []
+        for _ in range(repeat):
+            seconds, loaded = measure_import(module, cwd)
+            timings.append(seconds)
+        # 取最短耗时，排除磁盘缓存等的干扰
+        seconds = min(timings)
+        unexpected = [name for name in forbidden if name in loaded]
+        results[module] = {
+            "seconds": round(seconds, 3),
+            "budget": budget,
+            "forbidden": unexpected,
+            "ok": seconds <= budget and not unexpected
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='检查数据分析模块的导入耗时')
+    parser.add_argument('--repeat', type=int, default=3, help='每个模块导入的次数，取最短耗时，默认为3')
+    parser.add_argument('--report', type=str, default=None, help='JSON报告文件路径')
+    args = parser.parse_args(argv)
+
+    # 在临时的空目录中导入，确认导入不会创建文件或目录
+    with tempfile.TemporaryDirectory() as cwd:
+        results = check_budgets(repeat=args.repeat, cwd=cwd)
+        side_effects = os.listdir(cwd)
+
+    for module, result in results.items():
+        status = "OK" if result["ok"] else "超出"
+        line = f"{module:<22} {result['seconds']:.3f}s / 预算 {result['budget']:.1f}s  {status}"
+        if result["forbidden"]:
+            line += f"（导入了 {', '.join(result['forbidden'])}）"
+        print(line)
+    if side_effects:
+        print(f"导入时在工作目录中创建了: {', '.join(side_effects)}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({"modules": results, "side_effects": side_effects}, f, ensure_ascii=False, indent=2)
+
+    return 0 if all(result["ok"] for result in results.values()) and not side_effects else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+"""
+本地模拟招聘网站，用于爬虫的端到端压测
+
+按种子确定性地生成搜索结果页 /web/geek/job?query=&city=&page= 以及对应的
+职位列表接口 /wapi/zpgeek/search/joblist.json，页面结构与两个爬虫使用的选择器一致。
+可以配置每页卡片数、响应延迟分布、错误率和空结果页，不访问真实网站即可测量
+每分钟页面数、调整并发，以及验证断点续爬和去重：
+
+    python mock_zhipin_server.py --port 8765 --latency uniform:0.05,0.3 --error-rate 0.02
+    python zhipin_selenium_scraper.py --base-url http://127.0.0.1:8765
+
+同一城市的不同关键词会从同一个职位池中取数据，因此关键词之间存在重复职位。
+支持 areaBusiness、salary、experience、degree 筛选参数（见 query_partitioner.py），用于验证查询拆分。
+搜索结果中出现过的职位可以访问详情页 /job_detail/<职位ID>.html，支持ETag/Last-Modified条件请求。
+访问 /__stats 可查看服务端统计（请求数、状态码、重复抓取的页面数）。
+"""
+import re
+import sys
+import json
+import math
+import html
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+
+from city_codes import CITY_DISTRICT_CODES
+
+# 城市代码 -> (城市名, 区县)
+CITY_DISTRICTS = {
+    "101010100": ("北京", ["海淀区", "朝阳区", "东城区", "西城区", "丰台区", "昌平区"]),
+    "101020100": ("上海", ["浦东新区", "徐汇区", "静安区", "长宁区", "闵行区", "杨浦区"]),
+    "101280100": ("广州", ["天河区", "海珠区", "番禺区", "越秀区", "白云区"]),
+    "101280600": ("深圳", ["南山区", "福田区", "宝安区", "龙岗区", "罗湖区"]),
+    "101210100": ("杭州", ["西湖区", "滨江区", "余杭区", "拱墅区", "上城区"]),
+    "101270100": ("成都", ["高新区", "武侯区", "锦江区", "成华区", "青羊区"])
+}
+
+JOB_TITLES = ["Python开发工程师", "数据分析师", "前端开发工程师", "Java开发工程师", "算法工程师",
+              "大数据开发工程师", "数据仓库工程师", "机器学习工程师", "测试开发工程师", "运维开发工程师"]
+COMPANIES = ["腾讯", "阿里巴巴", "百度", "字节跳动", "美团", "京东", "华为", "小米", "网易", "快手",
+             "滴滴", "拼多多", "蚂蚁集团", "携程", "哔哩哔哩"]
+INDUSTRIES = ["互联网", "电子商务", "计算机软件", "游戏", "金融科技"]
+SCALES = ["100-499人", "500-999人", "1000-9999人", "10000人以上"]
+STAGES = ["不需要融资", "已上市", "D轮及以上", "B轮"]
+EXPERIENCES = ["经验不限", "在校/应届", "1-3年", "3-5年", "5-10年", "10年以上"]
+EDUCATIONS = ["学历不限", "大专", "本科", "硕士", "博士"]
+SKILLS = ["Python", "Java", "SQL", "Hive", "Spark", "Hadoop", "Flink", "Kafka", "MySQL", "Redis",
+          "Linux", "Docker", "Kubernetes", "TensorFlow", "PyTorch", "Vue", "React", "TypeScript", "Go", "Tableau"]
+WELFARE = ["五险一金", "带薪年假", "年终奖", "餐补", "定期体检", "弹性工作", "股票期权"]
+HR_NAMES = ["张先生", "李女士", "王女士", "刘先生", "陈女士", "杨先生"]
+HR_TITLES = ["HR", "HRBP", "招聘经理", "技术总监", "人事专员"]
+
+
+# 支持的搜索筛选参数（取值见 query_partitioner.py）
+FILTER_PARAMS = ["areaBusiness", "salary", "experience", "degree"]
+
+# 经验、学历筛选参数值 -> 生成数据中的对应取值
+EXPERIENCE_CODES = {"101": "经验不限", "102": "在校/应届", "108": "在校/应届", "104": "1-3年",
+                    "105": "3-5年", "106": "5-10年", "107": "10年以上"}
+DEGREE_CODES = {"202": "大专", "203": "本科", "204": "硕士", "205": "博士"}
+# 薪资筛选参数值 -> 月薪下限区间（K）
+SALARY_BANDS = {"402": (0, 3), "403": (3, 5), "404": (5, 10), "405": (10, 20), "406": (20, 50), "407": (50, 10 ** 6)}
+
+
+def monthly_salary_k(salary_desc):
+    """将生成的薪资换算为月薪下限（K），面议返回None"""
+    match = re.match(r"([\d.]+)", salary_desc)
+    if not match:
+        return None
+    low = float(match.group(1))
+    if "万" in salary_desc:
+        return low * 10
+    if "元/天" in salary_desc:
+        return low * 21.75 / 1000
+    if "元/时" in salary_desc:
+        return low * 8 * 21.75 / 1000
+    return low
+
+
+def posting_matches(posting, filters):
+    """职位是否符合搜索筛选条件"""
+    if "areaBusiness" in filters:
+        city_name = posting["cityName"]
+        if CITY_DISTRICT_CODES.get(city_name, {}).get(posting["areaDistrict"]) != filters["areaBusiness"]:
+            return False
+    if "experience" in filters and EXPERIENCE_CODES.get(filters["experience"]) != posting["jobExperience"]:
+        return False
+    if "degree" in filters and DEGREE_CODES.get(filters["degree"]) != posting["jobDegree"]:
+        return False
+    if "salary" in filters:
+        band = SALARY_BANDS.get(filters["salary"])
+        salary = monthly_salary_k(posting["salaryDesc"])
+        if band is None or salary is None or not band[0] <= salary < band[1]:
+            return False
+    return True
+
+
+def stable_seed(*parts):
+    """由任意字段生成稳定的随机种子（不受Python哈希随机化影响）"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return int(digest[:16], 16)
+
+
+def random_salary(rng):
+    """生成与网站一致的各种薪资格式"""
+    kind = rng.random()
+    if kind < 0.6:
+        low = rng.randrange(5, 40)
+        return f"{low}-{low + rng.randrange(3, 20)}K"
+    if kind < 0.8:
+        low = rng.randrange(10, 40)
+        return f"{low}-{low + rng.randrange(5, 20)}K·{rng.choice([13, 14, 15, 16])}薪"
+    if kind < 0.88:
+        low = rng.choice([1, 1.5, 2, 3])
+        return f"{low:g}-{low + rng.choice([0.5, 1, 2]):g}万"
+    if kind < 0.94:
+        low = rng.randrange(100, 400, 50)
+        return f"{low}-{low + rng.randrange(50, 200, 50)}元/天"
+    if kind < 0.98:
+        low = rng.randrange(20, 80, 5)
+        return f"{low}-{low + rng.randrange(5, 40, 5)}元/时"
+    return "面议"
+
+
+def generate_posting(seed, city_code, index):
+    """按 (种子, 城市, 序号) 确定性地生成一个职位，字段名与职位列表接口一致"""
+    rng = random.Random(stable_seed(seed, city_code, index))
+    city_name, districts = CITY_DISTRICTS.get(city_code, (city_code, ["市辖区"]))
+    job_id = hashlib.sha1(f"{seed}:{city_code}:{index}".encode("utf-8")).hexdigest()[:24]
+    experience = rng.choice(EXPERIENCES)
+    degree = rng.choice(EDUCATIONS)
+    district = rng.choice(districts)
+    return {
+        "encryptJobId": job_id,
+        "securityId": hashlib.md5(job_id.encode("utf-8")).hexdigest(),
+        "lid": f"mock.{index}",
+        "jobName": rng.choice(JOB_TITLES),
+        "salaryDesc": random_salary(rng),
+        "brandName": rng.choice(COMPANIES),
+        "encryptBrandId": hashlib.md5(f"brand{index % 97}".encode("utf-8")).hexdigest()[:16],
+        "brandIndustry": rng.choice(INDUSTRIES),
+        "brandScaleName": rng.choice(SCALES),
+        "brandStageName": rng.choice(STAGES),
+        "cityName": city_name,
+        "city": int(city_code) if city_code.isdigit() else 0,
+        "areaDistrict": district,
+        "businessDistrict": f"{district[:2]}商圈",
+        "jobExperience": experience,
+        "jobDegree": degree,
+        "jobLabels": [experience, degree],
+        "skills": rng.sample(SKILLS, rng.randrange(2, 6)),
+        "welfareList": rng.sample(WELFARE, rng.randrange(1, 4)),
+        "bossName": rng.choice(HR_NAMES),
+        "bossTitle": rng.choice(HR_TITLES),
+        "bossOnline": rng.random() < 0.3,
+        "gps": {"longitude": round(116 + rng.random(), 6), "latitude": round(39 + rng.random(), 6)}
+    }
+
+
+class ListingGenerator:
+    """确定性的搜索结果生成器"""
+
+    def __init__(self, seed=42, cards_per_page=15, max_pages=10, pool_size=2000,
+                 min_results=30, max_results=300):
+        self.seed = seed
+        self.cards_per_page = cards_per_page
+        self.max_pages = max_pages
+        self.pool_size = pool_size
+        self.min_results = min_results
+        self.max_results = max_results
+
+    def total_results(self, query, city, filters=None):
+        """每个 (关键词, 城市) 的结果总数，有筛选条件时为符合条件的职位数"""
+        if filters:
+            return len(self.matching_postings(query, city, filters))
+        rng = random.Random(stable_seed(self.seed, "total", query, city))
+        return rng.randint(self.min_results, self.max_results)
+
+    def posting_at(self, query, city, position):
+        """查询结果中第position个职位（从0开始）"""
+        # 同一城市的所有关键词共用一个职位池，关键词只决定起点和步长，因此会有重复职位
+        offset = stable_seed(self.seed, "offset", query) % self.pool_size
+        stride = 1 + stable_seed(self.seed, "stride", query) % 7
+        return generate_posting(self.seed, city, (offset + position * stride) % self.pool_size)
+
+    def matching_postings(self, query, city, filters):
+        """全部结果中符合筛选条件的职位（不受页数上限限制）"""
+        total = self.total_results(query, city)
+        postings = (self.posting_at(query, city, i) for i in range(total))
+        return [posting for posting in postings if posting_matches(posting, filters)]
+
+    def page_postings(self, query, city, page, filters=None):
+        """返回某一页的职位列表，超过结果总数或页数上限时返回空列表"""
+        if page < 1 or page > self.max_pages:
+            return []
+        start = (page - 1) * self.cards_per_page
+        if filters:
+            return self.matching_postings(query, city, filters)[start:start + self.cards_per_page]
+
+        total = self.total_results(query, city)
+        if start >= total:
+            return []
+        count = min(self.cards_per_page, total - start)
+        return [self.posting_at(query, city, start + i) for i in range(count)]
+
+    def job_list_payload(self, query, city, page, filters=None):
+        """职位列表接口的响应"""
+        postings = self.page_postings(query, city, page, filters)
+        return {
+            "code": 0,
+            "message": "Success",
+            "zpData": {
+                "resCount": self.total_results(query, city, filters),
+                "hasMore": bool(postings) and page < self.max_pages,
+                "jobList": postings
+            }
+        }
+
+
+def render_card(posting):
+    """渲染一个职位卡片，结构与网站搜索结果页一致"""
+    e = html.escape
+    detail = f"/job_detail/{posting['encryptJobId']}.html?lid={posting['lid']}&securityId={posting['securityId']}"
+    area = "·".join([posting["cityName"], posting["areaDistrict"], posting["businessDistrict"]])
+    labels = "".join(f"<li>{e(label)}</li>" for label in posting["jobLabels"])
+    skills = "".join(f"<li>{e(skill)}</li>" for skill in posting["skills"])
+    return f"""<li class="job-card-wrapper">
+  <div class="job-card-body clearfix">
+    <a href="{e(detail)}" class="job-card-left" ka="search_list_jname">
+      <div class="job-title clearfix"><span class="job-name">{e(posting['jobName'])}</span><span class="job-area-wrapper"><span class="job-area">{e(area)}</span></span></div>
+      <div class="job-info clearfix"><span class="salary">{e(posting['salaryDesc'])}</span><ul class="tag-list">{labels}</ul><div class="info-public">{e(posting['bossName'])}<em>{e(posting['bossTitle'])}</em></div></div>
+    </a>
+    <div class="job-card-right"><div class="company-info"><h3 class="company-name"><a href="/gongsi/{e(posting['encryptBrandId'])}.html">{e(posting['brandName'])}</a></h3>
+      <ul class="company-tag-list"><li>{e(posting['brandIndustry'])}</li><li>{e(posting['brandStageName'])}</li><li>{e(posting['brandScaleName'])}</li></ul></div></div>
+  </div>
+  <div class="job-card-footer clearfix"><ul class="tag-list">{skills}</ul><div class="info-desc">{e('，'.join(posting['welfareList']))}</div></div>
+</li>"""
+
+
+def render_search_page(query, city, page, postings):
+    """渲染搜索结果页；无结果时返回网站的空结果提示"""
+    e = html.escape
+    if postings:
+        body = f'<ul class="job-list-box">\n{"".join(render_card(p) for p in postings)}\n</ul>'
+    else:
+        body = '<div class="job-empty-wrapper"><p>没有找到相关职位，修改筛选条件试一下</p></div>'
+    api_url = f"/wapi/zpgeek/search/joblist.json?query={quote(query)}&city={quote(city)}&page={page}"
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>「{e(query)}招聘」-BOSS直聘（本地模拟）</title></head>
+<body>
+<div class="search-box"><form class="search-form" action="/web/geek/job"><input type="text" name="query" class="ipt-search" value="{e(query)}" placeholder="搜索职位、公司"><input type="hidden" name="city" value="{e(city)}"><button type="submit" class="btn btn-search">搜索</button></form></div>
+<div class="search-job-result">
+{body}
+</div>
+<script>fetch({json.dumps(api_url)}).catch(function () {{}});</script>
+</body></html>"""
+
+
+def render_detail_page(posting):
+    """渲染职位详情页，结构与网站详情页的职位描述部分一致"""
+    e = html.escape
+    rng = random.Random(stable_seed("detail", posting["encryptJobId"]))
+    duties = [
+        f"负责{posting['jobName'].replace('工程师', '').replace('师', '')}相关系统的设计与开发",
+        f"使用{'、'.join(posting['skills'][:3])}完成数据处理和业务需求",
+        "参与技术方案评审，持续优化系统性能与稳定性",
+        "与产品、运营团队协作，推动需求落地",
+    ]
+    requirements = [
+        f"{posting['jobDegree']}，{posting['jobExperience']}",
+        f"熟悉{'、'.join(posting['skills'])}",
+        "具备良好的沟通能力和团队合作精神",
+    ]
+    rng.shuffle(duties)
+    description = "<br>".join(
+        ["岗位职责："] + [f"{i + 1}. {e(text)}" for i, text in enumerate(duties)] +
+        ["任职要求："] + [f"{i + 1}. {e(text)}" for i, text in enumerate(requirements)]
+    )
+    keywords = "".join(f"<li>{e(skill)}</li>" for skill in posting["skills"])
+    address = f"{posting['cityName']}{posting['areaDistrict']}{posting['businessDistrict']}{rng.randrange(1, 300)}号"
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{e(posting['jobName'])} - {e(posting['brandName'])}</title></head>
+<body>
+<div class="job-banner"><div class="info-primary"><div class="name"><h1>{e(posting['jobName'])}</h1><span class="salary">{e(posting['salaryDesc'])}</span></div></div></div>
+<div class="job-detail"><div class="job-detail-section">
+<h3>职位描述</h3>
+<ul class="job-keyword-list">{keywords}</ul>
+<div class="job-sec-text">{description}</div>
+</div>
+<div class="job-location"><div class="location-address">{e(address)}</div></div>
+</div>
+</body></html>"""
+
+
+def render_home_page():
+    return """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>BOSS直聘（本地模拟）</title></head>
+<body><div class="search-box"><form class="search-form" action="/web/geek/job"><input type="text" name="query" class="ipt-search" placeholder="搜索职位、公司"><button type="submit" class="btn btn-search">搜索</button></form></div></body></html>"""
+
+
+def parse_latency(spec):
+    """
+    解析延迟分布：none、fixed:秒、uniform:最小,最大、lognormal:中位数,sigma
+
+    Returns:
+        接受random.Random返回延迟秒数的函数
+    """
+    if not spec or spec == "none":
+        return lambda rng: 0.0
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"无法解析延迟分布: {spec}")
+
+
+class MockZhipinServer(ThreadingHTTPServer):
+    """模拟招聘网站服务端，保存配置和统计"""
+
+    daemon_threads = True
+
+    def __init__(self, address, generator, latency="none", error_rate=0.0, empty_rate=0.0, seed=42, quiet=False):
+        super().__init__(address, MockZhipinHandler)
+        self.generator = generator
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.empty_rate = empty_rate
+        self.quiet = quiet
+        # 延迟和错误注入使用独立的随机流，串行访问时可复现
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.page_hits = Counter()
+        # 已在搜索结果中出现过的职位，详情页按职位ID查找
+        self.postings = {}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self):
+        """抽取本次请求的延迟、是否报错、是否返回空页"""
+        with self.lock:
+            return self.latency(self.rng), self.rng.random() < self.error_rate, self.rng.random() < self.empty_rate
+
+    def record(self, key, page_key=None):
+        with self.lock:
+            self.stats[key] += 1
+            if page_key is not None:
+                self.page_hits[page_key] += 1
+
+    def remember(self, postings):
+        with self.lock:
+            for posting in postings:
+                self.postings[posting["encryptJobId"]] = posting
+
+    def find_posting(self, job_id):
+        with self.lock:
+            return self.postings.get(job_id)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": dict(self.stats),
+                "unique_pages": len(self.page_hits),
+                "repeated_page_fetches": sum(count - 1 for count in self.page_hits.values() if count > 1)
+            }
+
+
+class MockZhipinHandler(BaseHTTPRequestHandler):
+    server_version = "MockZhipin/1.0"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.record(f"status_{status}")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/__stats":
+            self.send_body(200, json.dumps(self.server.snapshot(), ensure_ascii=False), "application/json; charset=utf-8")
+            return
+        if url.path == "/":
+            self.send_body(200, render_home_page())
+            return
+        if url.path.startswith("/job_detail/"):
+            self.send_detail(url.path[len("/job_detail/"):].split(".")[0])
+            return
+        if url.path not in ("/web/geek/job", "/wapi/zpgeek/search/joblist.json"):
+            self.send_body(404, "<html><body>404</body></html>")
+            return
+
+        query = params.get("query", "")
+        city = params.get("city", "101010100")
+        try:
+            page = int(params.get("page", "1"))
+        except ValueError:
+            page = 1
+        filters = {key: params[key] for key in FILTER_PARAMS if params.get(key)}
+
+        delay, fail, empty = self.server.draw()
+        if delay:
+            time.sleep(delay)
+        is_api = url.path.endswith(".json")
+        self.server.record("api_requests" if is_api else "page_requests",
+                           None if is_api else (query, city, page))
+
+        if fail:
+            self.send_body(503, "<html><body>服务暂时不可用</body></html>")
+            return
+
+        generator = self.server.generator
+        if is_api:
+            payload = generator.job_list_payload(query, city, page, filters)
+            self.server.remember(payload["zpData"]["jobList"])
+            if empty:
+                payload["zpData"]["jobList"] = []
+            self.send_body(200, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8")
+            return
+
+        postings = [] if empty else generator.page_postings(query, city, page, filters)
+        self.server.remember(postings)
+        self.send_body(200, render_search_page(query, city, page, postings))
+
+
+    def send_detail(self, job_id):
+        """职位详情页，支持ETag/Last-Modified条件请求"""
+        delay, fail, _ = self.server.draw()
+        if delay:
+            time.sleep(delay)
+        self.server.record("detail_requests", ("detail", job_id))
+
+        posting = self.server.find_posting(job_id)
+        if posting is None:
+            self.send_body(404, "<html><body>职位不存在或已关闭</body></html>")
+            return
+        if fail:
+            self.send_body(503, "<html><body>服务暂时不可用</body></html>")
+            return
+
+        body = render_detail_page(posting)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+        # 生成数据不会变化，固定为一个确定的修改时间
+        last_modified = formatdate(1700000000 + stable_seed(job_id) % 10000000, usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if self.headers.get("If-None-Match") == etag or self.headers.get("If-Modified-Since") == last_modified:
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.server.record("status_304")
+            return
+        self.send_body(200, body, headers=headers)
+
+
+def dump_corpus(generator, directory, queries, city, pages):
+    """将生成的搜索结果页写成基准测试语料，并以生成数据作为golden文件"""
+    import os
+    from zhipin_api import map_job
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    golden = {}
+    index = 0
+    for query in queries:
+        for page in range(1, pages + 1):
+            postings = generator.page_postings(query, city, page)
+            if not postings:
+                break
+            index += 1
+            name = f"page_{index}.html"
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+                f.write(render_search_page(query, city, page, postings))
+            fields = ("job_name", "salary", "company_name", "job_area", "job_requirements", "hr_name", "hr_title", "detail_link")
+            golden[name] = []
+            for posting in postings:
+                record = map_job(posting, None)
+                golden[name].append({field: record[field] for field in fields})
+
+    with open(os.path.join(directory, "golden.json"), "w", encoding="utf-8") as f:
+        json.dump(golden, f, ensure_ascii=False, indent=2)
+    print(f"已生成 {index} 个页面和golden文件到 {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='本地模拟BOSS直聘搜索结果服务')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子，决定生成的全部内容')
+    parser.add_argument('--cards', type=int, default=15, help='每页职位卡片数')
+    parser.add_argument('--max-pages', type=int, default=10, help='每个搜索可访问的最大页数')
+    parser.add_argument('--pool-size', type=int, default=2000, help='每个城市的职位池大小')
+    parser.add_argument('--min-results', type=int, default=30, help='每个搜索的最少结果数')
+    parser.add_argument('--max-results', type=int, default=300, help='每个搜索的最多结果数')
+    parser.add_argument('--latency', type=str, default='none', help='延迟分布: none / fixed:0.2 / uniform:0.1,0.5 / lognormal:0.2,0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回503的概率')
+    parser.add_argument('--empty-rate', type=float, default=0.0, help='返回空结果页的概率')
+    parser.add_argument('--quiet', action='store_true', help='不输出访问日志')
+    parser.add_argument('--dump', type=str, default=None, help='不启动服务，将搜索结果页写入该目录作为基准测试语料')
+    parser.add_argument('--dump-queries', type=str, default='Python,数据分析,Java', help='生成语料使用的关键词')
+    parser.add_argument('--dump-city', type=str, default='101010100', help='生成语料使用的城市代码')
+    args = parser.parse_args(argv)
+
+    generator = ListingGenerator(args.seed, args.cards, args.max_pages, args.pool_size, args.min_results, args.max_results)
+
+    if args.dump:
+        queries = [q.strip() for q in args.dump_queries.split(',') if q.strip()]
+        dump_corpus(generator, args.dump, queries, args.dump_city, args.max_pages)
+        return 0
+
+    server = MockZhipinServer((args.host, args.port), generator, args.latency, args.error_rate,
+                              args.empty_rate, args.seed, args.quiet)
+    print(f"模拟服务已启动: {server.base_url}/web/geek/job?query=Python&city=101010100&page=1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"服务统计: {json.dumps(server.snapshot(), ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+搜索空间拆分：突破搜索结果的翻页上限
+
+搜索结果最多只能翻到固定页数，结果很多的查询（如 北京/Python）在最后一页仍是满页，
+继续翻页已不可能，大部分职位始终看不到。本模块找出任务队列中这样“饱和”的查询，
+按区域、薪资、经验、学历筛选条件拆分为更细的子查询放回队列，子查询饱和时继续拆分下一个维度。
+各子查询的结果与原查询合并，并按职位指纹去重：
+
+    # 查看哪些查询已饱和、将如何拆分
+    python query_partitioner.py plan
+    # 为饱和的查询生成子查询任务，然后照常启动工作进程
+    python query_partitioner.py expand
+    python crawl_frontier.py work
+    # 合并一个查询（含全部子查询）的去重结果
+    python query_partitioner.py merge --city 北京 --keyword Python --output beijing_python.json
+"""
+import sys
+import json
+import argparse
+
+from city_codes import CITY_DISTRICT_CODES, resolve_city
+from crawl_frontier import DEFAULT_DB_PATH, CrawlFrontier, decode_filters, encode_filters
+
+# 搜索页筛选参数：选项名称 -> 参数值
+SALARY_FILTERS = {
+    "3K以下": "402",
+    "3-5K": "403",
+    "5-10K": "404",
+    "10-20K": "405",
+    "20-50K": "406",
+    "50K以上": "407"
+}
+
+EXPERIENCE_FILTERS = {
+    "在校生": "108",
+    "应届生": "102",
+    "经验不限": "101",
+    "1年以内": "103",
+    "1-3年": "104",
+    "3-5年": "105",
+    "5-10年": "106",
+    "10年以上": "107"
+}
+
+DEGREE_FILTERS = {
+    "初中及以下": "209",
+    "中专/中技": "208",
+    "高中": "206",
+    "大专": "202",
+    "本科": "203",
+    "硕士": "204",
+    "博士": "205"
+}
+
+# 拆分维度 -> (URL参数名, 选项表)；区域的选项按城市取 CITY_DISTRICT_CODES
+FILTER_DIMENSIONS = {
+    "district": ("areaBusiness", None),
+    "salary": ("salary", SALARY_FILTERS),
+    "experience": ("experience", EXPERIENCE_FILTERS),
+    "degree": ("degree", DEGREE_FILTERS)
+}
+
+# 默认拆分顺序：区域之间互不重叠且分得最细，优先使用
+DEFAULT_DIMENSIONS = ["district", "salary", "experience", "degree"]
+
+
+def dimension_options(dimension, city):
+    """某个拆分维度在指定城市下的选项 {名称: 参数值}，没有可用选项时返回空dict"""
+    param, options = FILTER_DIMENSIONS[dimension]
+    if options is None:
+        city_name, _ = resolve_city(city)
+        return CITY_DISTRICT_CODES.get(city_name, {})
+    return options
+
+
+def split_filters(city, filters, dimensions=DEFAULT_DIMENSIONS):
+    """
+    将一个查询按下一个尚未使用的维度拆分
+
+    Args:
+        city: 城市名称或代码
+        filters: 当前的筛选条件dict
+        dimensions: 按顺序尝试的拆分维度
+
+    Returns:
+        (维度名, [子查询筛选条件dict, ...])；所有维度都已使用时返回 (None, [])
+    """
+    for dimension in dimensions:
+        param, _ = FILTER_DIMENSIONS[dimension]
+        if param in filters:
+            continue
+        options = dimension_options(dimension, city)
+        if not options:
+            continue
+        return dimension, [dict(filters, **{param: code}) for code in options.values()]
+    return None, []
+
+
+def is_saturated(subquery, full_page_ratio=0.9):
+    """
+    子查询是否饱和：所有页都已结束，最后一页成功完成且仍接近满页
+
+    Args:
+        subquery: CrawlFrontier.subqueries() 返回的一项
+        full_page_ratio: 最后一页职位数达到最多一页的这一比例时视为满页
+    """
+    if subquery["active"] or subquery["last_page_state"] != "done":
+        return False
+    return subquery["last_page_count"] > 0 and \
+        subquery["last_page_count"] >= full_page_ratio * subquery["max_page_count"]
+
+
+def dedupe_jobs(jobs):
+    """按职位指纹去重，同一职位保留最后一次的结果，顺序按第一次出现"""
+    from recrawl_scheduler import posting_fingerprint
+    merged = {}
+    for job in jobs:
+        merged[posting_fingerprint(job)] = job
+    return list(merged.values())
+
+
+def merge_query_results(frontier, city, keyword):
+    """合并一个查询及其全部子查询的结果并去重"""
+    _, city_code = resolve_city(city)
+    return dedupe_jobs(frontier.query_results(city_code, keyword))
+
+
+class QueryPartitioner:
+    """为任务队列中饱和的查询生成子查询任务"""
+
+    def __init__(self, frontier, dimensions=None, max_depth=2, full_page_ratio=0.9):
+        """
+        Args:
+            frontier: CrawlFrontier
+            dimensions: 拆分维度顺序，默认为 DEFAULT_DIMENSIONS
+            max_depth: 最多叠加的筛选条件个数
+            full_page_ratio: 判断满页的比例
+        """
+        self.frontier = frontier
+        self.dimensions = dimensions or DEFAULT_DIMENSIONS
+        self.max_depth = max_depth
+        self.full_page_ratio = full_page_ratio
+
+    def plan(self):
+        """
+        需要拆分的子查询
+
+        Returns:
+            [{city, keyword, filters, pages, priority, dimension, children}, ...]
+        """
+        subqueries = self.frontier.subqueries()
+        existing = {(item["city_code"], item["keyword"], item["filters"]) for item in subqueries}
+
+        plan = []
+        for item in subqueries:
+            if not is_saturated(item, self.full_page_ratio):
+                continue
+            filters = decode_filters(item["filters"])
+            if len(filters) >= self.max_depth:
+                continue
+            dimension, children = split_filters(item["city"], filters, self.dimensions)
+            # 已经拆分过的查询不再重复拆分
+            children = [
+                child for child in children
+                if (item["city_code"], item["keyword"], encode_filters(child)) not in existing
+            ]
+            if not children:
+                continue
+            plan.append({
+                "city": item["city"],
+                "keyword": item["keyword"],
+                "filters": item["filters"],
+                "pages": item["last_page"],
+                # 任务优先级为 基础优先级*100-页码，子查询沿用基础优先级
+                "priority": (item["priority"] + 1) // 100,
+                "dimension": dimension,
+                "children": children
+            })
+        return plan
+
+    def expand(self):
+        """
+        为饱和的查询添加子查询任务
+
+        Returns:
+            拆分计划（同plan），每项增加 tasks 表示新增的任务数
+        """
+        plan = self.plan()
+        for item in plan:
+            added = 0
+            for child in item["children"]:
+                for page in range(1, item["pages"] + 1):
+                    if self.frontier.add_task(item["city"], item["keyword"], page,
+                                              item["priority"] * 100 - page, filters=child):
+                        added += 1
+            item["tasks"] = added
+        return plan
+
+
+def print_plan(plan, expanded=False):
+    """打印拆分计划"""
+    if not plan:
+        print("没有需要拆分的饱和查询")
+        return
+    for item in plan:
+        filters = f"[{item['filters']}]" if item["filters"] else ""
+        tasks = f"，新增 {item['tasks']} 个任务" if expanded else ""
+        print(f"  {item['city']} / {item['keyword']}{filters}: 按{item['dimension']}拆分为 "
+              f"{len(item['children'])} 个子查询，每个 {item['pages']} 页{tasks}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='拆分饱和的搜索查询')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH, help=f'任务数据库路径，默认为{DEFAULT_DB_PATH}')
+    parser.add_argument('--dimensions', type=str, default=','.join(DEFAULT_DIMENSIONS),
+                        help=f'逗号分隔的拆分维度顺序，可选: {", ".join(FILTER_DIMENSIONS)}')
+    parser.add_argument('--max-depth', type=int, default=2, help='最多叠加的筛选条件个数，默认为2')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('plan', help='查看拆分计划')
+    subparsers.add_parser('expand', help='为饱和的查询生成子查询任务')
+    merge_parser = subparsers.add_parser('merge', help='合并一个查询的去重结果')
+    merge_parser.add_argument('--city', type=str, required=True, help='城市')
+    merge_parser.add_argument('--keyword', type=str, required=True, help='关键词')
+    merge_parser.add_argument('--output', type=str, default=None, help='输出JSON文件，默认打印到标准输出')
+
+    args = parser.parse_args(argv)
+    dimensions = [d.strip() for d in args.dimensions.split(',') if d.strip()]
+    unknown = [d for d in dimensions if d not in FILTER_DIMENSIONS]
+    if unknown:
+        print(f"未知的拆分维度: {', '.join(unknown)}")
+        return 1
+
+    frontier = CrawlFrontier(args.db)
+    partitioner = QueryPartitioner(frontier, dimensions=dimensions, max_depth=args.max_depth)
+    try:
+        if args.command == 'plan':
+            print_plan(partitioner.plan())
+        elif args.command == 'expand':
+            plan = partitioner.expand()
+            print_plan(plan, expanded=True)
+            print(f"共新增 {sum(item['tasks'] for item in plan)} 个任务")
+        elif args.command == 'merge':
+            raw_count = len(frontier.query_results(resolve_city(args.city)[1], args.keyword))
+            jobs = merge_query_results(frontier, args.city, args.keyword)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(jobs, f, ensure_ascii=False, indent=2)
+                print(f"合并 {raw_count} 条结果，去重后 {len(jobs)} 条，已保存到 {args.output}")
+            else:
+                json.dump(jobs, sys.stdout, ensure_ascii=False, indent=2)
+    finally:
+        frontier.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
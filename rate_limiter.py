@@ -0,0 +1,60 @@
+"""
+请求限速
+
+令牌桶限速器，同一进程内的多个线程共用一个实例时，总请求速率不超过设定值。
+列表页工作进程和详情页补充任务都可以传入同一个限速器。
+"""
+import time
+import threading
+
+
+class RateLimiter:
+    """令牌桶限速器（线程安全）"""
+
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate: 每秒允许的请求数，None或<=0表示不限速
+            burst: 桶容量，允许短时间内连续发出的请求数
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.stats = {"acquired": 0, "waits": 0, "waited_seconds": 0.0}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """取得一个令牌，必要时阻塞等待，返回等待的秒数"""
+        if self.rate is None:
+            with self.lock:
+                self.stats["acquired"] += 1
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["acquired"] += 1
+                    if waited:
+                        self.stats["waits"] += 1
+                        self.stats["waited_seconds"] += waited
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            # 在锁外等待，其他线程可以同时计算各自的等待时间
+            time.sleep(wait)
+            waited += wait
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,493 @@
+"""
+按变化速度自适应安排重爬
+
+热门查询（如 北京/Python）的职位每天都在更替，冷门查询几乎不变，按统一周期重爬会把请求
+浪费在不变的查询上。本模块为每个（城市, 关键词）查询记录每次爬取发现的新增和变化职位数：
+
+    新增  职位指纹（职位ID，没有时用 职位名+公司+地点）第一次出现
+    变化  指纹已存在，但薪资、职位要求等内容变化，或发布时间向后移动（职位被刷新）
+
+假设职位按泊松过程变化，由一次爬取中变化职位的比例 p 和距上次爬取的时间 t 估计变化率
+λ = -ln(1 - p) / t，并用指数加权平均平滑。下一次爬取安排在预计有 target_change 比例的
+职位发生变化的时刻：interval = -ln(1 - target_change) / λ，限制在[最短间隔, 最长间隔]之间。
+设置每日请求预算时，所有查询的间隔按比例放大，使预计每日请求页数不超过预算。
+
+与 crawl_frontier.py 共用同一个数据库：
+
+    # 汇总任务队列中已完成的查询，更新变化率
+    python recrawl_scheduler.py sync
+    # 查看每个查询的变化率和预计下次爬取时间
+    python recrawl_scheduler.py plan --budget 500
+    # 将到期的查询重新放入任务队列（包含sync）
+    python recrawl_scheduler.py enqueue --budget 500
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import hashlib
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+
+from city_codes import resolve_city
+from crawl_frontier import DEFAULT_DB_PATH, CrawlFrontier, format_timestamp
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_schedule (
+    city TEXT NOT NULL,
+    city_code TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    crawls INTEGER NOT NULL DEFAULT 0,
+    last_crawl_at REAL,
+    change_rate REAL,
+    interval_seconds REAL NOT NULL,
+    last_total INTEGER,
+    last_new INTEGER,
+    last_changed INTEGER,
+    PRIMARY KEY (city_code, keyword)
+);
+CREATE TABLE IF NOT EXISTS query_crawls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    city_code TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    new INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    elapsed_hours REAL,
+    observed_rate REAL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    city_code TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    publish_at REAL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (city_code, keyword, fingerprint)
+);
+"""
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# 职位详情链接中的职位ID
+JOB_ID_PATTERN = re.compile(r"/job_detail/([^/?#.]+)")
+
+
+def _first(job, *fields):
+    """两种爬虫的字段名不同（job_name/title 等），取第一个非空值"""
+    for field in fields:
+        value = job.get(field)
+        if value not in (None, "", "未知"):
+            return value
+    return ""
+
+
+def posting_fingerprint(job):
+    """职位指纹：优先使用职位ID，没有时用职位名+公司+地点"""
+    job_id = job.get("job_id")
+    if not job_id:
+        match = JOB_ID_PATTERN.search(job.get("detail_link") or "")
+        job_id = match.group(1) if match else None
+    if job_id:
+        return f"id:{job_id}"
+
+    key = "|".join(str(_first(job, *fields)) for fields in (
+        ("job_name", "title"), ("company_name", "company"), ("job_area", "location")
+    ))
+    return "h:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def content_hash(job):
+    """职位内容摘要：内容变化（调薪、修改要求等）时改变"""
+    content = [
+        _first(job, "job_name", "title"),
+        _first(job, "salary"),
+        _first(job, "job_requirements", "experience"),
+        _first(job, "hr_name"),
+    ]
+    return hashlib.sha1(json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def parse_publish_time(text, reference):
+    """
+    将页面上的发布时间换算为时间戳
+
+    支持：刚刚、N分钟前、N小时前、今天、昨天、N天前、MM月DD日、YYYY-MM-DD、MM-DD。
+    无法识别时返回None。
+
+    Args:
+        text: 发布时间文本
+        reference: 爬取时的时间戳，相对时间以此为准
+    """
+    if not text or text == "未知":
+        return None
+    text = str(text).strip()
+    ref = datetime.fromtimestamp(reference)
+    today = ref.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if "刚刚" in text:
+        return reference
+    match = re.search(r"(\d+)\s*分钟前", text)
+    if match:
+        return reference - int(match.group(1)) * 60
+    match = re.search(r"(\d+)\s*小时前", text)
+    if match:
+        return reference - int(match.group(1)) * HOUR
+    if "今天" in text:
+        return today.timestamp()
+    if "昨天" in text:
+        return (today - timedelta(days=1)).timestamp()
+    match = re.search(r"(\d+)\s*天前", text)
+    if match:
+        return (today - timedelta(days=int(match.group(1)))).timestamp()
+    match = re.search(r"(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})", text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+    else:
+        match = re.search(r"(\d{1,2})[-/月](\d{1,2})", text)
+        if not match:
+            return None
+        year = ref.year
+        month, day = (int(part) for part in match.groups())
+    try:
+        published = datetime(year, month, day)
+    except ValueError:
+        return None
+    # 只有月日的日期在未来时视为去年
+    if published > ref:
+        published = published.replace(year=published.year - 1)
+    return published.timestamp()
+
+
+class RecrawlScheduler:
+    """按查询的变化率安排重爬时间"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, target_change=0.1, min_interval=6 * HOUR,
+                 max_interval=14 * DAY, initial_interval=DAY, smoothing=0.3, budget_pages_per_day=None):
+        """
+        Args:
+            db_path: 数据库文件路径，与任务队列共用
+            target_change: 预计有这一比例的职位变化时重爬
+            min_interval: 最短重爬间隔（秒）
+            max_interval: 最长重爬间隔（秒），变化率为0的查询也会按此间隔检查
+            initial_interval: 只爬过一次、还无法估计变化率时的间隔（秒）
+            smoothing: 变化率指数加权平均中新观测的权重
+            budget_pages_per_day: 每日请求页数预算，None表示不限
+        """
+        self.db_path = db_path
+        self.target_change = target_change
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.smoothing = smoothing
+        self.budget_pages_per_day = budget_pages_per_day
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def interval_for(self, change_rate):
+        """由变化率（每小时）计算重爬间隔（秒）"""
+        if change_rate is None:
+            return self.initial_interval
+        if change_rate <= 0:
+            return self.max_interval
+        interval = -math.log(1 - self.target_change) / change_rate * HOUR
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _get_query(self, city_code, keyword):
+        row = self.conn.execute(
+            "SELECT * FROM query_schedule WHERE city_code = ? AND keyword = ?", (city_code, keyword)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def record_crawl(self, city, keyword, jobs, crawled_at=None):
+        """
+        记录一次查询爬取的结果，更新职位指纹和变化率
+
+        Args:
+            city: 城市名称或代码
+            keyword: 搜索关键词
+            jobs: 本次爬取的全部职位
+            crawled_at: 爬取完成时间戳，默认为当前时间
+
+        Returns:
+            本次观测dict：total、new、changed、observed_rate、change_rate、next_crawl_at
+        """
+        city_name, city_code = resolve_city(city)
+        crawled_at = crawled_at or time.time()
+        previous = self._get_query(city_code, keyword)
+
+        seen = {
+            row["fingerprint"]: (row["content_hash"], row["publish_at"])
+            for row in self.conn.execute(
+                "SELECT fingerprint, content_hash, publish_at FROM postings WHERE city_code = ? AND keyword = ?",
+                (city_code, keyword)
+            )
+        }
+
+        new = changed = 0
+        current = {}
+        for job in jobs:
+            fingerprint = posting_fingerprint(job)
+            if fingerprint in current:
+                continue
+            digest = content_hash(job)
+            publish_at = parse_publish_time(job.get("publish_time"), crawled_at)
+            current[fingerprint] = (digest, publish_at)
+
+            if fingerprint not in seen:
+                new += 1
+                continue
+            old_digest, old_publish_at = seen[fingerprint]
+            # 发布时间向后移动超过一天视为职位被刷新（相对时间有按天取整的误差）
+            republished = publish_at and old_publish_at and publish_at - old_publish_at > DAY
+            if digest != old_digest or republished:
+                changed += 1
+
+        total = len(current)
+        observed_rate = None
+        elapsed_hours = None
+        change_rate = previous["change_rate"] if previous else None
+        if previous and previous["last_crawl_at"] and total:
+            elapsed_hours = max((crawled_at - previous["last_crawl_at"]) / HOUR, 1 / 60)
+            fraction = min((new + changed) / total, 0.99)
+            observed_rate = -math.log(1 - fraction) / elapsed_hours if fraction else 0.0
+            if change_rate is None:
+                change_rate = observed_rate
+            else:
+                change_rate = self.smoothing * observed_rate + (1 - self.smoothing) * change_rate
+
+        interval = self.interval_for(change_rate)
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT INTO query_schedule (city, city_code, keyword, crawls, last_crawl_at, change_rate, "
+                "interval_seconds, last_total, last_new, last_changed) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (city_code, keyword) DO UPDATE SET crawls = crawls + 1, "
+                "last_crawl_at = excluded.last_crawl_at, change_rate = excluded.change_rate, "
+                "interval_seconds = excluded.interval_seconds, last_total = excluded.last_total, "
+                "last_new = excluded.last_new, last_changed = excluded.last_changed",
+                (city_name, city_code, keyword, crawled_at, change_rate, interval, total, new, changed)
+            )
+            self.conn.execute(
+                "INSERT INTO query_crawls (city_code, keyword, crawled_at, total, new, changed, "
+                "elapsed_hours, observed_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (city_code, keyword, crawled_at, total, new, changed, elapsed_hours, observed_rate)
+            )
+            self.conn.executemany(
+                "INSERT INTO postings (city_code, keyword, fingerprint, content_hash, publish_at, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (city_code, keyword, fingerprint) DO UPDATE SET "
+                "content_hash = excluded.content_hash, publish_at = COALESCE(excluded.publish_at, publish_at), "
+                "last_seen = excluded.last_seen",
+                [(city_code, keyword, fingerprint, digest, publish_at, crawled_at, crawled_at)
+                 for fingerprint, (digest, publish_at) in current.items()]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return {
+            "city": city_name,
+            "keyword": keyword,
+            "total": total,
+            "new": new,
+            "changed": changed,
+            "observed_rate": observed_rate,
+            "change_rate": change_rate,
+            "next_crawl_at": self.predict_next_crawl(city_code, keyword)
+        }
+
+    def sync_from_frontier(self, frontier):
+        """
+        汇总任务队列中所有页都已结束、且在上次记录之后完成的查询
+
+        Returns:
+            本次记录的观测列表
+        """
+        observations = []
+        for query in frontier.finished_queries():
+            previous = self._get_query(query["city_code"], query["keyword"])
+            since = previous["last_crawl_at"] if previous and previous["last_crawl_at"] else 0
+            if query["finished_at"] <= since:
+                continue
+            jobs = frontier.query_results(query["city_code"], query["keyword"], since)
+            if not jobs:
+                # 全部失败或没有结果，不作为一次观测
+                continue
+            observations.append(self.record_crawl(query["city_code"], query["keyword"], jobs, query["finished_at"]))
+        return observations
+
+    def budget_scale(self, pages_per_crawl):
+        """
+        为满足每日预算，所有间隔需要放大的倍数（不小于1）
+
+        Args:
+            pages_per_crawl: {(city_code, keyword): 每次爬取的页数}
+        """
+        if not self.budget_pages_per_day:
+            return 1.0
+        demand = 0.0
+        for row in self.conn.execute("SELECT city_code, keyword, interval_seconds FROM query_schedule"):
+            pages = pages_per_crawl.get((row["city_code"], row["keyword"]), 1)
+            demand += pages * DAY / row["interval_seconds"]
+        return max(demand / self.budget_pages_per_day, 1.0)
+
+    def plan(self, pages_per_crawl=None, now=None):
+        """
+        所有查询的重爬计划，按预计下次爬取时间排序
+
+        Args:
+            pages_per_crawl: {(city_code, keyword): 每次爬取的页数}，用于预算换算，默认每次1页
+            now: 当前时间戳
+
+        Returns:
+            [{city, city_code, keyword, crawls, change_rate_per_day, interval_hours, last_crawl_at,
+              next_crawl_at, due}, ...]
+        """
+        now = now or time.time()
+        scale = self.budget_scale(pages_per_crawl or {})
+        plan = []
+        for row in self.conn.execute("SELECT * FROM query_schedule"):
+            interval = row["interval_seconds"] * scale
+            next_crawl_at = (row["last_crawl_at"] or 0) + interval
+            plan.append({
+                "city": row["city"],
+                "city_code": row["city_code"],
+                "keyword": row["keyword"],
+                "crawls": row["crawls"],
+                "change_rate_per_day": None if row["change_rate"] is None else row["change_rate"] * 24,
+                "interval_hours": interval / HOUR,
+                "last_crawl_at": row["last_crawl_at"],
+                "next_crawl_at": next_crawl_at,
+                "due": next_crawl_at <= now
+            })
+        plan.sort(key=lambda item: item["next_crawl_at"])
+        return plan
+
+    def predict_next_crawl(self, city, keyword, pages_per_crawl=None):
+        """
+        查询的预计下次爬取时间戳
+
+        从未记录过的查询返回None（应立即爬取）。
+        """
+        city_name, city_code = resolve_city(city)
+        for item in self.plan(pages_per_crawl):
+            if item["city_code"] == city_code and item["keyword"] == keyword:
+                return item["next_crawl_at"]
+        return None
+
+    def enqueue_due(self, frontier, pages=None, now=None):
+        """
+        将到期的查询重新放入任务队列
+
+        变化率越高的查询优先级越高。
+
+        Args:
+            frontier: CrawlFrontier
+            pages: 每个查询爬取的页数，默认沿用任务队列中该查询的页数
+
+        Returns:
+            [(城市, 关键词, 重新排队的页数), ...]
+        """
+        pages_per_crawl = {
+            (query["city_code"], query["keyword"]): pages or query["pages"]
+            for query in frontier.finished_queries()
+        }
+        queued = []
+        for item in self.plan(pages_per_crawl, now):
+            key = (item["city_code"], item["keyword"])
+            # 仍在执行中的查询不在 finished_queries 中，跳过
+            if not item["due"] or key not in pages_per_crawl:
+                continue
+            rate_per_day = item["change_rate_per_day"] or 0
+            priority = min(int(rate_per_day * 10), 99)
+            count = frontier.requeue_query(item["city_code"], item["keyword"], pages_per_crawl[key], priority)
+            queued.append((item["city"], item["keyword"], count))
+        return queued
+
+
+def print_plan(plan):
+    """打印重爬计划"""
+    print("\n===== 重爬计划 =====")
+    if not plan:
+        print("暂无记录，请先完成一轮爬取并执行 sync")
+        return
+    print("城市 / 关键词 / 爬取次数 / 日变化率 / 间隔(小时) / 上次爬取 / 预计下次爬取")
+    for item in plan:
+        rate = "未知" if item["change_rate_per_day"] is None else f"{item['change_rate_per_day']:.3f}"
+        due = "（已到期）" if item["due"] else ""
+        print(f"  {item['city']} / {item['keyword']} / {item['crawls']} / {rate} / {item['interval_hours']:.1f} / "
+              f"{format_timestamp(item['last_crawl_at'])} / {format_timestamp(item['next_crawl_at'])}{due}")
+
+
+def print_observations(observations):
+    for item in observations:
+        rate = "未知" if item["change_rate"] is None else f"{item['change_rate'] * 24:.3f}/天"
+        print(f"  {item['city']} / {item['keyword']}: {item['total']} 个职位，新增 {item['new']}，"
+              f"变化 {item['changed']}，变化率 {rate}，下次爬取 {format_timestamp(item['next_crawl_at'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按变化速度自适应安排重爬')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH, help=f'任务数据库路径，默认为{DEFAULT_DB_PATH}')
+    parser.add_argument('--budget', type=float, default=None, help='每日请求页数预算')
+    parser.add_argument('--target-change', type=float, default=0.1, help='预计有这一比例的职位变化时重爬，默认为0.1')
+    parser.add_argument('--min-interval-hours', type=float, default=6, help='最短重爬间隔（小时），默认为6')
+    parser.add_argument('--max-interval-hours', type=float, default=14 * 24, help='最长重爬间隔（小时），默认为336')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('sync', help='汇总任务队列中已完成的查询')
+    subparsers.add_parser('plan', help='查看重爬计划')
+    enqueue_parser = subparsers.add_parser('enqueue', help='将到期的查询重新放入任务队列')
+    enqueue_parser.add_argument('--pages', type=int, default=None, help='每个查询爬取的页数，默认沿用原任务')
+
+    args = parser.parse_args(argv)
+    scheduler = RecrawlScheduler(
+        args.db, target_change=args.target_change,
+        min_interval=args.min_interval_hours * HOUR, max_interval=args.max_interval_hours * HOUR,
+        budget_pages_per_day=args.budget
+    )
+    frontier = CrawlFrontier(args.db)
+
+    try:
+        observations = scheduler.sync_from_frontier(frontier)
+        if observations:
+            print(f"记录了 {len(observations)} 个查询的爬取结果:")
+            print_observations(observations)
+
+        pages_per_crawl = {
+            (query["city_code"], query["keyword"]): query["pages"] for query in frontier.finished_queries()
+        }
+        if args.command == 'plan':
+            print_plan(scheduler.plan(pages_per_crawl))
+        elif args.command == 'enqueue':
+            queued = scheduler.enqueue_due(frontier, pages=args.pages)
+            for city, keyword, count in queued:
+                print(f"  重新排队: {city} / {keyword}，{count} 页")
+            print(f"共 {len(queued)} 个查询到期")
+    finally:
+        frontier.close()
+        scheduler.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+职位要求标签拆分
+
+职位卡片上的要求标签（job_requirements）混合了经验、学历和技能：
+
+    ["1-3年", "本科", "Python", "SQL", "Tableau"]
+
+decompose_requirements 将整列标签展开（explode）一次，在去重后的标签上用正则向量化分类，
+再按编码映射回每个标签，得到每个职位的经验、学历，以及一张 (job_index, skill) 的技能长表：
+
+    requirements = decompose_requirements(df["job_requirements"])
+    df["experience"] = requirements.experience
+    skills_df = requirements.skills
+    skills_df["skill"].value_counts().head(20)
+
+技能长表的 job_index 对应主表的索引，按城市、薪资等统计技能时与主表 join 后 groupby 即可。
+分类规则修改后需要增加 REQUIREMENTS_PARSER_VERSION，使缓存的处理结果失效。
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+REQUIREMENTS_PARSER_VERSION = 1
+
+EXPERIENCE = "experience"
+EDUCATION = "education"
+SKILL = "skill"
+
+# 经验标签：1-3年、10年以上、1年以内、经验不限、在校/应届
+EXPERIENCE_PATTERN = re.compile(r"\d+\s*-\s*\d+\s*年|\d+\s*年以[上内]|经验不限|在校|应届")
+# 学历标签
+EDUCATION_PATTERN = re.compile(r"初中|高中|中专|中技|大专|本科|硕士|博士|学历不限")
+
+Requirements = namedtuple("Requirements", ["experience", "education", "skills"])
+
+
+def classify_tags(tags):
+    """
+    对标签分类
+
+    Args:
+        tags: 标签Series（不重复时最快）
+
+    Returns:
+        与输入同索引的分类Series：experience、education 或 skill
+    """
+    tags = tags.astype(str)
+    category = np.select(
+        [tags.str.contains(EXPERIENCE_PATTERN), tags.str.contains(EDUCATION_PATTERN)],
+        [EXPERIENCE, EDUCATION],
+        default=SKILL
+    )
+    return pd.Series(category, index=tags.index, dtype=object)
+
+
+def _explode_codes(requirements):
+    """
+    将要求标签列展开并编码
+
+    Returns:
+        (positions, codes, tags, categories)：每个展开标签所属职位的行号和标签编码，
+        以及去重后的标签和对应分类（均为numpy数组）
+    """
+    # 从Parquet读回的列表为numpy数组
+    is_list = requirements.map(lambda value: isinstance(value, (list, np.ndarray))).to_numpy(dtype=bool)
+    lists = pd.Series(requirements.to_numpy(dtype=object)[is_list], index=np.flatnonzero(is_list), dtype=object)
+    exploded = lists.explode()
+
+    # 标签种类远少于标签总数，去空白和分类都只在去重后的标签上做；缺失值的编码为-1
+    codes, uniques = pd.factorize(exploded.to_numpy(dtype=object))
+    stripped = pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str).str.strip()
+    # 去空白后可能出现重复（"Python " 和 "Python"），再编码一次合并
+    stripped_codes, tags = pd.factorize(stripped.to_numpy(dtype=object))
+    tags = np.asarray(tags, dtype=object)
+
+    keep = codes >= 0
+    positions = exploded.index.to_numpy(dtype=np.int64)[keep]
+    codes = stripped_codes[codes[keep]]
+    non_empty = tags[codes] != ""
+    categories = classify_tags(pd.Series(tags, dtype=object)).to_numpy()
+    return positions[non_empty], codes[non_empty], tags, categories
+
+
+def explode_requirements(requirements):
+    """
+    将要求标签列展开为长表
+
+    Args:
+        requirements: 每个元素为标签列表（或数组）的Series，其他元素（缺失值等）忽略
+
+    Returns:
+        DataFrame(job_index, tag, category)，保持每个职位内标签的原始顺序
+    """
+    positions, codes, tags, categories = _explode_codes(requirements)
+    return pd.DataFrame({
+        "job_index": requirements.index[positions],
+        "tag": tags[codes],
+        "category": categories[codes]
+    })
+
+
+def decompose_requirements(requirements):
+    """
+    拆分职位要求标签
+
+    Args:
+        requirements: job_requirements 列
+
+    Returns:
+        Requirements(experience, education, skills)：
+        experience、education 为与输入同索引的字符串Series（没有对应标签时为空字符串，
+        有多个时取最后一个）；skills 为 DataFrame(job_index, skill)，同一职位的重复技能只保留一次
+    """
+    positions, codes, tags, categories = _explode_codes(requirements)
+    # 分组、去重都在整数（行号、标签编码）上进行，最后再取回标签文本和索引
+    tag_category = categories[codes]
+
+    def last_tag(category):
+        selected = tag_category == category
+        values = np.full(len(requirements), "", dtype=object)
+        # 同一职位有多个时后写入的覆盖先写入的，即取最后一个
+        values[positions[selected]] = tags[codes[selected]]
+        return pd.Series(values, index=requirements.index, name=category)
+
+    selected = tag_category == SKILL
+    skill_positions, skill_codes = positions[selected], codes[selected]
+    duplicated = pd.Series(skill_positions * len(tags) + skill_codes).duplicated().to_numpy()
+    skills = pd.DataFrame({
+        "job_index": requirements.index[skill_positions[~duplicated]],
+        "skill": tags[skill_codes[~duplicated]]
+    })
+    return Requirements(last_tag(EXPERIENCE), last_tag(EDUCATION), skills)
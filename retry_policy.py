@@ -0,0 +1,248 @@
+"""
+重试策略和熔断器
+
+页面抓取失败时按统一的规则处理：
+
+- RetryPolicy：有上限的重试次数，指数退避加随机抖动；按异常类型区分可重试（超时、连接错误、
+  429/5xx、页面未加载完成）和不可重试（403/404等、解析代码错误），不可重试的错误立即抛出
+- CircuitBreaker：同一查询连续失败达到阈值时暂停该查询，所有查询合计连续失败达到阈值时
+  暂停整个爬虫，冷却时间过后放行一次试探请求（半开），试探请求有结果之前拒绝其他请求，
+  成功则恢复，失败则重新计时
+
+    policy = RetryPolicy(max_attempts=3, base_delay=2)
+    breaker = CircuitBreaker(failure_threshold=3, global_threshold=8, cooldown=300)
+
+    if breaker.allow(query):
+        try:
+            jobs = policy.call(fetch_page, page)
+            breaker.record_success(query)
+        except Exception:
+            breaker.record_failure(query)
+"""
+import time
+import random
+import threading
+
+import requests
+
+# selenium为可选依赖，只有浏览器爬虫需要
+try:
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    USE_SELENIUM = True
+except ImportError:
+    USE_SELENIUM = False
+
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+# 可以重试的HTTP状态码：请求超时、限流和服务器错误
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class PageNotReadyError(Exception):
+    """页面上没有找到职位列表（未加载完成、跳转到验证页等），重新加载后可能成功"""
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，请求被拒绝"""
+
+    def __init__(self, key, retry_after):
+        self.key = key
+        self.retry_after = retry_after
+        scope = "全局" if key is None else f"查询 {key}"
+        super().__init__(f"{scope} 连续失败过多，已暂停，{retry_after:.0f} 秒后重试")
+
+
+def classify_error(error):
+    """
+    判断异常是否值得重试
+
+    Returns:
+        RETRYABLE 或 FATAL
+    """
+    if isinstance(error, (PageNotReadyError, TimeoutError, ConnectionError)):
+        return RETRYABLE
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return RETRYABLE if status is None or status in RETRYABLE_STATUS_CODES else FATAL
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return RETRYABLE
+    if USE_SELENIUM and isinstance(error, (TimeoutException, WebDriverException)):
+        return RETRYABLE
+    if isinstance(error, CircuitOpenError):
+        return RETRYABLE
+    # 其余（解析代码错误、参数错误等）重试也不会成功
+    return FATAL
+
+
+def is_retryable(error):
+    return classify_error(error) == RETRYABLE
+
+
+class RetryPolicy:
+    """有上限的指数退避重试"""
+
+    def __init__(self, max_attempts=3, base_delay=2, max_delay=60, jitter=0.5,
+                 classifier=classify_error, sleep=time.sleep):
+        """
+        Args:
+            max_attempts: 最多尝试次数（包括第一次）
+            base_delay: 第一次重试前的等待秒数，之后每次翻倍
+            max_delay: 单次等待的上限（秒）
+            jitter: 随机抖动比例，实际等待为 delay * uniform(1-jitter, 1)
+            classifier: 异常分类函数，返回 RETRYABLE 或 FATAL
+            sleep: 等待函数
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.classifier = classifier
+        self.sleep = sleep
+
+    def delay(self, attempt):
+        """第attempt次失败后的等待秒数"""
+        delay = min(self.base_delay * (2 ** max(attempt - 1, 0)), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1.0)
+
+    def call(self, func, *args, on_retry=None, **kwargs):
+        """
+        执行函数，可重试的异常按退避时间重试
+
+        Args:
+            func: 要执行的函数
+            on_retry: 每次重试前调用 on_retry(attempt, error, delay)，可用于记录日志或重置页面状态
+
+        Returns:
+            函数返回值；不可重试的异常或尝试次数用完时抛出最后一次的异常
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or self.classifier(e) != RETRYABLE:
+                    raise
+                delay = self.delay(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                self.sleep(delay)
+
+
+class CircuitBreaker:
+    """按查询和全局统计连续失败次数的熔断器（线程安全）"""
+
+    def __init__(self, failure_threshold=3, global_threshold=8, cooldown=300, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold: 同一查询连续失败多少次后暂停该查询，None表示不按查询熔断
+            global_threshold: 所有查询合计连续失败多少次后暂停全部请求，None表示不做全局熔断
+            cooldown: 暂停时长（秒），之后放行一次试探请求；试探请求超过该时长仍未记录结果时视为丢失，
+                再放行一次
+            clock: 时钟函数
+        """
+        self.failure_threshold = failure_threshold
+        self.global_threshold = global_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.failures = {}
+        self.opened_at = {}
+        # 熔断范围 -> 半开状态下试探请求的放行时间
+        self.probing = {}
+        self.stats = {"failures": 0, "successes": 0, "opened": 0, "rejected": 0, "probes": 0}
+
+    def _threshold(self, key):
+        return self.global_threshold if key is None else self.failure_threshold
+
+    def _retry_after(self, key, now):
+        opened_at = self.opened_at.get(key)
+        if opened_at is None:
+            return 0.0
+        wait = opened_at + self.cooldown - now
+        if wait <= 0 and key in self.probing:
+            # 半开：试探请求还没有结果时继续等待，最多等待一个冷却时长
+            wait = self.probing[key] + self.cooldown - now
+        return max(wait, 0.0)
+
+    def _wait(self, key, now):
+        wait = self._retry_after(None, now)
+        if key is not None:
+            wait = max(wait, self._retry_after(key, now))
+        return wait
+
+    def _acquire(self, key):
+        """
+        申请一次请求
+
+        Returns:
+            还需暂停的秒数；为0时放行，处于冷却结束状态的熔断范围把本次请求记为试探请求
+        """
+        with self.lock:
+            now = self.clock()
+            wait = self._wait(key, now)
+            if wait > 0:
+                self.stats["rejected"] += 1
+                return wait
+            for scope in {key, None}:
+                if scope in self.opened_at:
+                    self.probing[scope] = now
+                    self.stats["probes"] += 1
+            return 0.0
+
+    def retry_after(self, key=None):
+        """查询（key为None时为全局）还需暂停的秒数，0表示可以请求"""
+        with self.lock:
+            return self._wait(key, self.clock())
+
+    def allow(self, key=None):
+        """
+        是否允许请求；冷却结束后只放行一个试探请求，在它记录成功或失败之前拒绝其他请求
+
+        放行的请求之后必须调用 record_success 或 record_failure
+        """
+        return self._acquire(key) == 0
+
+    def check(self, key=None):
+        """不允许请求时抛出 CircuitOpenError，放行规则与 allow 相同"""
+        wait = self._acquire(key)
+        if wait > 0:
+            raise CircuitOpenError(key, wait)
+
+    def is_open(self, key=None):
+        with self.lock:
+            return key in self.opened_at
+
+    def record_success(self, key=None):
+        with self.lock:
+            self.stats["successes"] += 1
+            for scope in {key, None}:
+                self.failures[scope] = 0
+                self.opened_at.pop(scope, None)
+                self.probing.pop(scope, None)
+
+    def record_failure(self, key=None):
+        """
+        记录一次失败
+
+        Returns:
+            本次失败后新打开的熔断范围列表（查询key和/或None表示全局）
+        """
+        opened = []
+        with self.lock:
+            self.stats["failures"] += 1
+            now = self.clock()
+            for scope in {key, None}:
+                self.probing.pop(scope, None)
+                threshold = self._threshold(scope)
+                if threshold is None:
+                    continue
+                self.failures[scope] = self.failures.get(scope, 0) + 1
+                # 试探请求失败时重新计时
+                if self.failures[scope] >= threshold and self._retry_after(scope, now) == 0:
+                    if scope not in self.opened_at:
+                        self.stats["opened"] += 1
+                        opened.append(scope)
+                    self.opened_at[scope] = now
+        return opened
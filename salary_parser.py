@@ -0,0 +1,127 @@
+"""
+薪资字符串解析
+
+网站上的薪资有以下几种写法：
+
+    15-25K          月薪（千元）
+    15-25K·13薪     月薪 + 年终月数
+    1-1.5万         月薪（万元）
+    8千-1.2万       上下限单位不同，各自换算
+    200-300元/天    日薪（实习、兼职）
+    50-80元/时      时薪
+    面议
+
+parse_salaries 对一整列薪资字符串做向量化解析：先对去重后的字符串用预编译的正则
+（Series.str.extract）提取数值和单位，再按编码映射回每一行，百万行数据中通常只有几千种写法。
+输出的金额统一换算为月薪（K），日薪按每月21.75个工作日、时薪按每天8小时换算：
+
+    salary_df = parse_salaries(df["salary"])
+    df[salary_df.columns] = salary_df
+
+解析规则修改后需要增加 SALARY_PARSER_VERSION，使缓存的处理结果失效。
+"""
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+SALARY_PARSER_VERSION = 2
+
+WORK_DAYS_PER_MONTH = 21.75
+WORK_HOURS_PER_DAY = 8
+WEEKS_PER_MONTH = 52 / 12
+DEFAULT_MONTHS = 12
+
+NEGOTIABLE = "面议"
+
+# 数值范围（上限可省略）和单位；下限可以有自己的单位（8千-1.2万），没有时与上限相同；“·13薪”单独匹配
+SALARY_PATTERN = re.compile(
+    r"(?P<low>\d+(?:\.\d+)?)\s*(?P<low_unit>[KkWw千万])?\s*(?:[-~～至]\s*(?P<high>\d+(?:\.\d+)?))?\s*"
+    r"(?P<unit>[KkWw千万]|元\s*/\s*(?:月|周|天|日|小时|时))"
+)
+MONTHS_PATTERN = re.compile(r"(\d+)\s*薪")
+
+# 单位 -> (规范写法, 换算为月薪K的系数)
+UNIT_FACTORS = {
+    "K": ("K", 1.0),
+    "k": ("K", 1.0),
+    "千": ("K", 1.0),
+    "W": ("W", 10.0),
+    "w": ("W", 10.0),
+    "万": ("W", 10.0),
+    "元/月": ("元/月", 0.001),
+    "元/周": ("元/周", WEEKS_PER_MONTH / 1000),
+    "元/天": ("元/天", WORK_DAYS_PER_MONTH / 1000),
+    "元/日": ("元/天", WORK_DAYS_PER_MONTH / 1000),
+    "元/时": ("元/时", WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH / 1000),
+    "元/小时": ("元/时", WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH / 1000),
+}
+
+# 输出列：金额为月薪（K），未识别和面议的为NaN
+SALARY_COLUMNS = ["salary_min", "salary_max", "salary_avg", "salary_unit", "salary_months", "salary_annual"]
+
+
+def _parse_unique(salaries):
+    """解析去重后的薪资字符串（Series，默认整数索引）"""
+    parts = salaries.str.extract(SALARY_PATTERN)
+    raw_unit = parts["unit"].str.replace(r"\s+", "", regex=True)
+    factors = {unit: factor for unit, (_, factor) in UNIT_FACTORS.items()}
+    factor = raw_unit.map(factors).astype("float64")
+    # 上下限单位不同时分别换算
+    low_factor = parts["low_unit"].map(factors).astype("float64").fillna(factor)
+
+    low = pd.to_numeric(parts["low"], errors="coerce")
+    high = pd.to_numeric(parts["high"], errors="coerce")
+    salary_min = low * low_factor
+    # 没有上限时与下限相同
+    salary_max = (high * factor).fillna(salary_min)
+
+    unit = raw_unit.map({unit: name for unit, (name, _) in UNIT_FACTORS.items()})
+    unit = unit.where(unit.notna(), np.where(salaries.str.contains(NEGOTIABLE, regex=False), NEGOTIABLE, ""))
+
+    months = pd.to_numeric(salaries.str.extract(MONTHS_PATTERN)[0], errors="coerce")
+    months = months.fillna(DEFAULT_MONTHS).astype("int64")
+
+    salary_avg = (salary_min + salary_max) / 2
+    return pd.DataFrame({
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_avg": salary_avg,
+        "salary_unit": unit.astype(object),
+        "salary_months": months,
+        # 年薪（K）：月薪 × 薪资月数
+        "salary_annual": salary_avg * months
+    })
+
+
+def parse_salaries(salaries):
+    """
+    向量化解析薪资列
+
+    Args:
+        salaries: 薪资字符串Series（可含None/NaN）
+
+    Returns:
+        与输入同索引的DataFrame，列见 SALARY_COLUMNS：
+        salary_min/max/avg 为月薪（K），salary_unit 为原始单位（K、W、元/天、元/时、元/月、元/周、面议，
+        未识别为空字符串），salary_months 为薪资月数（默认12），salary_annual 为年薪（K）
+    """
+    strings = salaries.astype(object).where(salaries.notna(), "").astype(str)
+    codes, uniques = pd.factorize(strings)
+    if len(uniques) == 0:
+        return pd.DataFrame({column: pd.Series(dtype="float64") for column in SALARY_COLUMNS}, index=salaries.index)
+    parsed = _parse_unique(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    result = parsed.iloc[codes]
+    result.index = salaries.index
+    return result
+
+
+def parse_salary(salary_str):
+    """解析单个薪资字符串，返回 SALARY_COLUMNS 各项的dict"""
+    return parse_salaries(pd.Series([salary_str])).iloc[0].to_dict()
+
+
+if __name__ == "__main__":
+    samples = sys.argv[1:] or ["15-25K", "15-25K·13薪", "1-1.5万", "200-300元/天", "50-80元/时", "面议"]
+    print(pd.concat([pd.Series(samples, name="salary"), parse_salaries(pd.Series(samples))], axis=1).to_string())
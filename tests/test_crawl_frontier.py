@@ -0,0 +1,98 @@
+"""
+任务队列工作循环（crawl_frontier.run_worker）的测试，使用临时SQLite数据库：
+
+    python -m pytest tests
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_frontier import CrawlFrontier, run_worker
+from retry_policy import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BlockingFetcher:
+    """第一次抓取阻塞到 release 被设置"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def fetch(self, task):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            self.started.set()
+            self.release.wait(5)
+        return [{"job_name": f"职位{task['page']}"}]
+
+
+class RunWorkerBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "frontier.db")
+        frontier = CrawlFrontier(self.db_path)
+        frontier.seed(["北京"], ["python"], 4)
+        frontier.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_single_probe_after_cooldown(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=None, global_threshold=1, cooldown=60, clock=clock)
+        breaker.record_failure()
+        clock.now += 60
+        fetcher = BlockingFetcher()
+        results = []
+
+        def work(index):
+            frontier = CrawlFrontier(self.db_path)
+            try:
+                results.append(run_worker(frontier, fetcher, worker_id=f"w{index}", wait=False,
+                                          poll_interval=0.01, delay=None, breaker=breaker))
+            finally:
+                frontier.close()
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(fetcher.started.wait(5))
+        # 试探任务进行中：另一个线程不抓取，归还领取的任务
+        threading.Event().wait(0.3)
+        self.assertEqual(fetcher.calls, 1)
+        self.assertEqual(breaker.stats["probes"], 1)
+
+        fetcher.release.set()
+        for thread in threads:
+            thread.join(10)
+        self.assertFalse(breaker.is_open())
+        # 试探成功后其余任务全部完成，被归还的任务不计入尝试次数
+        self.assertEqual(sum(stats["completed"] for stats in results), 4)
+        frontier = CrawlFrontier(self.db_path)
+        try:
+            self.assertEqual(frontier.counts()["done"], 4)
+            attempts = [row["attempts"] for row in frontier.conn.execute("SELECT attempts FROM tasks")]
+            self.assertEqual(attempts, [1, 1, 1, 1])
+        finally:
+            frontier.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+用模拟服务生成的语料（mock_zhipin_server --dump）回放提取规则，逐字段与golden比较：
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_benchmark import OFFLINE_STRATEGIES, load_corpus, run_strategy, score_accuracy
+from mock_zhipin_server import ListingGenerator, dump_corpus
+from zhipin_card_parser import USE_LXML, split_hr_info
+
+
+@unittest.skipUnless(USE_LXML, "离线回放需要安装lxml和cssselect")
+class MockCorpusReplayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus_dir = tempfile.mkdtemp()
+        dump_corpus(ListingGenerator(seed=7), cls.corpus_dir, ["Python", "数据分析"], "101010100", 3)
+        with open(os.path.join(cls.corpus_dir, "golden.json"), "r", encoding="utf-8") as f:
+            cls.golden = json.load(f)
+        cls.corpus = load_corpus(cls.corpus_dir, "page_*.html")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.corpus_dir, ignore_errors=True)
+
+    def test_card_parser_matches_golden(self):
+        _, results = run_strategy("lxml", self.corpus)
+        accuracy = score_accuracy(results, self.golden)
+        self.assertEqual(accuracy["card_recall"], 1.0)
+        for field, value in accuracy["fields"].items():
+            with self.subTest(field=field):
+                self.assertEqual(value, 1.0)
+
+    def test_static_strategies_match_golden(self):
+        # 静态页面解析不提取HR和职位要求，只比较其输出的字段，且各策略的卡片数相同
+        for name in OFFLINE_STRATEGIES:
+            with self.subTest(strategy=name):
+                stats, results = run_strategy(name, self.corpus)
+                self.assertEqual(stats["cards"], sum(len(records) for records in self.golden.values()))
+                accuracy = score_accuracy(results, self.golden)
+                self.assertIn("job_name", accuracy["fields"])
+                self.assertEqual(set(accuracy["fields"].values()), {1.0})
+
+
+class SplitHrInfoTest(unittest.TestCase):
+    def test_title_in_em(self):
+        self.assertEqual(split_hr_info("陈女士HRBP", "HRBP"), ("陈女士", "HRBP"))
+        self.assertEqual(split_hr_info("陈女士 HRBP", "HRBP"), ("陈女士", "HRBP"))
+
+    def test_separators(self):
+        self.assertEqual(split_hr_info("陈女士·HRBP"), ("陈女士", "HRBP"))
+        self.assertEqual(split_hr_info("陈女士 HRBP"), ("陈女士", "HRBP"))
+        self.assertEqual(split_hr_info("陈女士"), ("陈女士", "未知"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+熔断器（retry_policy.CircuitBreaker）的测试，使用可控的时钟：
+
+    python -m pytest tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retry_policy import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, global_threshold=None, cooldown=60, clock=self.clock)
+
+    def open_circuit(self, key="python"):
+        for _ in range(2):
+            self.assertTrue(self.breaker.allow(key))
+            self.breaker.record_failure(key)
+        self.assertTrue(self.breaker.is_open(key))
+
+    def test_opens_after_threshold(self):
+        self.open_circuit()
+        self.assertFalse(self.breaker.allow("python"))
+        self.assertEqual(self.breaker.retry_after("python"), 60)
+        # 其他查询不受影响
+        self.assertTrue(self.breaker.allow("java"))
+
+    def test_half_open_admits_single_probe(self):
+        self.open_circuit()
+        self.clock.now += 60
+        self.assertEqual(self.breaker.retry_after("python"), 0)
+        self.assertTrue(self.breaker.allow("python"))
+        # 试探请求没有结果之前拒绝其他请求
+        self.assertFalse(self.breaker.allow("python"))
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check("python")
+        self.assertGreater(self.breaker.retry_after("python"), 0)
+        self.assertEqual(self.breaker.stats["probes"], 1)
+
+    def test_probe_success_closes(self):
+        self.open_circuit()
+        self.clock.now += 60
+        self.assertTrue(self.breaker.allow("python"))
+        self.breaker.record_success("python")
+        self.assertFalse(self.breaker.is_open("python"))
+        self.assertTrue(self.breaker.allow("python"))
+        self.assertTrue(self.breaker.allow("python"))
+
+    def test_probe_failure_reopens(self):
+        self.open_circuit()
+        self.clock.now += 60
+        self.assertTrue(self.breaker.allow("python"))
+        self.breaker.record_failure("python")
+        self.assertFalse(self.breaker.allow("python"))
+        self.assertEqual(self.breaker.retry_after("python"), 60)
+        self.clock.now += 60
+        self.assertTrue(self.breaker.allow("python"))
+
+    def test_lost_probe_is_replaced_after_cooldown(self):
+        self.open_circuit()
+        self.clock.now += 60
+        self.assertTrue(self.breaker.allow("python"))
+        self.clock.now += 30
+        self.assertFalse(self.breaker.allow("python"))
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow("python"))
+
+    def test_global_probe(self):
+        breaker = CircuitBreaker(failure_threshold=None, global_threshold=2, cooldown=60, clock=self.clock)
+        breaker.record_failure("python")
+        breaker.record_failure("java")
+        self.assertFalse(breaker.allow("go"))
+        self.clock.now += 60
+        self.assertTrue(breaker.allow("go"))
+        # 全局试探请求进行中，其他查询也被拒绝
+        self.assertFalse(breaker.allow("python"))
+        breaker.record_success("go")
+        self.assertTrue(breaker.allow("python"))
+
+
+if __name__ == "__main__":
+    unittest.main()
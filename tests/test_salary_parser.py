@@ -0,0 +1,67 @@
+"""
+薪资解析（salary_parser.parse_salaries）的测试：
+
+    python -m pytest tests
+"""
+import os
+import sys
+import math
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from salary_parser import parse_salaries
+
+
+class ParseSalariesTest(unittest.TestCase):
+    def parse(self, salary):
+        return parse_salaries(pd.Series([salary])).iloc[0]
+
+    def assertRange(self, salary, low, high, unit, months=12):
+        row = self.parse(salary)
+        self.assertAlmostEqual(row["salary_min"], low)
+        self.assertAlmostEqual(row["salary_max"], high)
+        self.assertEqual(row["salary_unit"], unit)
+        self.assertEqual(row["salary_months"], months)
+
+    def test_monthly_ranges(self):
+        cases = [
+            ("15-25K", 15, 25, "K"),
+            ("15K-25K", 15, 25, "K"),
+            ("10-20k", 10, 20, "K"),
+            ("1-1.5万", 10, 15, "W"),
+            ("5000-8000元/月", 5, 8, "元/月"),
+        ]
+        for salary, low, high, unit in cases:
+            with self.subTest(salary=salary):
+                self.assertRange(salary, low, high, unit)
+
+    def test_mixed_units(self):
+        # 上下限单位不同时分别换算
+        self.assertRange("8千-1.2万", 8, 12, "W")
+        self.assertRange("8千-1.2万·13薪", 8, 12, "W", months=13)
+        self.assertAlmostEqual(self.parse("8千-1.2万·13薪")["salary_annual"], 130)
+
+    def test_single_value(self):
+        self.assertRange("8千", 8, 8, "K")
+
+    def test_months_and_annual(self):
+        row = self.parse("15-25K·13薪")
+        self.assertEqual(row["salary_months"], 13)
+        self.assertAlmostEqual(row["salary_annual"], 260)
+
+    def test_daily_and_hourly(self):
+        self.assertRange("200-300元/天", 4.35, 6.525, "元/天")
+        self.assertRange("50-80元/时", 8.7, 13.92, "元/时")
+
+    def test_unparsable(self):
+        row = self.parse("面议")
+        self.assertEqual(row["salary_unit"], "面议")
+        self.assertTrue(math.isnan(row["salary_min"]))
+        self.assertTrue(math.isnan(self.parse("abc")["salary_max"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
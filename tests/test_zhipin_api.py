@@ -0,0 +1,122 @@
+"""
+职位列表接口解析（zhipin_api）的测试，使用 tests/fixtures 中保存的性能日志和接口响应：
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import base64
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zhipin_api import (
+    decode_response_body, find_job_list_requests, load_response_fixture, map_job_list_response,
+    response_matches_page
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CRAWL_TIME = "2024-01-01 12:00:00"
+PAGE_URL = "https://www.zhipin.com/web/geek/job?query=python&city=101010100&page=2"
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class FindJobListRequestsTest(unittest.TestCase):
+    def test_keeps_successful_job_list_responses(self):
+        logs = json.loads(read_fixture("performance_log.json"))
+        requests = find_job_list_requests(logs)
+        # 跳过请求事件、搜索页文档、403响应和无法解析的日志
+        self.assertEqual([request_id for request_id, _ in requests], ["1000.0", "1000.1"])
+        self.assertTrue(all("/wapi/zpgeek/search/joblist.json" in url for _, url in requests))
+
+    def test_matches_requests_to_page(self):
+        logs = json.loads(read_fixture("performance_log.json"))
+        matched = [request_id for request_id, url in find_job_list_requests(logs)
+                   if response_matches_page(url, PAGE_URL)]
+        # 上一页迟到的响应（page=1）不属于第2页
+        self.assertEqual(matched, ["1000.1"])
+
+
+class ResponseMatchesPageTest(unittest.TestCase):
+    API_URL = "https://www.zhipin.com/wapi/zpgeek/search/joblist.json?scene=1&query=python&city=101010100&page={}"
+
+    def test_page_query_and_city_must_match(self):
+        self.assertTrue(response_matches_page(self.API_URL.format(2), PAGE_URL))
+        self.assertFalse(response_matches_page(self.API_URL.format(3), PAGE_URL))
+        self.assertFalse(response_matches_page(self.API_URL.format(2), PAGE_URL.replace("python", "java")))
+        self.assertFalse(response_matches_page(self.API_URL.format(2), PAGE_URL.replace("101010100", "101020100")))
+
+    def test_missing_page_is_first_page(self):
+        page_url = "https://www.zhipin.com/web/geek/job?query=python&city=101010100"
+        self.assertTrue(response_matches_page(self.API_URL.format(1), page_url))
+        self.assertFalse(response_matches_page(self.API_URL.format(2), page_url))
+
+    def test_without_page_url_accepts_any_response(self):
+        self.assertTrue(response_matches_page(self.API_URL.format(5), None))
+
+
+class MapJobListResponseTest(unittest.TestCase):
+    def test_maps_fixture(self):
+        payload = json.loads(read_fixture("joblist_page_2.json"))
+        jobs = map_job_list_response(payload, crawl_time=CRAWL_TIME)
+        items = payload["zpData"]["jobList"]
+        self.assertEqual(len(jobs), len(items))
+
+        job, item = jobs[0], items[0]
+        self.assertEqual(job["job_name"], item["jobName"])
+        self.assertEqual(job["salary"], item["salaryDesc"])
+        self.assertEqual(job["company_name"], item["brandName"])
+        self.assertEqual(job["job_area"], "·".join([item["cityName"], item["areaDistrict"], item["businessDistrict"]]))
+        self.assertEqual(job["job_requirements"], list(dict.fromkeys(item["jobLabels"] + item["skills"])))
+        self.assertEqual(job["detail_link"], f"https://www.zhipin.com/job_detail/{item['encryptJobId']}.html"
+                                             f"?lid={item['lid']}&securityId={item['securityId']}")
+        self.assertEqual(job["crawl_time"], CRAWL_TIME)
+        self.assertEqual(job["job_id"], item["encryptJobId"])
+
+    def test_accepts_raw_json_and_fixture_file(self):
+        raw = read_fixture("joblist_page_2.json")
+        expected = map_job_list_response(json.loads(raw), crawl_time=CRAWL_TIME)
+        self.assertEqual(map_job_list_response(raw, crawl_time=CRAWL_TIME), expected)
+        self.assertEqual(load_response_fixture(os.path.join(FIXTURES, "joblist_page_2.json"), CRAWL_TIME), expected)
+
+    def test_error_code_raises(self):
+        with self.assertRaises(ValueError):
+            map_job_list_response({"code": 37, "message": "您的访问行为异常", "zpData": {}})
+
+    def test_empty_job_list(self):
+        self.assertEqual(map_job_list_response({"code": 0, "zpData": {"jobList": []}}), [])
+
+
+class DecodeResponseBodyTest(unittest.TestCase):
+    def setUp(self):
+        self.raw = read_fixture("joblist_page_2.json")
+
+    def test_plain_body(self):
+        self.assertEqual(decode_response_body({"body": self.raw, "base64Encoded": False}), json.loads(self.raw))
+
+    def test_base64_body(self):
+        encoded = base64.b64encode(self.raw.encode("utf-8")).decode("ascii")
+        self.assertEqual(decode_response_body({"body": encoded, "base64Encoded": True}), json.loads(self.raw))
+
+    def test_invalid_bodies_raise_value_error(self):
+        invalid = [
+            {"body": self.raw[:len(self.raw) // 2], "base64Encoded": False},     # 被截断
+            {"body": "<html>验证</html>", "base64Encoded": False},               # 不是JSON
+            {"body": "", "base64Encoded": False},                                # 空响应
+            {"body": "[1, 2]", "base64Encoded": False},                          # 不是JSON对象
+            {"body": self.raw, "base64Encoded": True},                           # 声明为base64但不是
+            {"body": base64.b64encode(b"\xff\xfe{").decode("ascii"), "base64Encoded": True},
+        ]
+        for result in invalid:
+            with self.subTest(body=result["body"][:20]):
+                with self.assertRaises(ValueError):
+                    decode_response_body(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
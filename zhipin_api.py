@@ -0,0 +1,218 @@
+"""
+BOSS直聘职位列表接口（joblist.json）解析
+
+搜索结果页通过XHR请求 /wapi/zpgeek/search/joblist.json 获取职位卡片数据。
+本模块从浏览器性能日志中找出这些响应，并将接口JSON直接映射为职位记录，
+不依赖Selenium，可以直接对保存下来的响应文件运行：
+
+    python zhipin_api.py debug/joblist_page_1.json
+"""
+import os
+import sys
+import json
+import base64
+import binascii
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+# 职位列表接口路径
+JOB_LIST_API_PATH = "/wapi/zpgeek/search/joblist.json"
+
+BASE_URL = "https://www.zhipin.com"
+
+
+def find_job_list_requests(performance_logs):
+    """
+    从性能日志中找出职位列表接口的响应
+
+    Args:
+        performance_logs: driver.get_log("performance") 返回的日志列表
+
+    Returns:
+        [(request_id, url), ...]，按日志顺序排列
+    """
+    requests = []
+    for entry in performance_logs:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        if message.get("method") != "Network.responseReceived":
+            continue
+
+        params = message.get("params", {})
+        response = params.get("response", {})
+        url = response.get("url", "")
+        if JOB_LIST_API_PATH in url and response.get("status") == 200:
+            requests.append((params.get("requestId"), url))
+    return requests
+
+
+def decode_response_body(result):
+    """
+    解析 Network.getResponseBody 的返回值
+
+    Args:
+        result: {'body': 响应体, 'base64Encoded': 是否为base64编码}
+
+    Returns:
+        响应JSON（dict）；响应体为空、被截断、不是JSON或不是JSON对象时抛出ValueError
+    """
+    body = result.get("body") or ""
+    if result.get("base64Encoded"):
+        try:
+            body = base64.b64decode(body, validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"职位列表接口响应的base64解码失败: {str(e)}")
+    if not body:
+        raise ValueError("职位列表接口响应为空")
+    # json.loads 对不完整或非JSON内容抛出的 JSONDecodeError、对非UTF-8字节抛出的 UnicodeDecodeError 都是ValueError
+    payload = json.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError(f"职位列表接口响应不是JSON对象: {type(payload).__name__}")
+    return payload
+
+
+# 判断接口请求是否属于当前页面时比较的查询参数
+PAGE_MATCH_PARAMS = ("page", "query", "city")
+
+
+def response_matches_page(api_url, page_url):
+    """
+    接口请求是否属于正在加载的搜索页（避免把上一页迟到的响应当成本页）
+
+    比较 page、query、city 参数，缺少page时视为第1页，query、city 只在两个URL中都有时比较
+
+    Args:
+        api_url: 职位列表接口请求的URL
+        page_url: 正在加载的搜索页URL，None时不检查
+    """
+    if not page_url:
+        return True
+    api_params = parse_qs(urlparse(api_url).query)
+    page_params = parse_qs(urlparse(page_url).query)
+    for name in PAGE_MATCH_PARAMS:
+        api_value = api_params.get(name, ["1"] if name == "page" else [None])[0]
+        page_value = page_params.get(name, ["1"] if name == "page" else [None])[0]
+        if api_value is not None and page_value is not None and api_value != page_value:
+            return False
+    return True
+
+
+def _join_parts(*parts):
+    """用·连接非空字段，与页面上的工作地点格式一致"""
+    return "·".join(str(part) for part in parts if part)
+
+
+def build_detail_link(item, base_url=BASE_URL):
+    """根据接口字段构造职位详情页链接"""
+    job_id = item.get("encryptJobId")
+    if not job_id:
+        return ""
+
+    link = f"{base_url}/job_detail/{job_id}.html"
+    query = []
+    if item.get("lid"):
+        query.append(f"lid={item['lid']}")
+    if item.get("securityId"):
+        query.append(f"securityId={item['securityId']}")
+    return f"{link}?{'&'.join(query)}" if query else link
+
+
+def map_job(item, crawl_time, base_url=BASE_URL):
+    """将接口返回的单个职位映射为职位记录"""
+    labels = [label for label in (item.get("jobLabels") or []) if label]
+    skills = [skill for skill in (item.get("skills") or []) if skill]
+    # 职位要求与页面卡片一致：先经验/学历标签，再技能标签
+    requirements = list(dict.fromkeys(labels + skills))
+
+    gps = item.get("gps") or {}
+
+    return {
+        "job_name": item.get("jobName") or "未知",
+        "salary": item.get("salaryDesc") or "未知",
+        "company_name": item.get("brandName") or "未知",
+        "job_area": _join_parts(item.get("cityName"), item.get("areaDistrict"), item.get("businessDistrict")) or "未知",
+        "job_requirements": requirements,
+        "hr_name": item.get("bossName") or "未知",
+        "hr_title": item.get("bossTitle") or "未知",
+        # 列表接口不返回发布时间
+        "publish_time": "未知",
+        "detail_link": build_detail_link(item, base_url),
+        "crawl_time": crawl_time,
+        # 以下字段页面卡片上不显示，只能从接口获得
+        "job_id": item.get("encryptJobId", ""),
+        "security_id": item.get("securityId", ""),
+        "experience": item.get("jobExperience", ""),
+        "education": item.get("jobDegree", ""),
+        "city_code": item.get("city"),
+        "business_district": item.get("businessDistrict", ""),
+        "company_id": item.get("encryptBrandId", ""),
+        "company_industry": item.get("brandIndustry", ""),
+        "company_scale": item.get("brandScaleName", ""),
+        "company_stage": item.get("brandStageName", ""),
+        "welfare": list(item.get("welfareList") or []),
+        "boss_online": bool(item.get("bossOnline", False)),
+        "longitude": gps.get("longitude"),
+        "latitude": gps.get("latitude")
+    }
+
+
+def map_job_list_response(payload, crawl_time=None, base_url=BASE_URL):
+    """
+    将职位列表接口的JSON响应映射为职位记录列表
+
+    Args:
+        payload: 接口响应（已解析的dict或原始JSON字符串）
+        crawl_time: 爬取时间，默认为当前时间
+
+    Returns:
+        职位记录列表；响应code非0（如触发验证）时抛出ValueError
+    """
+    if isinstance(payload, (str, bytes)):
+        payload = json.loads(payload)
+
+    if payload.get("code", 0) != 0:
+        raise ValueError(f"职位列表接口返回错误: code={payload.get('code')} message={payload.get('message')}")
+
+    if crawl_time is None:
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    job_list = (payload.get("zpData") or {}).get("jobList") or []
+    return [map_job(item, crawl_time, base_url) for item in job_list]
+
+
+def load_response_fixture(path, crawl_time=None):
+    """读取保存的接口响应文件并映射为职位记录"""
+    with open(path, "r", encoding="utf-8") as f:
+        return map_job_list_response(json.load(f), crawl_time)
+
+
+def main():
+    """将命令行给出的接口响应文件映射为职位记录并输出JSON"""
+    if len(sys.argv) < 2:
+        print("用法: python zhipin_api.py <joblist响应文件或目录> ...")
+        return 1
+
+    paths = []
+    for arg in sys.argv[1:]:
+        if os.path.isdir(arg):
+            paths.extend(os.path.join(arg, name) for name in sorted(os.listdir(arg)) if name.endswith(".json"))
+        else:
+            paths.append(arg)
+
+    jobs = []
+    for path in paths:
+        try:
+            jobs.extend(load_response_fixture(path))
+        except (OSError, ValueError) as e:
+            print(f"解析 {path} 失败: {str(e)}", file=sys.stderr)
+
+    json.dump(jobs, sys.stdout, ensure_ascii=False, indent=2)
+    print(f"\n共解析 {len(jobs)} 条职位", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
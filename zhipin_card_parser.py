@@ -0,0 +1,555 @@
+"""
+职位卡片识别与字段提取规则
+
+ZhipinSeleniumScraper 在浏览器中解析职位卡片，zhipin_replay 对保存下来的HTML离线解析，
+两者共用本模块中的选择器和提取流程。不同的解析后端通过适配器提供统一的节点操作：
+
+    find_xpath(node, xpath) / find_css(node, selector) -> 节点列表
+    text(node) -> 去除首尾空白的文本
+    attr(node, name) -> 属性值
+    parent(node) -> 父节点
+    outer_html(node) -> 节点HTML
+"""
+import re
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urljoin
+
+# lxml为可选依赖，仅离线解析时需要
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    USE_LXML = True
+except ImportError:
+    USE_LXML = False
+
+UNKNOWN = "未知"
+
+# 提取规则版本，修改选择器或提取流程后递增，使 card_cache 中的旧结果失效
+EXTRACTION_RULES_VERSION = 2
+
+BASE_URL = "https://www.zhipin.com"
+
+# 搜索结果页中职位卡片的CSS选择器，按优先级排列
+CARD_SELECTORS = [
+    ".job-card-wrapper",
+    ".job-primary",
+    ".job-card",
+    ".search-job-result ul li",
+    ".job-list-box li"
+]
+
+# CSS选择器都失败时使用的XPath
+CARD_XPATHS = [
+    "//div[contains(@class, 'job-card')]",
+    "//li[contains(@class, 'job-card')]",
+    "//div[contains(@class, 'job-list-box')]//li",
+    "//div[contains(@class, 'search-job-result')]//li"
+]
+
+# 页面上表示没有搜索结果的提示
+NO_JOB_INDICATORS = [
+    "没有找到相关职位",
+    "打开APP查看全部职位库",
+    "优质职位随心刷"
+]
+
+# 直接使用XPath选择器可能更准确
+FIELD_XPATHS = {
+    "job_name": [
+        ".//span[@class='job-name']",
+        ".//a[contains(@class, 'job-name')]",
+        ".//span[contains(@class, 'job-title')]",
+        ".//div[contains(@class, 'job-title')]",
+        ".//div[contains(@class, 'name')]//span",
+        ".//p[contains(@class, 'name')]"
+    ],
+    "salary": [
+        ".//span[@class='salary']",
+        ".//span[contains(@class, 'red')]",
+        ".//span[contains(@class, 'price')]",
+        ".//span[contains(@class, 'money')]",
+        ".//p[contains(@class, 'salary')]"
+    ],
+    "company_name": [
+        ".//div[@class='company-name']",
+        ".//a[contains(@class, 'company-name')]",
+        ".//span[contains(@class, 'company')]",
+        ".//h3[contains(@class, 'company')]",
+        ".//h3[contains(@class, 'company-name')]//a"
+    ],
+    "job_area": [
+        ".//span[@class='job-area']",
+        ".//span[contains(@class, 'address')]",
+        ".//span[contains(@class, 'area')]",
+        ".//span[contains(@class, 'location')]",
+        ".//p[contains(@class, 'job-text')]//span[1]",
+        ".//span[contains(@class, 'job-area-wrapper')]//span"
+    ]
+}
+
+# XPath未命中时再尝试的CSS选择器
+FIELD_CSS_SELECTORS = {
+    "job_name": [".job-name", ".job-title", "a.job-name", "a[ka=job-title]", ".name span", "p.name"],
+    "salary": [".salary", ".red", ".job-limit-tip", ".price", ".money", "p.salary"],
+    "company_name": [".company-name", ".company-text", "a[ka=job-company]", ".company", "h3.company-name a"],
+    "job_area": [".job-area", ".job-address", ".location-name", ".address", ".area", "p.job-text span:first-child", ".job-area-wrapper span"]
+}
+
+# class按完整的类名匹配：contains(@class, 'tag-list') 也会命中公司信息的 company-tag-list
+TAG_LIST_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' tag-list ')"
+
+REQUIREMENT_XPATHS = [
+    ".//div[contains(@class, 'tags')]//span",
+    ".//div[contains(@class, 'job-info-tags')]//span",
+    ".//div[contains(@class, 'tag')]//span",
+    ".//div[contains(@class, 'requirement')]//span",
+    f".//ul[{TAG_LIST_CLASS}]//li",
+    f".//div[contains(@class, 'job-card-footer')]//ul[{TAG_LIST_CLASS}]//li"
+]
+
+REQUIREMENT_CSS_SELECTORS = [
+    ".job-info-tags .tag-item", ".tags span", ".tag",
+    ".requirement", ".text-ellipsis", "ul.tag-list li",
+    ".job-card-footer ul.tag-list li"
+]
+
+HR_XPATHS = [
+    ".//div[contains(@class, 'info-public')]",
+    ".//div[contains(@class, 'boss-info')]",
+    ".//div[contains(@class, 'job-author')]",
+    ".//div[contains(@class, 'hr')]",
+    ".//div[contains(@class, 'publisher')]"
+]
+
+TIME_XPATHS = [
+    ".//span[contains(@class, 'job-info-tip')]",
+    ".//span[contains(@class, 'job-time')]",
+    ".//span[contains(@class, 'time')]",
+    ".//span[contains(@class, 'publish-time')]",
+    ".//span[contains(@class, 'update-time')]"
+]
+
+SALARY_FALLBACK_PATTERN = re.compile(r'(\d+)[K-](\d+)K')
+TITLE_FALLBACK_PATTERN = re.compile(r'job-name"[^>]*>([^<]+)<')
+
+
+class SelectorStats:
+    """统计每个字段由哪个选择器命中，以及未命中的次数"""
+
+    def __init__(self):
+        self.hits = defaultdict(lambda: defaultdict(int))
+        self.misses = defaultdict(int)
+        self.cards = 0
+
+    def hit(self, field, selector):
+        self.hits[field][selector] += 1
+
+    def miss(self, field):
+        self.misses[field] += 1
+
+    def merge(self, other):
+        """合并另一份统计"""
+        self.cards += other.cards
+        for field, selectors in other.hits.items():
+            for selector, count in selectors.items():
+                self.hits[field][selector] += count
+        for field, count in other.misses.items():
+            self.misses[field] += count
+
+    def to_dict(self):
+        fields = sorted(set(self.hits) | set(self.misses))
+        return {
+            "cards": self.cards,
+            "fields": {
+                field: {
+                    "hits": dict(sorted(self.hits[field].items(), key=lambda item: -item[1])),
+                    "misses": self.misses[field]
+                }
+                for field in fields
+            }
+        }
+
+
+def new_job_record(crawl_time=None):
+    """创建带默认值的职位记录"""
+    return {
+        "job_name": UNKNOWN,
+        "salary": UNKNOWN,
+        "company_name": UNKNOWN,
+        "job_area": UNKNOWN,
+        "job_requirements": [],
+        "hr_name": UNKNOWN,
+        "hr_title": UNKNOWN,
+        "publish_time": UNKNOWN,
+        "detail_link": "",
+        "crawl_time": crawl_time or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def split_hr_info(hr_info, hr_title=None):
+    """
+    拆分HR信息为 (姓名, 职位)
+
+    Args:
+        hr_info: HR信息节点的全部文本
+        hr_title: 节点中<em>的文本（网站的卡片为 <div class="info-public">陈女士<em>HRBP</em></div>），
+            没有<em>时按"·"或空格拆分
+    """
+    if hr_title and hr_info.endswith(hr_title):
+        return hr_info[:-len(hr_title)].strip() or UNKNOWN, hr_title
+    hr_parts = hr_info.split("·") if "·" in hr_info else hr_info.split(" ")
+    hr_name = hr_parts[0].strip() or UNKNOWN
+    return hr_name, hr_parts[1].strip() if len(hr_parts) >= 2 else UNKNOWN
+
+
+def _first_text(adapter, card, finder, selector):
+    """返回选择器命中的第一个节点的文本"""
+    try:
+        elements = finder(card, selector)
+        if elements:
+            return adapter.text(elements[0])
+    except Exception:
+        pass
+    return ""
+
+
+def _all_texts(adapter, card, finder, selector):
+    """返回选择器命中的所有非空文本"""
+    try:
+        elements = finder(card, selector)
+    except Exception:
+        return []
+    texts = []
+    for element in elements:
+        text = adapter.text(element)
+        if text:
+            texts.append(text)
+    return texts
+
+
+def extract_card(card, adapter, crawl_time=None, stats=None, logger=None):
+    """
+    按选择器级联规则从职位卡片中提取职位信息
+
+    Args:
+        card: 职位卡片节点
+        adapter: 解析后端适配器
+        crawl_time: 爬取时间，默认为当前时间
+        stats: SelectorStats，记录选择器命中情况
+        logger: 可选，记录每个字段的命中选择器
+
+    Returns:
+        职位记录，没有提取到任何有效字段时返回None
+    """
+    job_data = new_job_record(crawl_time)
+    if stats is not None:
+        stats.cards += 1
+
+    def record(field, selector, value):
+        if stats is not None:
+            stats.hit(field, selector)
+        if logger is not None:
+            logger.info(f"使用 '{selector}' 成功提取 {field}: {value}")
+
+    # 首先尝试XPath选择器
+    for field, xpath_list in FIELD_XPATHS.items():
+        for xpath in xpath_list:
+            text = _first_text(adapter, card, adapter.find_xpath, xpath)
+            if text:
+                job_data[field] = text
+                record(field, xpath, text)
+                break
+
+    # 如果XPath没有找到，再尝试CSS选择器
+    for field, selector_list in FIELD_CSS_SELECTORS.items():
+        if job_data[field] == UNKNOWN:
+            for selector in selector_list:
+                text = _first_text(adapter, card, adapter.find_css, selector)
+                if text:
+                    job_data[field] = text
+                    record(field, selector, text)
+                    break
+            else:
+                if stats is not None:
+                    stats.miss(field)
+
+    # 提取职位要求
+    for xpath in REQUIREMENT_XPATHS:
+        requirements = _all_texts(adapter, card, adapter.find_xpath, xpath)
+        if requirements:
+            job_data["job_requirements"] = requirements
+            record("job_requirements", xpath, requirements)
+            break
+
+    if not job_data["job_requirements"]:  # 如果XPath未提取到，尝试CSS选择器
+        for selector in REQUIREMENT_CSS_SELECTORS:
+            requirements = _all_texts(adapter, card, adapter.find_css, selector)
+            if requirements:
+                job_data["job_requirements"] = requirements
+                record("job_requirements", selector, requirements)
+                break
+        else:
+            if stats is not None:
+                stats.miss("job_requirements")
+
+    # 提取HR信息
+    for xpath in HR_XPATHS:
+        try:
+            nodes = adapter.find_xpath(card, xpath)
+        except Exception:
+            continue
+        hr_info = adapter.text(nodes[0]) if nodes else ""
+        if hr_info:
+            hr_title = _first_text(adapter, nodes[0], adapter.find_xpath, ".//em")
+            job_data["hr_name"], job_data["hr_title"] = split_hr_info(hr_info, hr_title)
+            record("hr", xpath, hr_info)
+            break
+    else:
+        if stats is not None:
+            stats.miss("hr")
+
+    # 提取发布时间
+    for xpath in TIME_XPATHS:
+        text = _first_text(adapter, card, adapter.find_xpath, xpath)
+        if text:
+            job_data["publish_time"] = text
+            record("publish_time", xpath, text)
+            break
+    else:
+        if stats is not None:
+            stats.miss("publish_time")
+
+    # 提取详情链接 - 查找整个卡片中的链接
+    try:
+        for link in adapter.find_xpath(card, ".//a"):
+            href = adapter.attr(link, "href")
+            if href and ("job_detail" in href or "geek/job" in href):
+                job_data["detail_link"] = href
+                record("detail_link", ".//a", href)
+                break
+    except Exception:
+        pass
+
+    # 如果仍然找不到详情链接，尝试父元素的链接
+    if not job_data["detail_link"]:
+        try:
+            parent = adapter.parent(card)
+            href = adapter.attr(parent, "href") if parent is not None else None
+            if href:
+                job_data["detail_link"] = href
+                record("detail_link", "./..", href)
+        except Exception:
+            pass
+    if not job_data["detail_link"] and stats is not None:
+        stats.miss("detail_link")
+
+    # 检查是否提取到了有效信息
+    valid_fields = 0
+    for key, value in job_data.items():
+        if key != "crawl_time" and key != "job_requirements" and value != UNKNOWN:
+            valid_fields += 1
+
+    # 更宽松的标准：即使只有一个有效字段也接受（增加成功率）
+    if valid_fields < 1:
+        if logger is not None:
+            logger.warning(f"未能提取足够的职位信息: {job_data}")
+        # 最后尝试：检查职位卡片的完整HTML
+        card_html = adapter.outer_html(card) or ""
+        if '立即沟通' in card_html and len(card_html) < 200:
+            if logger is not None:
+                logger.warning("检测到只有'立即沟通'按钮，职位卡片可能未完全加载")
+            return None
+
+        # 尝试在HTML中查找关键信息
+        salary_match = SALARY_FALLBACK_PATTERN.search(card_html)
+        if salary_match:
+            job_data["salary"] = f"{salary_match.group(1)}-{salary_match.group(2)}K"
+            record("salary", "outerHTML正则", job_data["salary"])
+            valid_fields += 1
+
+        job_title_match = TITLE_FALLBACK_PATTERN.search(card_html)
+        if job_title_match:
+            job_data["job_name"] = job_title_match.group(1)
+            record("job_name", "outerHTML正则", job_data["job_name"])
+            valid_fields += 1
+
+        if valid_fields < 1:
+            return None
+
+    return job_data
+
+
+# 批量提取脚本：在浏览器中一次执行完所有卡片的选择器级联，只需一次WebDriver往返。
+# 选择器由Python传入，保证与 extract_card 使用同一套规则。
+BATCH_EXTRACT_SCRIPT = """
+const [cardSelectors, cardXpaths, fieldXpaths, fieldCss, reqXpaths, reqCss, hrXpaths, timeXpaths] = arguments;
+const byXpath = (ctx, xpath) => {
+    const result = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+};
+const byCss = (ctx, selector) => Array.from(ctx.querySelectorAll(selector));
+const text = (node) => (node.innerText || '').trim();
+const firstText = (ctx, finder, selectors) => {
+    for (const selector of selectors) {
+        try {
+            const nodes = finder(ctx, selector);
+            if (nodes.length && text(nodes[0])) return text(nodes[0]);
+        } catch (e) {}
+    }
+    return null;
+};
+const allTexts = (ctx, finder, selectors) => {
+    for (const selector of selectors) {
+        try {
+            const texts = finder(ctx, selector).map(text).filter(Boolean);
+            if (texts.length) return texts;
+        } catch (e) {}
+    }
+    return [];
+};
+let cards = [];
+for (const selector of cardSelectors) {
+    cards = byCss(document, selector);
+    if (cards.length) break;
+}
+if (!cards.length) {
+    for (const xpath of cardXpaths) {
+        cards = byXpath(document, xpath);
+        if (cards.length) break;
+    }
+}
+return cards.map((card) => {
+    const fields = {};
+    for (const field of Object.keys(fieldXpaths)) {
+        fields[field] = firstText(card, byXpath, fieldXpaths[field]) || firstText(card, byCss, fieldCss[field] || []);
+    }
+    let requirements = allTexts(card, byXpath, reqXpaths);
+    if (!requirements.length) requirements = allTexts(card, byCss, reqCss);
+    let link = '';
+    for (const a of card.querySelectorAll('a')) {
+        if (a.href && (a.href.includes('job_detail') || a.href.includes('geek/job'))) { link = a.href; break; }
+    }
+    if (!link && card.parentElement && card.parentElement.href) link = card.parentElement.href;
+    let hr = null, hrTitle = null;
+    for (const xpath of hrXpaths) {
+        try {
+            const nodes = byXpath(card, xpath);
+            if (nodes.length && text(nodes[0])) {
+                hr = text(nodes[0]);
+                const em = nodes[0].querySelector('em');
+                hrTitle = em ? text(em) : null;
+                break;
+            }
+        } catch (e) {}
+    }
+    return {
+        fields: fields,
+        requirements: requirements,
+        hr: hr,
+        hr_title: hrTitle,
+        publish_time: firstText(card, byXpath, timeXpaths),
+        detail_link: link
+    };
+});
+"""
+
+
+def batch_extract_arguments():
+    """BATCH_EXTRACT_SCRIPT 的参数，即本模块中的选择器规则"""
+    return [
+        CARD_SELECTORS, CARD_XPATHS, FIELD_XPATHS, FIELD_CSS_SELECTORS,
+        REQUIREMENT_XPATHS, REQUIREMENT_CSS_SELECTORS, HR_XPATHS, TIME_XPATHS
+    ]
+
+
+def record_from_batch(raw, crawl_time=None):
+    """将 BATCH_EXTRACT_SCRIPT 返回的单个卡片结果转换为职位记录，无有效字段时返回None"""
+    job_data = new_job_record(crawl_time)
+    for field, value in raw.get("fields", {}).items():
+        if value:
+            job_data[field] = value
+    job_data["job_requirements"] = raw.get("requirements") or []
+
+    hr_info = raw.get("hr")
+    if hr_info:
+        job_data["hr_name"], job_data["hr_title"] = split_hr_info(hr_info, raw.get("hr_title"))
+    if raw.get("publish_time"):
+        job_data["publish_time"] = raw["publish_time"]
+    job_data["detail_link"] = raw.get("detail_link") or ""
+
+    if all(value == UNKNOWN for key, value in job_data.items() if key not in ("crawl_time", "job_requirements")):
+        return None
+    return job_data
+
+
+def page_has_no_jobs(page_html):
+    """返回页面中出现的无搜索结果提示，没有则返回None"""
+    for indicator in NO_JOB_INDICATORS:
+        if indicator in page_html:
+            return indicator
+    return None
+
+
+class LxmlAdapter:
+    """基于lxml的离线解析适配器，选择器编译结果会被缓存复用"""
+
+    def __init__(self, base_url=BASE_URL):
+        if not USE_LXML:
+            raise ImportError("离线解析需要安装lxml和cssselect: pip install lxml cssselect")
+        self.base_url = base_url
+        self._xpaths = {}
+        self._css = {}
+
+    def parse(self, html):
+        """解析HTML文本，返回根节点"""
+        return lxml.html.fromstring(html)
+
+    def find_xpath(self, node, xpath):
+        compiled = self._xpaths.get(xpath)
+        if compiled is None:
+            compiled = self._xpaths[xpath] = etree.XPath(xpath)
+        return compiled(node)
+
+    def find_css(self, node, selector):
+        compiled = self._css.get(selector)
+        if compiled is None:
+            compiled = self._css[selector] = CSSSelector(selector)
+        return compiled(node)
+
+    def text(self, node):
+        # 与浏览器中元素的可见文本一致：合并连续空白
+        return " ".join(node.text_content().split())
+
+    def attr(self, node, name):
+        value = node.get(name)
+        # 浏览器返回的href是绝对地址，这里保持一致
+        if value and name == "href":
+            return urljoin(self.base_url, value)
+        return value
+
+    def parent(self, node):
+        return node.getparent()
+
+    def outer_html(self, node):
+        return lxml.html.tostring(node, encoding="unicode")
+
+    def find_cards(self, root):
+        """
+        按与爬虫相同的优先级查找职位卡片
+
+        Returns:
+            (卡片列表, 命中的选择器)
+        """
+        for selector in CARD_SELECTORS:
+            cards = self.find_css(root, selector)
+            if cards:
+                return cards, selector
+        for xpath in CARD_XPATHS:
+            cards = self.find_xpath(root, xpath)
+            if cards:
+                return cards, xpath
+        return [], None
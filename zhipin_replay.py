@@ -0,0 +1,198 @@
+"""
+离线回放：对爬虫保存的HTML页面重新运行职位卡片识别和字段提取
+
+爬虫在 debug/ 目录下保存了 page_<n>.html、no_jobs_page_*.html、timeout_page_*.html
+以及 job_card_*.html 等文件。回放使用与 ZhipinSeleniumScraper 相同的选择器规则
+（zhipin_card_parser），不需要浏览器、网络和登录：
+
+    python zhipin_replay.py debug --output replay_jobs.json --report replay_report.json
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+from collections import Counter
+from datetime import datetime
+
+from card_cache import CardCache
+from zhipin_card_parser import LxmlAdapter, SelectorStats, extract_card, page_has_no_jobs
+
+
+def iter_page_files(directory, pattern="*.html", recursive=False):
+    """按文件名顺序列出目录中保存的页面"""
+    if recursive:
+        paths = glob.glob(os.path.join(directory, "**", pattern), recursive=True)
+    else:
+        paths = glob.glob(os.path.join(directory, pattern))
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def replay_html(html, adapter, stats=None, crawl_time=None, is_card=False, card_cache=None):
+    """
+    对一段HTML运行卡片识别和字段提取
+
+    Args:
+        html: 页面或职位卡片的HTML
+        adapter: LxmlAdapter
+        stats: SelectorStats，累计字段选择器命中情况
+        crawl_time: 写入记录的爬取时间
+        is_card: HTML本身就是一个职位卡片（如 job_card_*.html）
+        card_cache: card_cache.CardCache，重复出现的卡片直接使用缓存的结果
+
+    Returns:
+        (职位记录列表, 命中的卡片选择器, 无结果提示)
+    """
+    root = adapter.parse(html)
+    cards, card_selector = adapter.find_cards(root)
+    if not cards and is_card:
+        cards, card_selector = [root], "<卡片文件>"
+
+    records = []
+    for card in cards:
+        if card_cache is not None:
+            card_html = adapter.outer_html(card)
+            job_data = card_cache.get(card_html, crawl_time=crawl_time, base_url=adapter.base_url)
+            if job_data is not None and stats is not None:
+                # 命中缓存的卡片也计入卡片数，字段选择器统计只包含实际提取的卡片
+                stats.cards += 1
+            if job_data is None:
+                job_data = extract_card(card, adapter, crawl_time=crawl_time, stats=stats)
+                card_cache.put(card_html, job_data)
+        else:
+            job_data = extract_card(card, adapter, crawl_time=crawl_time, stats=stats)
+        if job_data:
+            records.append(job_data)
+    return records, card_selector, page_has_no_jobs(html)
+
+
+def replay_directory(directory, pattern="*.html", recursive=False, base_url=None, card_cache=None):
+    """
+    回放目录中所有保存的页面
+
+    Args:
+        card_cache: 可选的 card_cache.CardCache
+
+    Returns:
+        (职位记录列表, 统计报告dict)
+    """
+    adapter = LxmlAdapter(base_url) if base_url else LxmlAdapter()
+    stats = SelectorStats()
+    card_selectors = Counter()
+    records = []
+    pages = []
+    parse_seconds = 0.0
+
+    for path in iter_page_files(directory, pattern, recursive):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        crawl_time = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M:%S")
+        is_card = os.path.basename(path).startswith("job_card_")
+
+        start = time.perf_counter()
+        try:
+            page_records, card_selector, no_job_indicator = replay_html(
+                html, adapter, stats=stats, crawl_time=crawl_time, is_card=is_card, card_cache=card_cache
+            )
+        except Exception as e:
+            pages.append({"file": path, "error": str(e)})
+            continue
+        elapsed = time.perf_counter() - start
+        parse_seconds += elapsed
+
+        for job_data in page_records:
+            job_data["source_file"] = os.path.relpath(path, directory)
+        records.extend(page_records)
+        card_selectors[card_selector or "<未找到>"] += 1
+        pages.append({
+            "file": path,
+            "card_selector": card_selector,
+            "records": len(page_records),
+            "no_job_indicator": no_job_indicator,
+            "seconds": round(elapsed, 6)
+        })
+
+    parsed_pages = [page for page in pages if "error" not in page]
+    report = {
+        "directory": directory,
+        "pages": len(pages),
+        "errors": len(pages) - len(parsed_pages),
+        "pages_without_cards": sum(1 for page in parsed_pages if not page["card_selector"]),
+        "no_job_pages": sum(1 for page in parsed_pages if page["no_job_indicator"]),
+        "cards": stats.cards,
+        "records": len(records),
+        "parse_seconds": round(parse_seconds, 6),
+        "pages_per_second": round(len(parsed_pages) / parse_seconds, 1) if parse_seconds else None,
+        "cards_per_second": round(stats.cards / parse_seconds, 1) if parse_seconds else None,
+        "card_selectors": dict(card_selectors.most_common()),
+        "field_selectors": stats.to_dict()["fields"],
+        "card_cache": card_cache.report() if card_cache is not None else None,
+        "page_details": pages
+    }
+    return records, report
+
+
+def print_report(report):
+    """打印回放统计"""
+    print(f"\n===== 离线回放: {report['directory']} =====")
+    print(f"页面数: {report['pages']}（解析失败 {report['errors']}，无卡片 {report['pages_without_cards']}，无结果提示 {report['no_job_pages']}）")
+    print(f"职位卡片: {report['cards']}，有效记录: {report['records']}")
+    print(f"解析耗时: {report['parse_seconds']:.3f} 秒，{report['pages_per_second']} 页/秒，{report['cards_per_second']} 卡片/秒")
+
+    cache = report.get("card_cache")
+    if cache:
+        print(f"卡片缓存: 查找 {cache['lookups']}，内存命中 {cache['memory_hits']}，磁盘命中 {cache['disk_hits']}，"
+              f"命中率 {cache['hit_rate']:.1%}")
+
+    print("\n卡片选择器命中:")
+    for selector, count in report["card_selectors"].items():
+        print(f"  {count:6d}  {selector}")
+
+    print("\n字段选择器命中:")
+    for field, field_stats in report["field_selectors"].items():
+        print(f"  {field}（未命中 {field_stats['misses']}）")
+        for selector, count in field_stats["hits"].items():
+            print(f"    {count:6d}  {selector}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='对保存的HTML页面离线回放职位提取')
+    parser.add_argument('directory', nargs='?', default='debug', help='保存页面的目录，默认为debug')
+    parser.add_argument('--pattern', type=str, default='*.html', help='页面文件匹配模式，默认为*.html')
+    parser.add_argument('--recursive', action='store_true', help='递归查找子目录')
+    parser.add_argument('--output', type=str, default=None, help='职位记录输出JSON文件')
+    parser.add_argument('--report', type=str, default=None, help='统计报告输出JSON文件')
+    parser.add_argument('--card-cache', action='store_true', help='按卡片HTML缓存提取结果，重复的卡片只提取一次')
+    parser.add_argument('--card-cache-db', type=str, default=None, help='卡片缓存的SQLite文件，多次运行之间复用（隐含--card-cache）')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"目录不存在: {args.directory}")
+        return 1
+
+    card_cache = None
+    if args.card_cache or args.card_cache_db:
+        card_cache = CardCache(db_path=args.card_cache_db)
+    try:
+        records, report = replay_directory(args.directory, args.pattern, args.recursive, card_cache=card_cache)
+    finally:
+        if card_cache is not None:
+            card_cache.close()
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        print(f"\n已将 {len(records)} 条职位记录保存到 {args.output}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"统计报告已保存到 {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,149 @@
 import os
+import sys
 import time
 import random
 import json
 import csv
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import re
 from datetime import datetime
+from urllib.parse import urlencode, urljoin
 from data_manager import DataManager
+from city_codes import CITY_CODES
+from retry_policy import CircuitBreaker, PageNotReadyError, RetryPolicy
+from zhipin_card_parser import page_has_no_jobs
+from crawl_metrics import CrawlMetrics
+
+# lxml可选：未安装时回退到BeautifulSoup(html.parser)
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    USE_LXML = True
+except ImportError:
+    USE_LXML = False
+
+# 解析后端：
+#   lxml        直接用lxml解析并执行预编译的CSS选择器（最快）
+#   bs4-lxml    BeautifulSoup + lxml解析器，只构建 ul.job-list-box 子树
+#   html.parser BeautifulSoup + 纯Python解析器，只构建 ul.job-list-box 子树
+PARSER_BACKENDS = ['lxml', 'bs4-lxml', 'html.parser']
+DEFAULT_PARSER = 'lxml' if USE_LXML else 'html.parser'
+
+JOB_ITEM_SELECTOR = 'ul.job-list-box > li'
+# 字段名 -> (CSS选择器, 是否必需)
+JOB_FIELD_SELECTORS = {
+    # .job-title 还包含工作地点，只取职位名（与 zhipin_card_parser 相同）
+    'title': ('.job-name', True),
+    'company': ('.company-name', True),
+    'salary': ('.salary', True),
+    'location': ('.job-area', True),
+    'experience': ('.job-info .experience', False),
+}
+# 职位详情页链接
+JOB_LINK_SELECTOR = 'a[href*="job_detail"]'
+
+# 只解析职位列表所在的ul，跳过页头、筛选栏和页脚
+JOB_LIST_STRAINER = SoupStrainer('ul', class_='job-list-box')
+
+# 预编译的选择器，避免每个职位重复解析CSS
+_SOUP_ITEM_SELECTOR = soupsieve.compile(JOB_ITEM_SELECTOR)
+_SOUP_FIELD_SELECTORS = {field: soupsieve.compile(css) for field, (css, _) in JOB_FIELD_SELECTORS.items()}
+_SOUP_LINK_SELECTOR = soupsieve.compile(JOB_LINK_SELECTOR)
+if USE_LXML:
+    _LXML_ITEM_SELECTOR = CSSSelector(JOB_ITEM_SELECTOR, translator='html')
+    # 字段在li内部查找，不匹配li本身
+    _LXML_FIELD_SELECTORS = {
+        field: CSSSelector(css, translator='html') for field, (css, _) in JOB_FIELD_SELECTORS.items()
+    }
+    _LXML_LINK_SELECTOR = CSSSelector(JOB_LINK_SELECTOR, translator='html')
+
+
+def _parse_items_lxml(html):
+    """用lxml解析，返回 (职位条目数, [字段文本dict或None, ...])"""
+    root = lxml.html.fromstring(html)
+    items = _LXML_ITEM_SELECTOR(root)
+    parsed = []
+    for item in items:
+        fields = {}
+        for field, selector in _LXML_FIELD_SELECTORS.items():
+            matches = [elem for elem in selector(item) if elem is not item]
+            fields[field] = matches[0].text_content().strip() if matches else None
+        links = _LXML_LINK_SELECTOR(item)
+        fields['detail_link'] = links[0].get('href') if links else None
+        parsed.append(fields)
+    return len(items), parsed
+
+
+def _parse_items_soup(html, features):
+    """用BeautifulSoup解析 ul.job-list-box 子树，返回 (职位条目数, [字段文本dict, ...])"""
+    soup = BeautifulSoup(html, features, parse_only=JOB_LIST_STRAINER)
+    items = _SOUP_ITEM_SELECTOR.select(soup)
+    parsed = []
+    for item in items:
+        fields = {}
+        for field, selector in _SOUP_FIELD_SELECTORS.items():
+            elem = selector.select_one(item)
+            fields[field] = elem.text.strip() if elem else None
+        link = _SOUP_LINK_SELECTOR.select_one(item)
+        fields['detail_link'] = link.get('href') if link else None
+        parsed.append(fields)
+    return len(items), parsed
+
+
+def parse_job_list(html, keyword=None, parser=DEFAULT_PARSER, crawl_time=None, base_url='https://www.zhipin.com'):
+    """
+    解析搜索结果页中的职位列表
+    :param html: 搜索结果页HTML
+    :param keyword: 写入记录的搜索关键词
+    :param parser: 解析后端，见 PARSER_BACKENDS
+    :param crawl_time: 爬取时间，默认为当前时间（整页共用一个时间戳）
+    :param base_url: 将相对的详情页链接补全为绝对地址
+    :return: (职位条目数, 职位信息列表)，缺少必需字段的条目会被跳过
+    """
+    if parser == 'lxml' and USE_LXML:
+        item_count, parsed = _parse_items_lxml(html)
+    elif parser == 'bs4-lxml' and USE_LXML:
+        item_count, parsed = _parse_items_soup(html, 'lxml')
+    elif parser in PARSER_BACKENDS:
+        item_count, parsed = _parse_items_soup(html, 'html.parser')
+    else:
+        raise ValueError(f"未知的解析后端: {parser}")
+
+    if crawl_time is None:
+        crawl_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    jobs = []
+    for fields in parsed:
+        # 跳过没有找到完整信息的职位
+        if not all(fields[field] is not None for field, (_, required) in JOB_FIELD_SELECTORS.items() if required):
+            continue
+        jobs.append({
+            'title': fields['title'],
+            'company': fields['company'],
+            'salary': fields['salary'],
+            'location': fields['location'],
+            'experience': fields['experience'] if fields['experience'] is not None else "经验不限",
+            'detail_link': urljoin(base_url + '/', fields['detail_link']) if fields['detail_link'] else '',
+            'crawl_time': crawl_time,
+            'keyword': keyword  # 添加搜索关键词
+        })
+    return item_count, jobs
 
 class ZhipinScraper:
-    def __init__(self):
+    def __init__(self, base_url='https://www.zhipin.com', parser=DEFAULT_PARSER, rate_limiter=None,
+                 retry_policy=None, circuit_breaker=None, metrics=None):
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"未知的解析后端: {parser}，可选: {', '.join(PARSER_BACKENDS)}")
+        if parser != 'html.parser' and not USE_LXML:
+            print(f"未安装lxml，解析后端 {parser} 回退为 html.parser")
+            parser = 'html.parser'
         self.jobs = []
+        # 静态页面解析后端
+        self.parser = parser
+        # 网站地址，压测时可指向本地模拟服务（mock_zhipin_server.py）
+        self.base_url = base_url.rstrip('/')
         self.data_dir = 'data'
         self.data_manager = DataManager(self.data_dir)
         
@@ -24,11 +156,21 @@ class ZhipinScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Referer': 'https://www.zhipin.com/',
+            'Referer': f'{self.base_url}/',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0',
         }
+        # 单次请求超时（秒）
+        self.request_timeout = 30
+        # 请求限速器（rate_limiter.RateLimiter），可与详情页补充任务共用
+        self.rate_limiter = rate_limiter
+        # 失败重试规则：超时、连接错误、429/5xx 最多尝试3次，403/404等不重试
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=3, base_delay=5, max_delay=60)
+        # 同一关键词连续3页失败时跳过该关键词，所有关键词合计连续6页失败时暂停爬取
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(failure_threshold=3, global_threshold=6, cooldown=300)
+        # 各阶段耗时统计（crawl_metrics.CrawlMetrics），多个爬虫可以共用一个实例
+        self.metrics = metrics or CrawlMetrics()
         # 默认使用的搜索关键词
         self.default_keywords = ['Python', '数据分析', '前端', 'Java', '人工智能']
         
@@ -53,6 +195,46 @@ class ZhipinScraper:
             
         print(f"成功生成 {count} 条模拟职位数据")
         
+    def scrape_page(self, keyword, city, page, filters=None):
+        """
+        爬取一页搜索结果
+        :param keyword: 搜索关键词
+        :param city: 城市代码
+        :param page: 页码
+        :param filters: 搜索筛选条件，如 {'salary': '405', 'experience': '104'}
+        :return: (职位条目数, 职位信息列表)；响应状态码不是200时抛出 requests.HTTPError，
+                 页面既没有职位列表也没有无搜索结果提示（登录/验证页等）时抛出 PageNotReadyError
+        """
+        # 构建URL - 这里使用的是BOSS直聘搜索页面的URL格式
+        url = f"{self.base_url}/web/geek/job?query={keyword}&city={city}&page={page}"
+        if filters:
+            url += '&' + urlencode(filters)
+        
+        start = time.perf_counter()
+        status = "error"
+        try:
+            # 发送请求
+            if self.rate_limiter:
+                with self.metrics.stage("rate_limit"):
+                    self.rate_limiter.acquire()
+            with self.metrics.stage("http_get"):
+                response = requests.get(url, headers=self.headers, timeout=self.request_timeout)
+            if response.status_code != 200:
+                raise requests.HTTPError(f"请求失败，状态码: {response.status_code}", response=response)
+
+            # 解析HTML
+            with self.metrics.stage("parse"):
+                item_count, jobs = parse_job_list(response.text, keyword, parser=self.parser, base_url=self.base_url)
+            # 只有页面提示没有搜索结果时才是真正的空页，否则交给重试策略退避后重新请求
+            if not item_count and not page_has_no_jobs(response.text):
+                raise PageNotReadyError(f"第{page}页没有找到职位列表，可能被重定向到登录或验证页面")
+            status = "ok" if jobs else "empty"
+            self.metrics.inc("jobs_total", len(jobs))
+            return item_count, jobs
+        finally:
+            self.metrics.observe("page_seconds", time.perf_counter() - start)
+            self.metrics.inc("pages_total", status=status)
+        
     def scrape_zhipin(self, keywords=None, city='101010100', pages=2):
         """
         爬取BOSS直聘网站的职位数据
@@ -66,83 +248,54 @@ class ZhipinScraper:
             
         total_scraped = 0
         
-        # 城市代码映射
-        city_codes = {
-            '北京': '101010100',
-            '上海': '101020100',
-            '广州': '101280100',
-            '深圳': '101280600',
-            '杭州': '101210100',
-            '成都': '101270100'
-        }
-        
         # 对每个关键词进行爬取
         for keyword in keywords:
             print(f"正在爬取关键词: {keyword}")
             
             for page in range(1, pages + 1):
+                # 连续失败过多时暂停整个爬虫，冷却后放行一次试探请求
+                pause = self.circuit_breaker.retry_after()
+                if pause > 0:
+                    print(f"  连续失败过多，暂停 {pause:.0f} 秒")
+                    time.sleep(pause)
+                if not self.circuit_breaker.allow(keyword):
+                    print(f"  关键词 '{keyword}' 连续失败过多，跳过剩余页面")
+                    break
+                
                 try:
                     print(f"  爬取第 {page} 页...")
                     
-                    # 构建URL - 这里使用的是BOSS直聘搜索页面的URL格式
-                    url = f"https://www.zhipin.com/web/geek/job?query={keyword}&city={city}&page={page}"
-                    
-                    # 发送请求
-                    response = requests.get(url, headers=self.headers)
-                    
-                    # 如果响应状态码不是200，跳过本次循环
-                    if response.status_code != 200:
-                        print(f"  请求失败，状态码: {response.status_code}")
+                    try:
+                        item_count, page_jobs = self.retry_policy.call(
+                            self.scrape_page, keyword, city, page,
+                            on_retry=lambda attempt, error, delay: print(f"  第{attempt}次尝试失败: {error}，{delay:.1f} 秒后重试")
+                        )
+                    except PageNotReadyError as e:
+                        # 重试用完仍然没有职位列表，可能是页面结构变化或IP被封
+                        self.circuit_breaker.record_failure(keyword)
+                        print(f"  {str(e)}")
+                        break
+                    except requests.RequestException as e:
+                        # 重试用完或不可重试（如403/404），跳过本页
+                        self.circuit_breaker.record_failure(keyword)
+                        if isinstance(e, requests.HTTPError) and e.response is not None:
+                            print(f"  请求失败，状态码: {e.response.status_code}")
+                        else:
+                            print(f"  请求失败: {str(e)}")
                         continue
+                    except Exception:
+                        # 解析错误等也要记录结果，否则冷却后放行的试探请求一直没有结果
+                        self.circuit_breaker.record_failure(keyword)
+                        raise
+                    self.circuit_breaker.record_success(keyword)
                     
-                    # 解析HTML
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 获取职位列表
-                    job_list = soup.select('ul.job-list-box li')
-                    
-                    if not job_list:
-                        print("  未找到职位信息，可能是页面结构变化或IP被封")
+                    if not item_count:
+                        print("  页面提示没有找到相关职位，停止翻页")
                         break
                     
-                    # 解析每个职位
-                    for job_item in job_list:
-                        try:
-                            # 提取职位信息
-                            title_elem = job_item.select_one('.job-title')
-                            company_elem = job_item.select_one('.company-name')
-                            salary_elem = job_item.select_one('.salary')
-                            location_elem = job_item.select_one('.job-area')
-                            experience_elem = job_item.select_one('.job-info .experience')
-                            
-                            # 跳过没有找到完整信息的职位
-                            if not all([title_elem, company_elem, salary_elem, location_elem]):
-                                continue
-                            
-                            # 提取文本并清理
-                            title = title_elem.text.strip() if title_elem else "未知职位"
-                            company = company_elem.text.strip() if company_elem else "未知公司"
-                            salary = salary_elem.text.strip() if salary_elem else "薪资面议"
-                            location = location_elem.text.strip() if location_elem else "未知地点"
-                            experience = experience_elem.text.strip() if experience_elem else "经验不限"
-                            
-                            # 创建职位信息字典
-                            job_info = {
-                                'title': title,
-                                'company': company,
-                                'salary': salary,
-                                'location': location,
-                                'experience': experience,
-                                'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'keyword': keyword  # 添加搜索关键词
-                            }
-                            
-                            # 将职位信息添加到列表
-                            self.jobs.append(job_info)
-                            total_scraped += 1
-                            
-                        except Exception as e:
-                            print(f"  解析职位信息出错: {str(e)}")
+                    # 将职位信息添加到列表
+                    self.jobs.extend(page_jobs)
+                    total_scraped += len(page_jobs)
                     
                     # 打印进度
                     print(f"  第 {page} 页已爬取，当前共 {total_scraped} 条职位")
@@ -158,7 +311,11 @@ class ZhipinScraper:
         print(f"所有关键词爬取完成，共获取 {total_scraped} 条职位信息")
         return total_scraped
 
-    def scrape_zhipin_with_selenium(self, keywords=None, city='101010100', pages=2):
+    def scrape_zhipin_with_selenium(self, keywords=None, city='101010100', pages=2, interactive=True):
+        """
+        使用浏览器爬取职位数据
+        :param interactive: 是否等待用户在浏览器中登录后按Enter继续；无人值守运行时为False，直接开始爬取
+        """
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.chrome.service import Service
@@ -184,8 +341,11 @@ class ZhipinScraper:
         
         try:
             # 先访问主页，可能需要登录
-            driver.get("https://www.zhipin.com/")
-            input("请在浏览器中登录BOSS直聘，然后按Enter继续...")
+            driver.get(f"{self.base_url}/")
+            if interactive:
+                input("请在浏览器中登录BOSS直聘，然后按Enter继续...")
+            else:
+                time.sleep(3)
             
             for keyword in keywords:
                 print(f"正在爬取关键词: {keyword}")
@@ -193,7 +353,7 @@ class ZhipinScraper:
                 for page in range(1, pages + 1):
                     try:
                         print(f"  爬取第 {page} 页...")
-                        url = f"https://www.zhipin.com/web/geek/job?query={keyword}&city={city}&page={page}"
+                        url = f"{self.base_url}/web/geek/job?query={keyword}&city={city}&page={page}"
                         driver.get(url)
                         
                         # 等待职位列表加载
@@ -210,7 +370,7 @@ class ZhipinScraper:
                         if not job_items:
                             print("  未找到职位信息，可能是选择器变化")
                             # 尝试其他可能的选择器
-                            job_items = driver.find_elements(By.CSS_SELECTOR, '.job-list-box li')
+                            job_items = driver.find_elements(By.CSS_SELECTOR, '.job-list-box > li')
                         
                         if not job_items:
                             print("  仍未找到职位信息，请检查网页结构")
@@ -290,7 +450,19 @@ class ZhipinScraper:
         print(f"最早记录: {stats['earliest_record']}")
         print(f"最近更新: {stats['last_update']}")
 
-def main():
+def main(argv=None):
+    import argparse
+    from crawl_job import add_job_arguments, run_from_args
+    parser = argparse.ArgumentParser(description='BOSS直聘职位数据爬虫')
+    parser.add_argument('--config', type=str, default=None, help='任务配置文件（.json/.toml/.yaml），按配置无人值守地批量爬取')
+    parser.add_argument('--batch', action='store_true', help='不询问输入，直接按命令行参数爬取')
+    add_job_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    # 无人值守批量模式，见 crawl_job.py
+    if args.config or args.batch:
+        return run_from_args(args, args.config)
+    
     scraper = ZhipinScraper()
     
     try:
@@ -308,18 +480,8 @@ def main():
                 keywords_input = input("请输入搜索关键词，用英文逗号分隔 (留空使用默认关键词): ")
                 keywords = [k.strip() for k in keywords_input.split(',')] if keywords_input.strip() else None
                 
-                city_input = input("请输入城市 (北京/上海/广州/深圳/杭州/成都，留空默认为北京): ")
-                city_code = '101010100'  # 默认北京
-                if city_input.strip() in ['北京', '上海', '广州', '深圳', '杭州', '成都']:
-                    city_maps = {
-                        '北京': '101010100',
-                        '上海': '101020100',
-                        '广州': '101280100',
-                        '深圳': '101280600',
-                        '杭州': '101210100',
-                        '成都': '101270100'
-                    }
-                    city_code = city_maps[city_input.strip()]
+                city_input = input("请输入城市 (北京/上海/广州/深圳/杭州/成都等，留空默认为北京): ")
+                city_code = CITY_CODES.get(city_input.strip(), CITY_CODES['北京'])
                 
                 pages = int(input("请输入每个关键词爬取的页数 (默认2): ") or 2)
                 
@@ -348,6 +510,7 @@ def main():
         scraper.print_stats()
     
     print("\n所有数据都将存储在集中的数据文件中，可以随时使用data_analysis.py进行分析。")
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
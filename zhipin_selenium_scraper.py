@@ -1,11 +1,13 @@
 import os
+import sys
 import time
 import random
 import json
 from datetime import datetime
 import traceback
 import re
-from urllib.parse import quote
+import shutil
+from urllib.parse import quote, urlencode, urlparse
 import logging
 #D:\BigData\drivers\msedgedriver.exe
 # 处理Selenium依赖项
@@ -31,6 +33,24 @@ except ImportError:
     print("如需自动管理EdgeDriver，请安装: pip install webdriver-manager")
     exit(1)
 
+# psutil为可选依赖，用于监控浏览器内存占用
+try:
+    import psutil
+    USE_PSUTIL = True
+except ImportError:
+    USE_PSUTIL = False
+
+from card_cache import CardCache
+from crawl_metrics import CrawlMetrics
+from city_codes import CITY_CODES
+from retry_policy import CircuitBreaker, PageNotReadyError, RetryPolicy, classify_error
+from zhipin_api import (
+    BASE_URL, decode_response_body, find_job_list_requests, map_job_list_response, response_matches_page
+)
+from zhipin_card_parser import (
+    CARD_SELECTORS, CARD_XPATHS, SelectorStats, extract_card, page_has_no_jobs
+)
+
 # 导入数据管理器类
 try:
     from data_manager import DataManager
@@ -78,13 +98,116 @@ except ImportError:
             }
             return stats
 
+
+# EdgeDriver路径缓存文件，首次成功初始化后写入，之后启动直接复用
+DRIVER_CACHE_FILE = os.path.join("drivers", "driver_cache.json")
+
+# 本地可能存放EdgeDriver的位置
+LOCAL_DRIVER_PATHS = [
+    "D:\\BigData\\drivers\\msedgedriver.exe",
+    "./msedgedriver.exe",
+    "./drivers/msedgedriver.exe",
+    "./drivers/msedgedriver",
+    "C:/msedgedriver.exe",
+    "D:/msedgedriver.exe",
+    "D:/BigData/msedgedriver.exe",
+    os.path.join(os.getcwd(), "msedgedriver.exe"),
+    os.path.join(os.getcwd(), "drivers", "msedgedriver.exe")
+]
+
+
+def load_cached_driver_path(cache_file=DRIVER_CACHE_FILE):
+    """读取缓存的EdgeDriver路径，文件不存在或路径失效时返回None"""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            driver_path = json.load(f).get("driver_path")
+    except (OSError, ValueError):
+        return None
+    if driver_path and os.path.exists(driver_path):
+        return driver_path
+    return None
+
+
+def save_cached_driver_path(driver_path, method, cache_file=DRIVER_CACHE_FILE):
+    """记录成功初始化所用的EdgeDriver路径"""
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "driver_path": os.path.abspath(driver_path),
+                "method": method,
+                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"警告: 无法写入EdgeDriver缓存: {str(e)}")
+
+
+def clear_cached_driver_path(cache_file=DRIVER_CACHE_FILE):
+    """删除失效的EdgeDriver缓存"""
+    if os.path.exists(cache_file):
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+
+
+class WebElementAdapter:
+    """职位卡片解析适配器：在浏览器中通过WebElement执行选择器"""
+    
+    def find_xpath(self, node, xpath):
+        return node.find_elements(By.XPATH, xpath)
+    
+    def find_css(self, node, selector):
+        return node.find_elements(By.CSS_SELECTOR, selector)
+    
+    def text(self, node):
+        return node.text.strip()
+    
+    def attr(self, node, name):
+        return node.get_attribute(name)
+    
+    def parent(self, node):
+        return node.find_element(By.XPATH, "./..")
+    
+    def outer_html(self, node):
+        return node.get_attribute("outerHTML")
+
+
 class ZhipinSeleniumScraper:
     """
     基于Selenium的Boss直聘数据抓取器
     """
     
-    def __init__(self, city="北京", keyword="数据分析", pages=3, timeout=10, debug=True):
-        """初始化参数"""
+    def __init__(self, city="北京", keyword="数据分析", pages=3, timeout=10, debug=True,
+                 driver_path=None, offline=False, profile_dir=None, debugger_address=None,
+                 fast_start=False, max_pages_per_driver=None, max_browser_rss_mb=None,
+                 capture_api=False, base_url=BASE_URL,
+                 search_filters=None, card_cache=None, retry_policy=None, circuit_breaker=None,
+                 interactive=True, metrics=None):
+        """
+        初始化参数
+        
+        Args:
+            driver_path: 指定EdgeDriver路径，优先于缓存和自动查找
+            offline: 离线模式，不使用webdriver_manager/Selenium Manager联网下载驱动
+            profile_dir: 持久化浏览器用户目录，复用登录状态和缓存（热会话）
+            debugger_address: 连接已运行的Edge浏览器（如 127.0.0.1:9222）
+            fast_start: 跳过首页，直接用城市代码构造搜索URL
+            max_pages_per_driver: 每个浏览器实例最多访问的页面数，超过后自动重启
+            max_browser_rss_mb: 浏览器进程树内存上限（MB），超过后自动重启，需要psutil
+            capture_api: 开启浏览器性能日志，直接从职位列表接口响应中提取职位数据
+            base_url: 网站地址，压测时可指向本地模拟服务（mock_zhipin_server.py）
+            search_filters: 搜索筛选条件，如 {"salary": "405", "experience": "104"}，见 query_partitioner.py
+            card_cache: card_cache.CardCache，按卡片HTML复用提取结果，默认为只在内存中缓存
+            retry_policy: retry_policy.RetryPolicy，单页失败时的重试规则，默认最多尝试3次
+            circuit_breaker: retry_policy.CircuitBreaker，同一查询连续3页失败时暂停该查询
+            interactive: 是否允许在控制台等待用户输入（驱动路径、登录、手动设置搜索条件），
+                无人值守运行（crawl_job.py、crawl_frontier.py）时为False，需要输入的步骤直接视为失败
+            metrics: crawl_metrics.CrawlMetrics，记录各阶段耗时，多个爬虫可以共用一个实例
+        """
+        init_start = time.perf_counter()
         self.city = city
         self.keyword = keyword
         self.pages = pages
@@ -92,6 +215,40 @@ class ZhipinSeleniumScraper:
         self.debug = debug
         self.debug_dir = "debug"
         self.data_dir = "data"
+        self.driver_path = driver_path
+        self.offline = offline
+        self.profile_dir = profile_dir
+        self.debugger_address = debugger_address
+        self.fast_start = fast_start
+        self.current_search_url = None
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.capture_api = capture_api
+        self.base_url = base_url.rstrip("/")
+        self.search_filters = dict(search_filters or {})
+        self.interactive = interactive
+        self.metrics = metrics or CrawlMetrics()
+        
+        # 职位卡片解析规则与离线回放共用，这里统计各选择器命中情况
+        self.card_adapter = WebElementAdapter()
+        self.selector_stats = SelectorStats()
+        # 重复出现的卡片直接使用缓存的提取结果，不再在浏览器中执行选择器
+        self.card_cache = card_cache if card_cache is not None else CardCache()
+        
+        # 页面抓取失败时的重试和熔断规则
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=3, base_delay=5, max_delay=60)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(failure_threshold=3, global_threshold=6, cooldown=300)
+        
+        # 浏览器重启统计
+        self.driver_stats = {
+            "restarts": 0,
+            "recycle_restarts": 0,
+            "crash_restarts": 0,
+            "restart_seconds": 0.0,
+            "pages_on_driver": 0,
+            "total_pages": 0,
+            "peak_rss_mb": 0.0
+        }
         
         # 创建debug和data目录
         for directory in [self.debug_dir, self.data_dir]:
@@ -107,6 +264,8 @@ class ZhipinSeleniumScraper:
         # 数据管理器
         self.data_manager = DataManager(self.data_dir)
         
+        self.logger.info(f"爬虫启动完成，总耗时 {time.perf_counter() - init_start:.2f} 秒")
+        
     def setup_logging(self):
         """设置日志"""
         log_format = '%(asctime)s - %(levelname)s - %(message)s'
@@ -120,13 +279,19 @@ class ZhipinSeleniumScraper:
             file_handler.setFormatter(logging.Formatter(log_format))
             self.logger.addHandler(file_handler)
     
-    def init_driver(self):
-        """初始化WebDriver，使用多种策略确保稳定性"""
-        print("正在初始化Edge浏览器...")
-        
-        # 配置Edge选项
+    def build_options(self):
+        """构建Edge启动选项"""
         options = Options()
         
+        # 接口捕获模式需要开启性能日志（包含Network事件）
+        if self.capture_api:
+            options.set_capability('ms:loggingPrefs', {'performance': 'ALL'})
+        
+        # 连接已运行的浏览器时，启动参数由该浏览器决定，只需指定调试地址
+        if self.debugger_address:
+            options.add_experimental_option('debuggerAddress', self.debugger_address)
+            return options
+        
         # 无头模式（取消注释以启用）
         # options.add_argument('--headless')
         
@@ -144,6 +309,10 @@ class ZhipinSeleniumScraper:
         ]
         options.add_argument(f'user-agent={random.choice(user_agents)}')
         
+        # 持久化用户目录：保留登录状态、Cookie和HTTP缓存
+        if self.profile_dir:
+            options.add_argument(f'--user-data-dir={os.path.abspath(self.profile_dir)}')
+        
         # 其他优化选项
         options.add_argument('--disable-notifications')
         options.add_argument('--disable-popup-blocking')
@@ -151,86 +320,99 @@ class ZhipinSeleniumScraper:
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         
-        # 尝试多种初始化方式
-        driver = None
-        error_messages = []
+        return options
+    
+    def iter_driver_candidates(self, error_messages):
+        """按代价从低到高依次产生 (方式, EdgeDriver路径) ，路径为None表示交给Selenium自行查找"""
+        seen = set()
         
-        # 定义默认EdgeDriver路径
-        default_driver_path = "D:\\BigData\\drivers\\msedgedriver.exe"
+        def unseen(path):
+            key = os.path.normcase(os.path.abspath(path))
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
         
-        # 方法0: 优先使用已知的EdgeDriver路径
-        if os.path.exists(default_driver_path):
-            try:
-                print(f"使用默认EdgeDriver路径: {default_driver_path}")
-                service = Service(default_driver_path)
-                driver = webdriver.Edge(service=service, options=options)
-                print(f"成功初始化Edge浏览器")
-                return driver
-            except Exception as e:
-                error_messages.append(f"默认路径失败: {str(e)}")
-                print(f"使用默认EdgeDriver路径初始化失败: {str(e)}")
+        # 方法0: 显式指定的路径
+        if self.driver_path and os.path.exists(self.driver_path) and unseen(self.driver_path):
+            yield "指定路径", self.driver_path
         
-        # 方法1: 仅当默认路径不可用时才询问用户
-        if driver is None:
-            print("默认EdgeDriver路径无效或无法使用")
-            print("请确保安装了Microsoft Edge浏览器")
-            print("请前往 https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/ 下载与您Edge版本匹配的WebDriver")
-            msedgedriver_path = input("请输入msedgedriver.exe的完整路径（例如：D:\\msedgedriver.exe），或按Enter尝试自动查找: ")
-            if msedgedriver_path and os.path.exists(msedgedriver_path):
+        # 方法1: 上次成功使用的路径
+        cached_path = load_cached_driver_path()
+        if cached_path and unseen(cached_path):
+            yield "缓存路径", cached_path
+        
+        # 方法2: 本地已知位置
+        for driver_path in LOCAL_DRIVER_PATHS:
+            if os.path.exists(driver_path) and unseen(driver_path):
+                yield "本地路径", driver_path
+        
+        # 方法3: 系统PATH中的EdgeDriver
+        system_path = shutil.which("msedgedriver")
+        if system_path and unseen(system_path):
+            yield "系统PATH", system_path
+        
+        # 以下方式需要联网，离线模式下跳过
+        if not self.offline:
+            # 方法4: 使用webdriver_manager自动下载并配置EdgeDriver
+            if USE_WEBDRIVER_MANAGER:
                 try:
-                    service = Service(msedgedriver_path)
-                    driver = webdriver.Edge(service=service, options=options)
-                    print(f"使用用户提供的EdgeDriver路径成功初始化浏览器: {msedgedriver_path}")
-                    return driver
+                    yield "webdriver_manager", EdgeChromiumDriverManager().install()
                 except Exception as e:
-                    error_messages.append(f"用户提供的路径失败: {str(e)}")
-                    print(f"使用用户提供的EdgeDriver路径初始化失败: {str(e)}")
+                    error_messages.append(f"webdriver_manager失败: {str(e)}")
+                    print(f"使用webdriver_manager获取EdgeDriver失败: {str(e)}")
+            
+            # 方法5: 由Selenium Manager查找或下载
+            yield "Selenium Manager", None
         
-        # 方法2: 使用webdriver_manager自动下载并配置EdgeDriver
-        if USE_WEBDRIVER_MANAGER:
-            try:
-                from webdriver_manager.microsoft import EdgeChromiumDriverManager
-                service = Service(EdgeChromiumDriverManager().install())
-                driver = webdriver.Edge(service=service, options=options)
-                print("使用webdriver_manager成功初始化Edge浏览器")
-                return driver
-            except Exception as e:
-                error_messages.append(f"方法2失败: {str(e)}")
-                print(f"使用webdriver_manager初始化失败: {str(e)}")
+        # 方法6: 所有自动方式都失败后才询问用户
+        print("未能自动找到可用的EdgeDriver")
+        if not self.interactive:
+            print("非交互模式，请用 --driver-path 指定EdgeDriver路径")
+            return
+        print("请确保安装了Microsoft Edge浏览器")
+        print("请前往 https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/ 下载与您Edge版本匹配的WebDriver")
+        msedgedriver_path = input("请输入msedgedriver.exe的完整路径（例如：D:\\msedgedriver.exe），或按Enter放弃: ")
+        if msedgedriver_path and os.path.exists(msedgedriver_path):
+            yield "用户输入路径", msedgedriver_path
+    
+    def init_driver(self):
+        """初始化WebDriver，优先使用缓存的驱动路径，再依次尝试其他策略"""
+        print("正在初始化Edge浏览器...")
+        start_time = time.perf_counter()
         
-        # 方法3: 使用系统环境中的EdgeDriver
-        if driver is None:
+        options = self.build_options()
+        driver = None
+        error_messages = []
+        cached_path = load_cached_driver_path()
+        
+        for method, driver_path in self.iter_driver_candidates(error_messages):
+            attempt_start = time.perf_counter()
             try:
-                driver = webdriver.Edge(options=options)
-                print("使用系统EdgeDriver成功初始化浏览器")
-                return driver
+                if driver_path:
+                    driver = webdriver.Edge(service=Service(driver_path), options=options)
+                else:
+                    driver = webdriver.Edge(options=options)
             except Exception as e:
-                error_messages.append(f"方法3失败: {str(e)}")
-                print(f"使用系统EdgeDriver初始化失败: {str(e)}")
-        
-        # 方法4: 尝试指定EdgeDriver路径
-        if driver is None:
-            possible_paths = [
-                "./msedgedriver.exe",
-                "./drivers/msedgedriver.exe",
-                "C:/msedgedriver.exe",
-                "D:/msedgedriver.exe",
-                "D:/BigData/msedgedriver.exe",
-                "D:/BigData/drivers/msedgedriver.exe",
-                os.path.join(os.getcwd(), "msedgedriver.exe"),
-                os.path.join(os.getcwd(), "drivers", "msedgedriver.exe")
-            ]
-            
-            for driver_path in possible_paths:
-                if os.path.exists(driver_path):
-                    try:
-                        service = Service(driver_path)
-                        driver = webdriver.Edge(service=service, options=options)
-                        print(f"使用本地EdgeDriver成功初始化浏览器: {driver_path}")
-                        return driver
-                    except Exception as e:
-                        error_messages.append(f"方法4 ({driver_path}) 失败: {str(e)}")
-                        print(f"使用本地EdgeDriver ({driver_path}) 初始化失败: {str(e)}")
+                error_messages.append(f"{method} ({driver_path}) 失败: {str(e)}")
+                print(f"使用{method}初始化失败: {str(e)}")
+                # 缓存的驱动已不可用（例如浏览器升级），删除缓存
+                if driver_path and driver_path == cached_path:
+                    clear_cached_driver_path()
+                continue
+            
+            # Selenium Manager 找到或下载的驱动路径记录在 service.path 中，缓存下来，
+            # 之后启动不再联网解析
+            if not driver_path:
+                driver_path = getattr(getattr(driver, "service", None), "path", None)
+            self.logger.info(
+                f"使用{method}成功初始化Edge浏览器: {driver_path or '自动查找'}，"
+                f"本次启动 {time.perf_counter() - attempt_start:.2f} 秒，"
+                f"累计 {time.perf_counter() - start_time:.2f} 秒"
+            )
+            if driver_path and os.path.exists(driver_path) and driver_path != cached_path:
+                save_cached_driver_path(driver_path, method)
+            break
         
         # 如果所有方法都失败
         if driver is None:
@@ -253,10 +435,169 @@ class ZhipinSeleniumScraper:
         
         return driver
         
+    def get_browser_rss_mb(self):
+        """统计EdgeDriver及其启动的浏览器进程树的内存占用（MB），无法获取时返回None"""
+        if not USE_PSUTIL or self.debugger_address:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+        
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+    
+    def is_driver_alive(self):
+        """检查浏览器会话是否仍然可用"""
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+    
+    def should_recycle_driver(self):
+        """判断是否需要回收当前浏览器，返回原因或None"""
+        if self.max_pages_per_driver and self.driver_stats["pages_on_driver"] >= self.max_pages_per_driver:
+            return f"已访问 {self.driver_stats['pages_on_driver']} 个页面"
+        
+        if self.max_browser_rss_mb:
+            rss_mb = self.get_browser_rss_mb()
+            if rss_mb is not None:
+                self.driver_stats["peak_rss_mb"] = max(self.driver_stats["peak_rss_mb"], rss_mb)
+                if rss_mb >= self.max_browser_rss_mb:
+                    return f"浏览器内存 {rss_mb:.0f}MB 超过上限 {self.max_browser_rss_mb}MB"
+        return None
+    
+    def restart_driver(self, reason, crashed=False):
+        """关闭当前浏览器并重新初始化，恢复到当前搜索页"""
+        start_time = time.perf_counter()
+        self.logger.warning(f"重启浏览器: {reason}")
+        
+        try:
+            self.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"关闭旧浏览器失败: {str(e)}")
+        
+        self.driver = self.init_driver()
+        
+        # 恢复搜索上下文，确保之后按页码翻页的URL和Cookie仍然有效
+        if self.current_search_url:
+            try:
+                self.driver.get(self.current_search_url)
+            except WebDriverException as e:
+                self.logger.warning(f"恢复搜索页失败: {str(e)}")
+        
+        elapsed = time.perf_counter() - start_time
+        self.driver_stats["restarts"] += 1
+        self.driver_stats["crash_restarts" if crashed else "recycle_restarts"] += 1
+        self.driver_stats["restart_seconds"] += elapsed
+        self.driver_stats["pages_on_driver"] = 0
+        self.logger.info(f"浏览器重启完成，耗时 {elapsed:.2f} 秒，累计重启 {self.driver_stats['restarts']} 次")
+    
+    def load_page(self, url):
+        """访问页面，必要时先回收浏览器"""
+        reason = self.should_recycle_driver()
+        if reason:
+            self.restart_driver(reason)
+        
+        with self.metrics.stage("page_load"):
+            self.driver.get(url)
+        self.driver_stats["pages_on_driver"] += 1
+        self.driver_stats["total_pages"] += 1
+    
+    def run_with_driver_recovery(self, func, *args):
+        """执行抓取函数，浏览器崩溃时重启浏览器并重试一次"""
+        try:
+            return func(*args)
+        except WebDriverException as e:
+            if self.is_driver_alive():
+                raise
+            self.logger.error(f"浏览器崩溃: {str(e)}")
+            self.restart_driver("浏览器崩溃", crashed=True)
+            return func(*args)
+    
+    def log_driver_stats(self):
+        """输出浏览器重启统计"""
+        stats = self.driver_stats
+        self.logger.info(
+            f"浏览器统计: 访问页面 {stats['total_pages']} 个，重启 {stats['restarts']} 次"
+            f"（回收 {stats['recycle_restarts']}，崩溃 {stats['crash_restarts']}），"
+            f"重启耗时 {stats['restart_seconds']:.2f} 秒，内存峰值 {stats['peak_rss_mb']:.0f}MB"
+        )
+    
+    def drain_performance_log(self):
+        """清空已缓存的性能日志，避免把上一页的接口响应当成本页"""
+        try:
+            self.driver.get_log("performance")
+        except WebDriverException as e:
+            self.logger.warning(f"读取性能日志失败: {str(e)}")
+    
+    def collect_api_jobs(self, page, page_url=None, timeout=None):
+        """
+        从性能日志中等待职位列表接口响应，并映射为职位记录
+        
+        Args:
+            page: 页码
+            page_url: 正在加载的搜索页URL，只接受page/query/city参数与之一致的接口响应
+            timeout: 等待超时（秒）
+        
+        Returns:
+            职位记录列表；超时未捕获到接口响应、响应无法解析或接口返回错误时返回None（改用页面解析）
+        """
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.time() + timeout
+        pending = {}
+        
+        while time.time() < deadline:
+            try:
+                for request_id, url in find_job_list_requests(self.driver.get_log("performance")):
+                    if response_matches_page(url, page_url):
+                        pending[request_id] = url
+                    else:
+                        self.logger.info(f"忽略不属于第{page}页的职位列表接口响应: {url}")
+            except WebDriverException as e:
+                self.logger.warning(f"读取性能日志失败: {str(e)}")
+                return None
+            
+            for request_id, url in list(pending.items()):
+                try:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                except WebDriverException:
+                    # 响应体可能尚未接收完成，下一轮再取
+                    continue
+                
+                try:
+                    payload = decode_response_body(body)
+                except ValueError as e:
+                    self.logger.warning(f"解析职位列表接口响应失败: {str(e)}")
+                    return None
+                if self.debug:
+                    fixture_file = os.path.join(self.debug_dir, f"joblist_page_{page}.json")
+                    with open(fixture_file, "w", encoding="utf-8") as f:
+                        json.dump(payload, f, ensure_ascii=False, indent=2)
+                    self.logger.info(f"已保存职位列表接口响应到: {fixture_file}")
+                
+                try:
+                    return map_job_list_response(payload, base_url=self.base_url)
+                except ValueError as e:
+                    self.logger.warning(str(e))
+                    return None
+            
+            time.sleep(0.2)
+        
+        return None
+    
     def get_search_url(self, page=1):
         """构建搜索URL"""
         # 优先使用当前浏览器URL，保留所有搜索条件
-        if hasattr(self, "current_search_url"):
+        if self.current_search_url:
             # 将页码参数添加到已有URL
             base_url = self.current_search_url
             if "page=" in base_url:
@@ -271,17 +612,23 @@ class ZhipinSeleniumScraper:
         
         # 如果没有现有URL，则构建基本URL
         encoded_keyword = quote(self.keyword)
-        encoded_city = quote(self.city)
-        return f"https://www.zhipin.com/web/geek/job?query={encoded_keyword}&city={encoded_city}&page={page}"
+        encoded_city = CITY_CODES.get(self.city) or quote(self.city)
+        url = f"{self.base_url}/web/geek/job?query={encoded_keyword}&city={encoded_city}&page={page}"
+        if self.search_filters:
+            # 薪资、经验、学历、区域等筛选条件
+            url += "&" + urlencode(self.search_filters)
+        return url
     
+
     def wait_for_element(self, by, value, timeout=None):
         """等待元素加载"""
         if timeout is None:
             timeout = self.timeout
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
+            with self.metrics.stage("wait"):
+                element = WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((by, value))
+                )
             return element
         except TimeoutException:
             self.logger.warning(f"等待元素超时: {value}")
@@ -292,9 +639,10 @@ class ZhipinSeleniumScraper:
         if timeout is None:
             timeout = self.timeout
         try:
-            elements = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located((by, value))
-            )
+            with self.metrics.stage("wait"):
+                elements = WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_all_elements_located((by, value))
+                )
             return elements
         except TimeoutException:
             self.logger.warning(f"等待元素超时: {value}")
@@ -307,22 +655,27 @@ class ZhipinSeleniumScraper:
             source_path = os.path.join(self.debug_dir, f"page_{page_num}.html")
             
             try:
-                self.driver.save_screenshot(screenshot_path)
-                with open(source_path, "w", encoding="utf-8") as f:
-                    f.write(self.driver.page_source)
+                with self.metrics.stage("debug_capture"):
+                    self.driver.save_screenshot(screenshot_path)
+                    with open(source_path, "w", encoding="utf-8") as f:
+                        f.write(self.driver.page_source)
                 self.logger.info(f"保存调试信息: {screenshot_path} 和 {source_path}")
             except Exception as e:
                 self.logger.error(f"保存调试信息失败: {str(e)}")
     
     def extract_job_details(self, job_card):
         """提取职位详情"""
+        start = time.perf_counter()
+        source = "failed"
         try:
+            card_html = None
             # 调试：保存一个职位卡片的HTML结构，辅助分析
             try:
                 # 确保职位卡片内容完全加载
-                WebDriverWait(self.driver, 2).until(
-                    lambda x: job_card.get_attribute('outerHTML') and len(job_card.get_attribute('outerHTML')) > 100
-                )
+                with self.metrics.stage("card_wait"):
+                    WebDriverWait(self.driver, 2).until(
+                        lambda x: job_card.get_attribute('outerHTML') and len(job_card.get_attribute('outerHTML')) > 100
+                    )
                 
                 card_html = job_card.get_attribute('outerHTML')
                 if len(card_html) < 100:  # 检查HTML内容是否太短（可能未加载完成）
@@ -333,7 +686,7 @@ class ZhipinSeleniumScraper:
                     card_html = job_card.get_attribute('outerHTML')
                 
                 debug_file = os.path.join(self.debug_dir, f"job_card_{datetime.now().strftime('%H%M%S')}.html")
-                with open(debug_file, "w", encoding="utf-8") as f:
+                with self.metrics.stage("debug_capture"), open(debug_file, "w", encoding="utf-8") as f:
                     f.write(card_html)
                 self.logger.info(f"已保存职位卡片HTML到: {debug_file} 长度: {len(card_html)} 字符")
                 
@@ -356,360 +709,164 @@ class ZhipinSeleniumScraper:
             except Exception as e:
                 self.logger.warning(f"无法保存职位卡片HTML: {str(e)}")
             
-            # 直接使用XPath选择器可能更准确
-            xpath_selectors = {
-                "job_name": [
-                    ".//span[@class='job-name']", 
-                    ".//a[contains(@class, 'job-name')]",
-                    ".//span[contains(@class, 'job-title')]",
-                    ".//div[contains(@class, 'job-title')]",
-                    ".//div[contains(@class, 'name')]//span",
-                    ".//p[contains(@class, 'name')]"
-                ],
-                "salary": [
-                    ".//span[@class='salary']", 
-                    ".//span[contains(@class, 'red')]",
-                    ".//span[contains(@class, 'price')]",
-                    ".//span[contains(@class, 'money')]",
-                    ".//p[contains(@class, 'salary')]"
-                ],
-                "company_name": [
-                    ".//div[@class='company-name']", 
-                    ".//a[contains(@class, 'company-name')]",
-                    ".//span[contains(@class, 'company')]",
-                    ".//h3[contains(@class, 'company')]",
-                    ".//h3[contains(@class, 'company-name')]//a"
-                ],
-                "job_area": [
-                    ".//span[@class='job-area']", 
-                    ".//span[contains(@class, 'address')]",
-                    ".//span[contains(@class, 'area')]",
-                    ".//span[contains(@class, 'location')]",
-                    ".//p[contains(@class, 'job-text')]//span[1]",
-                    ".//span[contains(@class, 'job-area-wrapper')]//span"
-                ]
-            }
-            
-            # 尝试多种选择器组合 - CSS选择器
-            css_selectors = {
-                "job_name": [".job-name", ".job-title", "a.job-name", "a[ka=job-title]", ".name span", "p.name"],
-                "salary": [".salary", ".red", ".job-limit-tip", ".price", ".money", "p.salary"],
-                "company_name": [".company-name", ".company-text", "a[ka=job-company]", ".company", "h3.company-name a"],
-                "job_area": [".job-area", ".job-address", ".location-name", ".address", ".area", "p.job-text span:first-child", ".job-area-wrapper span"]
-            }
-            
-            job_data = {
-                "job_name": "未知",
-                "salary": "未知",
-                "company_name": "未知",
-                "job_area": "未知",
-                "job_requirements": [],
-                "hr_name": "未知",
-                "hr_title": "未知",
-                "publish_time": "未知",
-                "detail_link": "",
-                "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # 首先尝试XPath选择器
-            for field, xpath_list in xpath_selectors.items():
-                for xpath in xpath_list:
-                    try:
-                        elements = job_card.find_elements(By.XPATH, xpath)
-                        if elements and elements[0].text.strip():
-                            job_data[field] = elements[0].text.strip()
-                            self.logger.info(f"使用XPath '{xpath}' 成功提取 {field}: {job_data[field]}")
-                            break
-                    except Exception as e:
-                        continue
-            
-            # 如果XPath没有找到，再尝试CSS选择器
-            for field, selector_list in css_selectors.items():
-                if job_data[field] == "未知":  # 只有在XPath未找到时才尝试
-                    for selector in selector_list:
-                        try:
-                            elements = job_card.find_elements(By.CSS_SELECTOR, selector)
-                            if elements and elements[0].text.strip():
-                                job_data[field] = elements[0].text.strip()
-                                self.logger.info(f"使用CSS '{selector}' 成功提取 {field}: {job_data[field]}")
-                                break
-                        except:
-                            continue
-            
-            # 提取职位要求 - 更多的选择器
-            requirement_xpaths = [
-                ".//div[contains(@class, 'tags')]//span",
-                ".//div[contains(@class, 'job-info-tags')]//span",
-                ".//div[contains(@class, 'tag')]//span",
-                ".//div[contains(@class, 'requirement')]//span",
-                ".//ul[contains(@class, 'tag-list')]//li",
-                ".//div[contains(@class, 'job-card-footer')]//ul[contains(@class, 'tag-list')]//li"
-            ]
-            
-            for xpath in requirement_xpaths:
-                try:
-                    elements = job_card.find_elements(By.XPATH, xpath)
-                    if elements:
-                        job_data["job_requirements"] = [e.text.strip() for e in elements if e.text.strip()]
-                        if job_data["job_requirements"]:
-                            self.logger.info(f"使用XPath '{xpath}' 成功提取职位要求: {job_data['job_requirements']}")
-                            break
-                except:
-                    continue
-            
-            if not job_data["job_requirements"]:  # 如果XPath未提取到，尝试CSS选择器
-                requirements_selectors = [
-                    ".job-info-tags .tag-item", ".tags span", ".tag",
-                    ".requirement", ".text-ellipsis", "ul.tag-list li",
-                    ".job-card-footer ul.tag-list li"
-                ]
-                for selector in requirements_selectors:
-                    try:
-                        elements = job_card.find_elements(By.CSS_SELECTOR, selector)
-                        if elements:
-                            job_data["job_requirements"] = [e.text.strip() for e in elements if e.text.strip()]
-                            if job_data["job_requirements"]:
-                                self.logger.info(f"使用CSS '{selector}' 成功提取职位要求")
-                                break
-                    except:
-                        continue
-            
-            # 提取HR信息 - 更多尝试
-            hr_xpaths = [
-                ".//div[contains(@class, 'info-public')]",
-                ".//div[contains(@class, 'boss-info')]",
-                ".//div[contains(@class, 'job-author')]",
-                ".//div[contains(@class, 'hr')]",
-                ".//div[contains(@class, 'publisher')]"
-            ]
-            
-            for xpath in hr_xpaths:
-                try:
-                    elements = job_card.find_elements(By.XPATH, xpath)
-                    if elements and elements[0].text.strip():
-                        hr_info = elements[0].text.strip()
-                        hr_parts = hr_info.split("·") if "·" in hr_info else hr_info.split(" ")
-                        if len(hr_parts) >= 1:
-                            job_data["hr_name"] = hr_parts[0].strip()
-                        if len(hr_parts) >= 2:
-                            job_data["hr_title"] = hr_parts[1].strip()
-                        self.logger.info(f"使用XPath '{xpath}' 成功提取HR信息")
-                        break
-                except:
-                    continue
-            
-            # 提取发布时间 - 增加尝试
-            time_xpaths = [
-                ".//span[contains(@class, 'job-info-tip')]",
-                ".//span[contains(@class, 'job-time')]",
-                ".//span[contains(@class, 'time')]",
-                ".//span[contains(@class, 'publish-time')]",
-                ".//span[contains(@class, 'update-time')]"
-            ]
-            
-            for xpath in time_xpaths:
-                try:
-                    elements = job_card.find_elements(By.XPATH, xpath)
-                    if elements and elements[0].text.strip():
-                        job_data["publish_time"] = elements[0].text.strip()
-                        self.logger.info(f"使用XPath '{xpath}' 成功提取发布时间: {job_data['publish_time']}")
-                        break
-                except:
-                    continue
-            
-            # 提取详情链接 - 尝试查找整个卡片中的链接
-            try:
-                # 寻找任何链接元素
-                links = job_card.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    href = link.get_attribute("href")
-                    if href and ("job_detail" in href or "geek/job" in href):
-                        job_data["detail_link"] = href
-                        self.logger.info(f"成功提取详情链接: {href}")
-                        break
-            except:
-                pass
-            
-            # 如果仍然找不到详情链接，尝试父元素的链接
-            if not job_data["detail_link"]:
-                try:
-                    parent = job_card.find_element(By.XPATH, "./..")
-                    href = parent.get_attribute("href")
-                    if href:
-                        job_data["detail_link"] = href
-                        self.logger.info(f"从父元素提取详情链接: {href}")
-                except:
-                    pass
-            
-            # 检查是否提取到了有效信息
-            valid_fields = 0
-            for key, value in job_data.items():
-                if key != "crawl_time" and key != "job_requirements" and value != "未知":
-                    valid_fields += 1
+            job_data = self.card_cache.get(card_html, base_url=self.base_url)
+            if job_data is not None:
+                source = "cache"
+                self.logger.info(f"职位卡片命中缓存: {job_data['job_name']}")
+                return job_data
             
-            # 更宽松的标准：即使只有一个有效字段也接受（增加成功率）
-            if valid_fields < 1:
-                self.logger.warning(f"未能提取足够的职位信息: {job_data}")
-                # 最后尝试：导出职位卡片的完整HTML并检查关键字
-                card_html = job_card.get_attribute('outerHTML')
-                if '立即沟通' in card_html and len(card_html) < 200:
-                    self.logger.warning("检测到只有'立即沟通'按钮，职位卡片可能未完全加载")
-                    return None
-                
-                # 尝试在HTML中查找关键信息
-                import re
-                salary_match = re.search(r'(\d+)[K-](\d+)K', card_html)
-                if salary_match:
-                    job_data["salary"] = f"{salary_match.group(1)}-{salary_match.group(2)}K"
-                    valid_fields += 1
-                
-                job_title_match = re.search(r'job-name"[^>]*>([^<]+)<', card_html)
-                if job_title_match:
-                    job_data["job_name"] = job_title_match.group(1)
-                    valid_fields += 1
-                
-                if valid_fields < 1:
-                    return None
-                
+            with self.metrics.stage("card_extract"):
+                job_data = extract_card(job_card, self.card_adapter, stats=self.selector_stats, logger=self.logger)
+            source = "extracted" if job_data else "empty"
+            self.card_cache.put(card_html, job_data)
             return job_data
         
         except Exception as e:
             self.logger.error(f"提取职位详情失败: {str(e)}")
             traceback.print_exc()
             return None
+        finally:
+            self.metrics.observe("card_seconds", time.perf_counter() - start, source=source)
+            self.metrics.inc("cards_total", source=source)
+    
+    def query_key(self):
+        """熔断器中标识当前查询的键"""
+        return f"{self.city}/{self.keyword}"
     
     def scrape_page(self, page_num):
-        """抓取一页数据"""
-        url = self.get_search_url(page_num)
-        self.logger.info(f"开始抓取第{page_num}页: {url}")
+        """
+        抓取一页数据
         
-        try:
-            self.driver.get(url)
-            
-            # 增加页面加载等待时间
-            self.logger.info("等待页面加载...")
-            time.sleep(5)  # 增加到5秒
-            
-            # 保存当前页面状态以便调试
-            self.save_debug_info(page_num)
-            
-            # 尝试检测页面状态
-            page_title = self.driver.title
-            self.logger.info(f"页面标题: {page_title}")
-            
-            # 检查是否显示"没有找到相关职位"
-            no_job_indicators = [
-                "没有找到相关职位",
-                "打开APP查看全部职位库",
-                "优质职位随心刷"
-            ]
-            
-            page_text = self.driver.page_source
-            for indicator in no_job_indicators:
-                if indicator in page_text:
-                    self.logger.warning(f"检测到无搜索结果提示: '{indicator}'")
-                    print(f"\n当前搜索条件 '{self.keyword}' 在 '{self.city}' 没有找到职位")
-                    
-                    # 提示用户是否要更改搜索条件
-                    change = input("是否要更改搜索条件？(y/n): ")
-                    if change.lower() == 'y':
-                        # 获取新的搜索条件
-                        new_keyword = input(f"请输入新的关键词(当前: {self.keyword}): ")
-                        if new_keyword.strip():
-                            self.keyword = new_keyword.strip()
-                        
-                        new_city = input(f"请输入新的城市(当前: {self.city}): ")
-                        if new_city.strip():
-                            self.city = new_city.strip()
-                        
-                        # 使用自动方式设置新的搜索条件
-                        if self.select_search_criteria():
-                            # 更新当前搜索URL
-                            self.current_search_url = self.driver.current_url
-                            # 重新抓取
-                            return self.scrape_page(page_num)
-                    return []
-            
-            # 尝试多个可能的CSS选择器查找职位列表
-            selectors = [
-                ".job-list-box",           # 原始选择器
-                ".job-list",               # 可能的替代选择器
-                ".search-job-result",      # 另一个可能的选择器
-                ".job-card-wrapper",       # 直接查找职位卡片
-                ".job-primary",            # 另一种职位卡片包装
-                ".search-job-result ul li", # 列表项
-                ".job-card"                # 可能的卡片选择器
-            ]
-            
-            job_list = None
-            found_selector = None
-            
-            for selector in selectors:
-                try:
-                    self.logger.info(f"尝试查找选择器: {selector}")
-                    elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=3)
-                    if elements and len(elements) > 0:
-                        job_list = elements
-                        found_selector = selector
-                        self.logger.info(f"成功找到选择器 {selector}，元素数量: {len(elements)}")
-                        break
-                except Exception as e:
-                    self.logger.warning(f"选择器 {selector} 查找失败: {str(e)}")
-            
-            if not job_list:
-                self.logger.warning(f"第{page_num}页没有找到职位列表")
-                
-                # 使用自动设置搜索条件重试
+        失败时按重试策略重试（找不到职位列表时先重新设置搜索条件），重试用完或遇到不可重试的错误时
+        记入熔断器并返回空列表；当前查询或整个爬虫已熔断时直接返回空列表。
+        """
+        query = self.query_key()
+        if not self.circuit_breaker.allow(query):
+            self.logger.warning(
+                f"查询 {query} 连续失败过多，暂停中（{self.circuit_breaker.retry_after(query):.0f} 秒后恢复），跳过第{page_num}页"
+            )
+            return []
+        
+        def before_retry(attempt, error, delay):
+            self.logger.warning(f"第{page_num}页第{attempt}次尝试失败: {str(error)}，{delay:.1f} 秒后重试")
+            if not self.is_driver_alive():
+                self.restart_driver("浏览器崩溃", crashed=True)
+            elif isinstance(error, PageNotReadyError):
                 print("\n找不到职位列表，尝试重新设置搜索条件...")
                 if self.select_search_criteria():
-                    # 更新当前搜索URL
                     self.current_search_url = self.driver.current_url
-                    # 重新尝试抓取当前页面
-                    return self.scrape_page(page_num)
-                return []
-            
-            # 如果找到了职位列表但不是职位卡片，需要进一步查找职位卡片
-            job_cards = []
-            if found_selector != ".job-card-wrapper" and found_selector != ".job-primary" and found_selector != ".job-card":
-                # 根据找到的容器再查找职位卡片
-                for container in job_list:
-                    try:
-                        cards = container.find_elements(By.CSS_SELECTOR, ".job-card-wrapper, .job-primary, .job-card, a")
-                        if cards:
-                            job_cards.extend(cards)
-                    except:
-                        pass
-            else:
-                job_cards = job_list
-            
-            if not job_cards:
-                self.logger.warning(f"第{page_num}页没有找到职位卡片")
-                return []
-            
-            self.logger.info(f"第{page_num}页找到{len(job_cards)}个职位")
-            
-            # 尝试不同方式提取数据
-            jobs_data = []
-            for job_card in job_cards:
-                try:
-                    job_data = self.extract_job_details(job_card)
-                    if job_data:
-                        jobs_data.append(job_data)
-                    
-                    # 随机休眠，避免被检测
-                    time.sleep(random.uniform(0.5, 1.5))
-                except Exception as e:
-                    self.logger.error(f"处理职位卡片时出错: {str(e)}")
-            
-            self.logger.info(f"第{page_num}页成功提取{len(jobs_data)}个职位数据")
-            
-            return jobs_data
-            
+        
+        try:
+            jobs_data = self.retry_policy.call(self.fetch_page_once, page_num, on_retry=before_retry)
         except Exception as e:
-            self.logger.error(f"抓取第{page_num}页失败: {str(e)}")
+            self.logger.error(f"抓取第{page_num}页失败（{classify_error(e)}）: {str(e)}")
             traceback.print_exc()
             self.save_debug_info(page_num)
+            for scope in self.circuit_breaker.record_failure(query):
+                self.logger.warning(f"{'全局' if scope is None else '查询 ' + scope} 连续失败过多，暂停 {self.circuit_breaker.cooldown} 秒")
             return []
+        
+        self.circuit_breaker.record_success(query)
+        return jobs_data
+    
+    def fetch_page_once(self, page_num):
+        """
+        抓取一页数据（单次尝试）
+        
+        Returns:
+            职位记录列表，页面提示没有搜索结果时返回空列表；找不到职位列表时抛出 PageNotReadyError
+        """
+        return self.timed_page(self._fetch_page_once, page_num)
+    
+    def _fetch_page_once(self, page_num):
+        url = self.get_search_url(page_num)
+        self.logger.info(f"开始抓取第{page_num}页: {url}")
+        
+        self.load_page(url)
+        
+        # 增加页面加载等待时间
+        self.logger.info("等待页面加载...")
+        with self.metrics.stage("fixed_wait"):
+            time.sleep(5)  # 增加到5秒
+        
+        # 保存当前页面状态以便调试
+        self.save_debug_info(page_num)
+        
+        # 尝试检测页面状态
+        page_title = self.driver.title
+        self.logger.info(f"页面标题: {page_title}")
+        
+        # 检查是否显示"没有找到相关职位"，这是正常结果，不需要重试
+        if self.page_has_no_jobs():
+            print(f"\n当前搜索条件 '{self.keyword}' 在 '{self.city}' 没有找到职位")
+            return []
+        
+        # 尝试多个可能的CSS选择器查找职位列表
+        selectors = [
+            ".job-list-box",           # 原始选择器
+            ".job-list",               # 可能的替代选择器
+            ".search-job-result",      # 另一个可能的选择器
+            ".job-card-wrapper",       # 直接查找职位卡片
+            ".job-primary",            # 另一种职位卡片包装
+            ".search-job-result ul li", # 列表项
+            ".job-card"                # 可能的卡片选择器
+        ]
+        
+        job_list = None
+        found_selector = None
+        
+        for selector in selectors:
+            try:
+                self.logger.info(f"尝试查找选择器: {selector}")
+                elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=3)
+                if elements and len(elements) > 0:
+                    job_list = elements
+                    found_selector = selector
+                    self.logger.info(f"成功找到选择器 {selector}，元素数量: {len(elements)}")
+                    break
+            except Exception as e:
+                self.logger.warning(f"选择器 {selector} 查找失败: {str(e)}")
+        
+        if not job_list:
+            # 由重试策略重新设置搜索条件后再试，不再递归调用
+            raise PageNotReadyError(f"第{page_num}页没有找到职位列表")
+        
+        # 如果找到了职位列表但不是职位卡片，需要进一步查找职位卡片
+        job_cards = []
+        if found_selector != ".job-card-wrapper" and found_selector != ".job-primary" and found_selector != ".job-card":
+            # 根据找到的容器再查找职位卡片
+            for container in job_list:
+                try:
+                    cards = container.find_elements(By.CSS_SELECTOR, ".job-card-wrapper, .job-primary, .job-card, a")
+                    if cards:
+                        job_cards.extend(cards)
+                except:
+                    pass
+        else:
+            job_cards = job_list
+        
+        if not job_cards:
+            self.logger.warning(f"第{page_num}页没有找到职位卡片")
+            return []
+        
+        self.logger.info(f"第{page_num}页找到{len(job_cards)}个职位")
+        
+        # 尝试不同方式提取数据
+        jobs_data = []
+        for job_card in job_cards:
+            try:
+                job_data = self.extract_job_details(job_card)
+                if job_data:
+                    jobs_data.append(job_data)
+                
+                # 随机休眠，避免被检测
+                time.sleep(random.uniform(0.5, 1.5))
+            except Exception as e:
+                self.logger.error(f"处理职位卡片时出错: {str(e)}")
+        
+        self.logger.info(f"第{page_num}页成功提取{len(jobs_data)}个职位数据")
+        
+        return jobs_data
     
     def scrape_all(self):
         """抓取所有页面数据"""
@@ -717,8 +874,18 @@ class ZhipinSeleniumScraper:
         
         for page in range(1, self.pages + 1):
             jobs_data = self.scrape_page(page)
+            
+            # scrape_page内部会吞掉异常，浏览器崩溃时在此重启并重试本页
+            if not jobs_data and not self.is_driver_alive():
+                self.restart_driver("浏览器崩溃", crashed=True)
+                jobs_data = self.scrape_page(page)
             all_jobs.extend(jobs_data)
             
+            # 查询已熔断时不再继续翻页
+            if self.circuit_breaker.retry_after(self.query_key()) > 0:
+                self.logger.warning(f"查询 {self.query_key()} 已暂停，停止爬取剩余页面")
+                break
+            
             # 保存中间结果
             self.save_results(all_jobs, f"zhipin_{self.city}_{self.keyword}_page_{page}.json")
             
@@ -741,12 +908,14 @@ class ZhipinSeleniumScraper:
             filename = os.path.join(self.data_dir, filename)
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with self.metrics.stage("save_results"):
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
             self.logger.info(f"成功保存{len(data)}条数据到{filename}")
             
             # 同时保存到数据管理器
-            self.data_manager.save_jobs(data)
+            with self.metrics.stage("save_jobs"):
+                self.data_manager.save_jobs(data)
         except Exception as e:
             self.logger.error(f"保存数据失败: {str(e)}")
     
@@ -757,7 +926,7 @@ class ZhipinSeleniumScraper:
         
         try:
             # 访问主页
-            self.driver.get("https://www.zhipin.com/")
+            self.driver.get(f"{self.base_url}/")
             time.sleep(2)
             
             # 提示用户登录
@@ -766,7 +935,12 @@ class ZhipinSeleniumScraper:
             print("2. 如遇到验证码，请手动完成验证")
             print("3. 确保完全登录成功后再继续")
             
-            login_input = input("\n完成登录后按Enter继续，或输入'q'退出: ")
+            if not self.interactive:
+                # 无人值守时不等待登录，只检查已保存的登录状态（--profile-dir）
+                login_input = ""
+                time.sleep(3)
+            else:
+                login_input = input("\n完成登录后按Enter继续，或输入'q'退出: ")
             if login_input.lower() == 'q':
                 print("用户取消爬取，正在退出...")
                 self.close()
@@ -794,9 +968,13 @@ class ZhipinSeleniumScraper:
         self.logger.info("正在设置搜索条件...")
         print(f"\n正在自动设置搜索条件：城市[{self.city}]，关键词[{self.keyword}]")
         
+        # 快速启动：城市代码已知时直接打开搜索结果页，跳过首页交互
+        if self.fast_start and self.city in CITY_CODES:
+            return self.open_search_directly()
+        
         try:
             # 访问搜索页面 - 直接使用首页，因为它有搜索框
-            self.driver.get("https://www.zhipin.com/")
+            self.driver.get(f"{self.base_url}/")
             time.sleep(3)
             
             # 保存当前页面源码到调试文件
@@ -810,34 +988,6 @@ class ZhipinSeleniumScraper:
             self.driver.save_screenshot(screenshot_file)
             self.logger.info(f"已保存屏幕截图到: {screenshot_file}")
             
-            # 城市映射表：城市名称到城市代码的映射
-            city_codes = {
-                "北京": "101010100",
-                "上海": "101020100",
-                "广州": "101280100",
-                "深圳": "101280600",
-                "杭州": "101210100",
-                "苏州": "101190400",
-                "南京": "101190100",
-                "天津": "101030100",
-                "成都": "101270100",
-                "武汉": "101200100",
-                "西安": "101110100",
-                "重庆": "101040100",
-                "郑州": "101180100",
-                "长沙": "101250100",
-                "大连": "101070200",
-                "青岛": "101120200",
-                "宁波": "101210400",
-                "厦门": "101230200",
-                "福州": "101230100",
-                "济南": "101120100",
-                "合肥": "101220100",
-                "石家庄": "101090100",
-                "哈尔滨": "101050100",
-                "全国": "100010000"
-            }
-            
             # 获取当前城市
             current_city = None
             try:
@@ -956,8 +1106,8 @@ class ZhipinSeleniumScraper:
             self.logger.info(f"搜索后URL: {current_url}")
             
             # 关键步骤：如果需要更改城市，直接修改URL
-            if need_change_city and self.city in city_codes:
-                city_code = city_codes[self.city]
+            if need_change_city and self.city in CITY_CODES:
+                city_code = CITY_CODES[self.city]
                 new_url = ""
                 
                 if "city=" in current_url:
@@ -998,7 +1148,7 @@ class ZhipinSeleniumScraper:
                         print(f"警告: 页面显示的城市是 {detected_city}，而不是 {self.city}")
                         
                         # 最后尝试手动设置城市
-                        if input(f"是否要手动设置城市? (y/n): ").lower() == 'y':
+                        if self.interactive and input(f"是否要手动设置城市? (y/n): ").lower() == 'y':
                             return self.manual_select_search_criteria()
             except Exception as e:
                 self.logger.warning(f"验证城市设置时出错: {str(e)}")
@@ -1024,19 +1174,50 @@ class ZhipinSeleniumScraper:
             traceback.print_exc()
             
             # 如果自动设置失败，提供手动设置选项
+            if not self.interactive:
+                return False
             manual_option = input("自动设置失败，是否要手动设置搜索条件？(y/n): ")
             if manual_option.lower() == 'y':
                 return self.manual_select_search_criteria()
             return False
             
+    def open_search_directly(self):
+        """直接访问由城市代码和关键词构造的搜索URL"""
+        start_time = time.perf_counter()
+        self.current_search_url = None
+        search_url = self.get_search_url(1)
+        
+        try:
+            self.driver.get(search_url)
+            job_list = self.wait_for_element(By.CSS_SELECTOR, ".job-list-box, .job-list, .search-job-result")
+        except WebDriverException as e:
+            self.logger.warning(f"直接打开搜索页失败，改用首页搜索: {str(e)}")
+            self.fast_start = False
+            return self.select_search_criteria()
+        
+        # wait_for_element 超时返回None：被重定向到登录/验证页或页面没有职位列表，
+        # 不能把当前URL当作搜索页保存（之后各页的URL都由它构造）
+        if job_list is None:
+            self.logger.warning(f"直接打开的搜索页没有职位列表（当前页面: {self.driver.current_url}），改用首页搜索")
+            self.fast_start = False
+            return self.select_search_criteria()
+        
+        self.current_search_url = self.driver.current_url
+        self.logger.info(f"快速设置搜索条件完成，耗时 {time.perf_counter() - start_time:.2f} 秒: {self.current_search_url}")
+        print(f"\n成功设置搜索条件: 城市 '{self.city}'，关键词 '{self.keyword}'")
+        return True
+    
     def manual_select_search_criteria(self):
         """手动设置搜索条件（城市和关键词）"""
         self.logger.info("正在手动设置搜索条件...")
+        if not self.interactive:
+            self.logger.warning("非交互模式，无法手动设置搜索条件")
+            return False
         print("\n现在请设置搜索条件（城市和关键词）")
         
         try:
             # 重新加载搜索页面
-            self.driver.get("https://www.zhipin.com/web/geek/job")
+            self.driver.get(f"{self.base_url}/web/geek/job")
             time.sleep(3)
             
             # 指导用户进行手动设置
@@ -1092,6 +1273,8 @@ class ZhipinSeleniumScraper:
         if self.driver:
             self.driver.quit()
             self.logger.info("浏览器已关闭")
+            self.log_driver_stats()
+        self.card_cache.close()
 
     def scrape_job_list(self):
         """抓取职位列表，更稳定的处理方式"""
@@ -1100,7 +1283,7 @@ class ZhipinSeleniumScraper:
         
         try:
             # 首先确保我们在搜索结果页面
-            if not self.current_search_url or "zhipin.com" not in self.driver.current_url:
+            if not self.current_search_url or urlparse(self.base_url).netloc not in self.driver.current_url:
                 self.logger.info("未检测到搜索URL，重新设置搜索条件")
                 if not self.select_search_criteria():
                     raise Exception("无法设置搜索条件")
@@ -1131,105 +1314,32 @@ class ZhipinSeleniumScraper:
                 time.sleep(5)
             
             # 开始逐页爬取数据
+            page_sizes = []
+            query = self.query_key()
             for page in range(1, self.pages + 1):
-                page_url = self.get_search_url(page)
-                self.logger.info(f"开始爬取第{page}页: {page_url}")
-                
+                if not self.circuit_breaker.allow(query):
+                    self.logger.warning(
+                        f"查询 {query} 连续失败过多，停止爬取剩余页面"
+                        f"（{self.circuit_breaker.retry_after(query):.0f} 秒后可恢复）"
+                    )
+                    break
                 try:
-                    # 访问页面
-                    self.driver.get(page_url)
-                    
-                    # 等待页面加载
-                    time.sleep(5)
-                    
-                    # 保存页面状态以便调试
-                    self.save_debug_info(page)
-                    
-                    # 尝试多种选择器找到职位卡片
-                    job_cards = []
-                    selectors = [
-                        ".job-card-wrapper",
-                        ".job-primary",
-                        ".job-card",
-                        ".search-job-result ul li",
-                        ".job-list-box li"
-                    ]
-                    
-                    for selector in selectors:
-                        try:
-                            self.logger.info(f"尝试选择器: {selector}")
-                            elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=3)
-                            if elements and len(elements) > 0:
-                                job_cards = elements
-                                self.logger.info(f"使用选择器 {selector} 找到 {len(elements)} 个职位卡片")
-                                break
-                        except Exception as e:
-                            self.logger.warning(f"选择器 {selector} 失败: {str(e)}")
-                    
-                    # 如果CSS选择器都失败了，尝试XPath
-                    if not job_cards:
-                        xpath_selectors = [
-                            "//div[contains(@class, 'job-card')]",
-                            "//li[contains(@class, 'job-card')]",
-                            "//div[contains(@class, 'job-list-box')]//li",
-                            "//div[contains(@class, 'search-job-result')]//li"
-                        ]
-                        
-                        for xpath in xpath_selectors:
-                            try:
-                                elements = self.driver.find_elements(By.XPATH, xpath)
-                                if elements and len(elements) > 0:
-                                    job_cards = elements
-                                    self.logger.info(f"使用XPath {xpath} 找到 {len(elements)} 个职位卡片")
-                                    break
-                            except:
-                                pass
-                    
-                    # 如果仍然没有找到卡片，保存页面并跳到下一页
-                    if not job_cards:
-                        self.logger.warning(f"第{page}页未找到职位卡片")
-                        
-                        # 保存页面源码
-                        debug_file = os.path.join(self.debug_dir, f"no_jobs_page_{page}_{datetime.now().strftime('%H%M%S')}.html")
-                        with open(debug_file, "w", encoding="utf-8") as f:
-                            f.write(self.driver.page_source)
-                        self.logger.info(f"已保存无职位卡片页面到: {debug_file}")
-                        
+                    # 浏览器崩溃时自动重启并重试本页；超时等可重试的错误按重试策略退避重试
+                    try:
+                        page_jobs = self.retry_policy.call(
+                            self.run_with_driver_recovery, self.scrape_listing_page, page,
+                            on_retry=lambda attempt, error, delay: self.logger.warning(
+                                f"第{page}页第{attempt}次尝试失败: {str(error)}，{delay:.1f} 秒后重试"
+                            )
+                        )
+                    except Exception:
+                        for scope in self.circuit_breaker.record_failure(query):
+                            self.logger.warning(f"{'全局' if scope is None else '查询 ' + scope} 连续失败过多，暂停 {self.circuit_breaker.cooldown} 秒")
+                        raise
+                    self.circuit_breaker.record_success(query)
+                    if page_jobs is None:
                         continue
-                    
-                    # 确保所有卡片加载完全 - 滚动页面
-                    self.logger.info("滚动页面以加载所有职位卡片")
-                    for _ in range(3):  # 滚动3次确保加载
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(1)
-                    
-                    # 重新获取职位卡片（滚动后可能有更多卡片加载出来）
-                    if len(job_cards) < 10:  # 如果卡片数量太少，尝试重新获取
-                        for selector in selectors:
-                            try:
-                                elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=2)
-                                if elements and len(elements) > len(job_cards):
-                                    job_cards = elements
-                                    self.logger.info(f"滚动后重新获取，找到 {len(elements)} 个职位卡片")
-                                    break
-                            except:
-                                pass
-                    
-                    # 提取每个职位的数据
-                    page_jobs = []
-                    for job_card in job_cards:
-                        try:
-                            job_data = self.extract_job_details(job_card)
-                            if job_data:
-                                page_jobs.append(job_data)
-                            
-                            # 随机休眠，避免被检测
-                            time.sleep(random.uniform(0.3, 0.8))
-                        except Exception as e:
-                            self.logger.error(f"处理职位卡片失败: {str(e)}")
-                    
-                    # 记录本页提取的职位数量
-                    self.logger.info(f"第{page}页成功提取 {len(page_jobs)}/{len(job_cards)} 个职位数据")
+                    page_sizes.append(len(page_jobs))
                     
                     # 将本页数据添加到总结果中
                     all_jobs.extend(page_jobs)
@@ -1248,6 +1358,13 @@ class ZhipinSeleniumScraper:
                     self.logger.error(f"爬取第{page}页时出错: {str(e)}")
                     traceback.print_exc()
             
+            # 最后一页仍是满页，说明还有结果没有翻到
+            if page_sizes and len(page_sizes) == self.pages and page_sizes[-1] >= max(page_sizes) > 0:
+                self.logger.warning(
+                    f"第{self.pages}页仍有完整结果，查询可能超出可翻页范围，"
+                    f"可用 query_partitioner.py 按区域/薪资/经验/学历拆分查询"
+                )
+            
             # 保存最终结果
             if all_jobs:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1257,14 +1374,204 @@ class ZhipinSeleniumScraper:
             else:
                 self.logger.warning("未获取到任何职位数据")
             
+            self.log_driver_stats()
+            self.logger.info(f"选择器命中统计: {json.dumps(self.selector_stats.to_dict(), ensure_ascii=False)}")
+            self.logger.info(f"卡片缓存统计: {json.dumps(self.card_cache.report(), ensure_ascii=False)}")
+            self.logger.info(f"耗时统计: {json.dumps(self.metrics.report()['histograms'], ensure_ascii=False)}")
             return all_jobs
             
         except Exception as e:
             self.logger.error(f"职位列表抓取失败: {str(e)}")
             traceback.print_exc()
             return []
+    
+    def timed_page(self, func, page):
+        """执行单页抓取，记录单页耗时、页面数和职位数"""
+        start = time.perf_counter()
+        status = "error"
+        try:
+            jobs = func(page)
+            status = "ok" if jobs else "empty"
+            if jobs:
+                self.metrics.inc("jobs_total", len(jobs))
+            return jobs
+        finally:
+            self.metrics.observe("page_seconds", time.perf_counter() - start)
+            self.metrics.inc("pages_total", status=status)
+    
+    def page_has_no_jobs(self):
+        """当前页面是否显示无搜索结果提示（真正的空结果，区别于登录/验证页或未加载完成的页面）"""
+        indicator = page_has_no_jobs(self.driver.page_source)
+        if indicator:
+            self.logger.warning(f"检测到无搜索结果提示: '{indicator}'")
+        return indicator is not None
+    
+    def scrape_listing_page(self, page):
+        """抓取搜索结果的一页，未找到职位卡片时返回None（可用 page_has_no_jobs 区分空结果和异常页面）"""
+        return self.timed_page(self._scrape_listing_page, page)
+    
+    def _scrape_listing_page(self, page):
+        page_url = self.get_search_url(page)
+        self.logger.info(f"开始爬取第{page}页: {page_url}")
+        
+        if self.capture_api:
+            self.drain_performance_log()
+        
+        # 访问页面
+        self.load_page(page_url)
+        
+        # 接口捕获模式：直接使用接口JSON，无需逐个解析职位卡片
+        if self.capture_api:
+            with self.metrics.stage("api_capture"):
+                api_jobs = self.collect_api_jobs(page, page_url)
+            if api_jobs is not None:
+                self.logger.info(f"第{page}页从职位列表接口获取 {len(api_jobs)} 个职位数据")
+                return api_jobs
+            self.logger.warning(f"第{page}页未捕获到职位列表接口响应，改用页面解析")
+        
+        # 等待页面加载
+        with self.metrics.stage("fixed_wait"):
+            time.sleep(5)
+        
+        # 保存页面状态以便调试
+        self.save_debug_info(page)
+        
+        # 尝试多种选择器找到职位卡片
+        job_cards = []
+        selectors = CARD_SELECTORS
+        
+        lookup_start = time.perf_counter()
+        for selector in selectors:
+            try:
+                self.logger.info(f"尝试选择器: {selector}")
+                elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=3)
+                if elements and len(elements) > 0:
+                    job_cards = elements
+                    self.logger.info(f"使用选择器 {selector} 找到 {len(elements)} 个职位卡片")
+                    break
+            except Exception as e:
+                self.logger.warning(f"选择器 {selector} 失败: {str(e)}")
+        
+        # 如果CSS选择器都失败了，尝试XPath
+        if not job_cards:
+            for xpath in CARD_XPATHS:
+                try:
+                    elements = self.driver.find_elements(By.XPATH, xpath)
+                    if elements and len(elements) > 0:
+                        job_cards = elements
+                        self.logger.info(f"使用XPath {xpath} 找到 {len(elements)} 个职位卡片")
+                        break
+                except:
+                    pass
+        self.metrics.observe("stage_seconds", time.perf_counter() - lookup_start, stage="card_lookup")
+        
+        # 如果仍然没有找到卡片，保存页面并跳到下一页
+        if not job_cards:
+            self.logger.warning(f"第{page}页未找到职位卡片")
+            
+            # 保存页面源码
+            debug_file = os.path.join(self.debug_dir, f"no_jobs_page_{page}_{datetime.now().strftime('%H%M%S')}.html")
+            with self.metrics.stage("debug_capture"), open(debug_file, "w", encoding="utf-8") as f:
+                f.write(self.driver.page_source)
+            self.logger.info(f"已保存无职位卡片页面到: {debug_file}")
+            
+            return None
+        
+        # 确保所有卡片加载完全 - 滚动页面
+        self.logger.info("滚动页面以加载所有职位卡片")
+        with self.metrics.stage("scroll"):
+            for _ in range(3):  # 滚动3次确保加载
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(1)
+        
+        # 重新获取职位卡片（滚动后可能有更多卡片加载出来）
+        if len(job_cards) < 10:  # 如果卡片数量太少，尝试重新获取
+            for selector in selectors:
+                try:
+                    elements = self.wait_for_elements(By.CSS_SELECTOR, selector, timeout=2)
+                    if elements and len(elements) > len(job_cards):
+                        job_cards = elements
+                        self.logger.info(f"滚动后重新获取，找到 {len(elements)} 个职位卡片")
+                        break
+                except:
+                    pass
+        
+        # 提取每个职位的数据
+        page_jobs = []
+        for job_card in job_cards:
+            try:
+                job_data = self.extract_job_details(job_card)
+                if job_data:
+                    page_jobs.append(job_data)
+                elif not self.is_driver_alive():
+                    raise WebDriverException("浏览器会话已断开")
+                
+                # 随机休眠，避免被检测
+                time.sleep(random.uniform(0.3, 0.8))
+            except Exception as e:
+                # 浏览器已崩溃时交给上层重启，不再逐个卡片报错
+                if isinstance(e, WebDriverException) and not self.is_driver_alive():
+                    raise
+                self.logger.error(f"处理职位卡片失败: {str(e)}")
+        
+        # 记录本页提取的职位数量
+        self.logger.info(f"第{page}页成功提取 {len(page_jobs)}/{len(job_cards)} 个职位数据")
+        
+        return page_jobs
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    import argparse
+    parser = argparse.ArgumentParser(description='BOSS直聘职位数据爬虫 (Edge版)')
+    parser.add_argument('--driver-path', type=str, default=None, help='EdgeDriver路径，优先于缓存和自动查找')
+    parser.add_argument('--offline', action='store_true', help='离线模式，不联网下载EdgeDriver')
+    parser.add_argument('--profile-dir', type=str, default=None, help='持久化浏览器用户目录，复用登录状态')
+    parser.add_argument('--debugger-address', type=str, default=None, help='连接已运行的Edge浏览器，如 127.0.0.1:9222')
+    parser.add_argument('--fast-start', action='store_true', help='跳过首页，直接打开搜索结果页')
+    parser.add_argument('--max-pages-per-driver', type=int, default=None, help='每个浏览器实例最多访问的页面数，超过后自动重启')
+    parser.add_argument('--max-browser-rss-mb', type=int, default=None, help='浏览器内存上限（MB），超过后自动重启')
+    parser.add_argument('--capture-api', action='store_true', help='从职位列表接口响应中提取数据，代替页面元素解析')
+    parser.add_argument('--base-url', type=str, default=BASE_URL, help='网站地址，压测时可指向本地模拟服务')
+    parser.add_argument('--card-cache-db', type=str, default=None, help='卡片提取结果的磁盘缓存（SQLite），多次运行之间复用')
+    
+    # 无人值守批量模式：不询问任何输入，见 crawl_job.py
+    from crawl_job import add_job_arguments
+    parser.add_argument('--config', type=str, default=None, help='任务配置文件（.json/.toml/.yaml），按配置批量爬取')
+    parser.add_argument('--batch', action='store_true', help='不询问输入，直接按命令行参数爬取')
+    parser.add_argument('--city', type=str, default=None, help='城市（批量模式，等同于--cities）')
+    parser.add_argument('--keyword', type=str, default=None, help='关键词（批量模式，等同于--keywords）')
+    add_job_arguments(parser)
+    return parser.parse_args(argv)
+
+def run_batch(args):
+    """按配置文件或命令行参数无人值守地爬取，返回退出码"""
+    from crawl_job import run_from_args
+    if args.city and not args.cities:
+        args.cities = args.city
+    if args.keyword and not args.keywords:
+        args.keywords = args.keyword
+    if args.base_url == BASE_URL:
+        args.base_url = None
+    
+    # 命令行中的浏览器参数覆盖配置文件
+    selenium_options = {
+        "driver_path": args.driver_path,
+        "profile_dir": args.profile_dir,
+        "debugger_address": args.debugger_address,
+        "max_pages_per_driver": args.max_pages_per_driver
+    }
+    selenium_options = {key: value for key, value in selenium_options.items() if value is not None}
+    for flag in ("offline", "capture_api"):
+        if getattr(args, flag):
+            selenium_options[flag] = True
+    overrides = {"selenium": selenium_options} if selenium_options else None
+    return run_from_args(args, args.config, defaults={"engine": "selenium"}, overrides=overrides)
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    if args.config or args.batch:
+        return run_batch(args)
+    
     # 提示用户输入参数
     print("===== BOSS直聘职位数据爬虫 (Edge版) =====")
     
@@ -1289,19 +1596,33 @@ def main():
     confirm = input("\n确认开始爬取? (y/n): ")
     if confirm.lower() != 'y':
         print("已取消爬取")
-        return
+        return 0
     
     # 创建抓取器实例
-    scraper = ZhipinSeleniumScraper(city=city, keyword=keyword, pages=pages)
+    scraper = ZhipinSeleniumScraper(
+        city=city, keyword=keyword, pages=pages,
+        driver_path=args.driver_path,
+        offline=args.offline,
+        profile_dir=args.profile_dir,
+        debugger_address=args.debugger_address,
+        fast_start=args.fast_start,
+        max_pages_per_driver=args.max_pages_per_driver,
+        max_browser_rss_mb=args.max_browser_rss_mb,
+        capture_api=args.capture_api,
+        base_url=args.base_url,
+        card_cache=CardCache(db_path=args.card_cache_db) if args.card_cache_db else None
+    )
     
     try:
         # 跳过登录，直接设置搜索条件
         print("已跳过登录步骤，直接进行搜索")
         
         # 手动设置搜索条件
+        criteria_start = time.perf_counter()
         if not scraper.select_search_criteria():
             print("设置搜索条件失败，爬取已取消")
-            return
+            return 2
+        scraper.logger.info(f"设置搜索条件耗时 {time.perf_counter() - criteria_start:.2f} 秒")
             
         # 存储当前URL用于后续翻页
         scraper.current_search_url = scraper.driver.current_url
@@ -1329,9 +1650,13 @@ def main():
     except Exception as e:
         print(f"抓取过程发生错误: {str(e)}")
         traceback.print_exc()
+        return 2
     finally:
         # 关闭浏览器
         scraper.close()
+        for path in scraper.metrics.export(args.metrics_file, args.metrics_report):
+            print(f"耗时统计已保存到: {path}")
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file